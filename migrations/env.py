@@ -41,7 +41,10 @@ target_metadata = SQLModel.metadata
 # ... etc.
 settings = get_settings()
 config.set_main_option("sqlalchemy.url", str(settings.db_url))
-extra_config: dict[str, Any] = {"version_table": "migration_version"}
+extra_config: dict[str, Any] = {
+    "version_table": "migration_version",
+    "render_as_batch": True,
+}
 
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,53 @@
+"""timestamp with time zone
+
+Revision ID: 17c06c7e7a3a
+Revises: 16a889930868
+Create Date: 2026-10-17 11:40:12.204315
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "17c06c7e7a3a"
+down_revision: Union[str, None] = "16a889930868"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = {
+    "person": ("created_at", "updated_at"),
+    "user": ("created_at", "updated_at"),
+}
+
+
+def upgrade() -> None:
+    # sqlite stores both types the same way, only postgresql needs the change
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table_name, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table_name,
+                column,
+                existing_type=sa.DateTime(),
+                type_=sa.DateTime(timezone=True),
+                existing_nullable=False,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table_name, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table_name,
+                column,
+                existing_type=sa.DateTime(timezone=True),
+                type_=sa.DateTime(),
+                existing_nullable=False,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
@@ -0,0 +1,54 @@
+"""person name unique index
+
+Revision ID: 6d2e9becc1ab
+Revises: 17c06c7e7a3a
+Create Date: 2026-10-17 14:05:31.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "6d2e9becc1ab"
+down_revision: Union[str, None] = "17c06c7e7a3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # merge duplicated persons into the oldest one before enforcing uniqueness
+    op.execute(
+        sa.text(
+            """
+            UPDATE "user" SET person_id = (
+                SELECT MIN(duplicate.id)
+                FROM person AS original
+                JOIN person AS duplicate
+                    ON duplicate.first_name = original.first_name
+                    AND duplicate.last_name = original.last_name
+                WHERE original.id = "user".person_id
+            )
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM person WHERE id NOT IN (
+                SELECT MIN(id) FROM person GROUP BY first_name, last_name
+            )
+            """
+        )
+    )
+    op.create_index(
+        "ix_person_first_name_last_name",
+        "person",
+        ["first_name", "last_name"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_person_first_name_last_name", table_name="person")
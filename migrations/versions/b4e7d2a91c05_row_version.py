@@ -0,0 +1,34 @@
+"""row version
+
+Revision ID: b4e7d2a91c05
+Revises: 6d2e9becc1ab
+Create Date: 2026-10-17 16:22:47.530912
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b4e7d2a91c05"
+down_revision: Union[str, None] = "6d2e9becc1ab"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("person", "user")
+
+
+def upgrade() -> None:
+    # existing rows start at the first version
+    for table_name in VERSIONED_TABLES:
+        op.add_column(
+            table_name,
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table_name in VERSIONED_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("version")
@@ -0,0 +1,54 @@
+"""list query indexes
+
+Revision ID: c81f3a6d5e27
+Revises: b4e7d2a91c05
+Create Date: 2026-10-17 18:10:04.622391
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c81f3a6d5e27"
+down_revision: Union[str, None] = "b4e7d2a91c05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# filter and sort columns of the list endpoints, the id settles ties in the
+# keyset order
+LIST_INDEXES = {
+    "ix_person_last_name_id": ("person", ("last_name", "id")),
+    "ix_person_created_at_id": ("person", ("created_at", "id")),
+    "ix_person_updated_at_id": ("person", ("updated_at", "id")),
+    "ix_user_active_id": ("user", ("active", "id")),
+    "ix_user_created_at_id": ("user", ("created_at", "id")),
+    "ix_user_updated_at_id": ("user", ("updated_at", "id")),
+}
+
+# prefix filters compare with the C collation, an index in the database
+# collation can not seek them
+PREFIX_INDEXES = {
+    "ix_person_first_name_c": ("person", "first_name"),
+    "ix_person_last_name_c": ("person", "last_name"),
+    "ix_user_username_c": ("user", "username"),
+}
+
+
+def upgrade() -> None:
+    for index_name, (table_name, columns) in LIST_INDEXES.items():
+        op.create_index(index_name, table_name, list(columns))
+    # sqlite already compares text byte by byte
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for index_name, (table_name, column) in PREFIX_INDEXES.items():
+        op.create_index(index_name, table_name, [sa.text(f'{column} COLLATE "C"')])
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for index_name, (table_name, _) in PREFIX_INDEXES.items():
+            op.drop_index(index_name, table_name=table_name)
+    for index_name, (table_name, _) in LIST_INDEXES.items():
+        op.drop_index(index_name, table_name=table_name)
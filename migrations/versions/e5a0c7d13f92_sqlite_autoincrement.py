@@ -0,0 +1,42 @@
+"""sqlite autoincrement
+
+Revision ID: e5a0c7d13f92
+Revises: c81f3a6d5e27
+Create Date: 2026-10-17 21:04:12.318406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "e5a0c7d13f92"
+down_revision: Union[str, None] = "c81f3a6d5e27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# the etag is the row version, an id handed out again would start a new row
+# at the version a deleted one already had
+TABLES = ("person", "user")
+
+
+def upgrade() -> None:
+    # postgresql sequences never hand out an id twice, sqlite reuses the
+    # highest one once its row is gone unless the table is AUTOINCREMENT
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table_name in TABLES:
+        with op.batch_alter_table(
+            table_name,
+            recreate="always",
+            table_kwargs={"sqlite_autoincrement": True},
+        ):
+            pass
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table_name in TABLES:
+        with op.batch_alter_table(table_name, recreate="always"):
+            pass
@@ -12,6 +12,7 @@ console = Console()
 
 SERVER_FOLDER = Path.cwd() / "server"
 TEST_FOLDER = Path.cwd() / "tests"
+BENCHMARK_FOLDER = TEST_FOLDER / "benchmarks"
 API_APP = "server.api:app"
 API_PORT = 5000
 API_WORKERS = 3
@@ -34,6 +35,11 @@ def test():
     _shell(cmd)
 
 
+def benchmark():
+    for bench_file in sorted(BENCHMARK_FOLDER.glob("bench_*.py")):
+        _shell(f"python -m tests.benchmarks.{bench_file.stem}")
+
+
 def lint():
     results = []
     cmd_tools = ("mypy {folder}", "ruff check {folder}")
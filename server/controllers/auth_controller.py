@@ -5,6 +5,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from server.core.context import Context, get_context_with_request
 from server.core.openapi import response_generator
+from server.core.response import ResponseModelRoute
 from server.enums.openapi_enum import OpenApiTagEnum
 from server.resources.token_resource import Token
 from server.services import auth_service
@@ -12,6 +13,7 @@ from server.services import auth_service
 router = APIRouter(
     prefix="/auth",
     tags=[OpenApiTagEnum.AUTH],
+    route_class=ResponseModelRoute,
 )
 
 
@@ -0,0 +1,33 @@
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, status
+
+from server.core import metrics
+from server.core.context import Context
+from server.core.openapi import response_generator
+from server.core.response import ResponseModelRoute
+from server.core.schema import ResponseOK
+from server.enums.openapi_enum import OpenApiTagEnum
+from server.services.auth_service import check_access_token
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=[OpenApiTagEnum.METRICS],
+    route_class=ResponseModelRoute,
+)
+
+
+@router.get(
+    "/v1/metrics",
+    response_model=ResponseOK[dict[str, dict[str, Any]]],
+    status_code=status.HTTP_200_OK,
+    responses=response_generator(
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ),
+)
+async def get_metrics(ctx: Annotated[Context, Depends(check_access_token)]):
+    return ResponseOK[dict[str, dict[str, Any]]](data=metrics.collect())
+
+
+__all__ = ("router",)
@@ -1,12 +1,27 @@
 from typing import Annotated, Sequence
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
 
+from server.core.conditional import (
+    Validator,
+    conditional_response,
+    if_match,
+    if_none_match,
+    not_modified,
+    not_modified_response,
+)
 from server.core.context import Context
-from server.core.exceptions import NoContentError
+from server.core.exceptions import NoContentError, NotFoundError
+from server.core.fields import parse_fields, sparse_resource
+from server.core.mapper import to_resource, to_resources
 from server.core.openapi import response_generator
-from server.core.schema import ResponseOK
+from server.core.query import RANGE, QuerySpec
+from server.core.response import JSONResponse, ResponseModelRoute
+from server.core.schema import ResponseOK, ResponsePage
+from server.core.settings import get_settings
+from server.core.streaming import NDJSONResponse
 from server.enums.openapi_enum import OpenApiTagEnum
+from server.enums.query_enum import QueryOperatorEnum
 from server.resources.person_resource import (
     CreatePerson,
     Person,
@@ -16,9 +31,29 @@ from server.resources.person_resource import (
 from server.services import person_service
 from server.services.auth_service import check_access_token
 
+settings = get_settings()
+
 router = APIRouter(
     prefix="/persons",
     tags=[OpenApiTagEnum.PERSON],
+    route_class=ResponseModelRoute,
+)
+
+# only what an index can answer, see the list query indexes migration
+person_query = QuerySpec(
+    Person,
+    filters={
+        "first_name": (QueryOperatorEnum.EQ, QueryOperatorEnum.PREFIX),
+        "last_name": (QueryOperatorEnum.EQ, QueryOperatorEnum.PREFIX),
+        "created_at": RANGE,
+        "updated_at": RANGE,
+    },
+    sorts={
+        "id": ("id",),
+        "last_name": ("last_name", "id"),
+        "created_at": ("created_at", "id"),
+        "updated_at": ("updated_at", "id"),
+    },
 )
 
 
@@ -27,33 +62,94 @@ router = APIRouter(
     response_model=ResponseOK[Person],
     status_code=status.HTTP_200_OK,
     responses=response_generator(
+        status.HTTP_304_NOT_MODIFIED,
         status.HTTP_401_UNAUTHORIZED,
         status.HTTP_404_NOT_FOUND,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
 async def get_person(
-    ctx: Annotated[Context, Depends(check_access_token)], person_id: int
+    request: Request,
+    ctx: Annotated[Context, Depends(check_access_token)],
+    person_id: int,
 ):
     data = await person_service.get_person(ctx, person_id=person_id)
-    return ResponseOK(data=data)
+    return conditional_response(
+        request,
+        Validator.of_version(data.version, last_modified=data.updated_at),
+        ResponseOK[Person].model_construct(data=data),
+    )
 
 
 @router.get(
     "/v1/persons",
-    response_model=ResponseOK[Sequence[Person]],
+    response_model=ResponsePage[Sequence[Person]],
     status_code=status.HTTP_200_OK,
     responses=response_generator(
         status.HTTP_204_NO_CONTENT,
+        status.HTTP_304_NOT_MODIFIED,
+        status.HTTP_400_BAD_REQUEST,
         status.HTTP_401_UNAUTHORIZED,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
-async def get_all_person(ctx: Annotated[Context, Depends(check_access_token)]):
-    data = await person_service.get_all_persons(ctx)
-    if not len(data):
+async def get_all_person(
+    request: Request,
+    ctx: Annotated[Context, Depends(check_access_token)],
+    limit: Annotated[
+        int, Query(ge=1, le=settings.pagination_max_limit)
+    ] = settings.pagination_default_limit,
+    cursor: str | None = None,
+    fields: Annotated[
+        str | None, Query(description="comma separated fields, e.g. id,firstName")
+    ] = None,
+    filter_: Annotated[
+        list[str] | None,
+        Query(
+            alias="filter", description="field:operator:value, e.g. lastName:prefix:Sil"
+        ),
+    ] = None,
+    sort: Annotated[
+        str | None, Query(description="field to sort by, descending with a -")
+    ] = None,
+):
+    selected = parse_fields(Person, fields)
+    query = person_query.parse(filter_, sort)
+    if if_none_match(request):
+        # checked in SQL before reading the rows of the page
+        version = await person_service.get_all_persons_version(
+            ctx, limit=limit, cursor=cursor, query=query
+        )
+        validator = Validator(*version, query, *selected)
+        if not_modified(request, validator):
+            return not_modified_response(validator)
+    page = await person_service.get_all_persons(
+        ctx, limit=limit, cursor=cursor, fields=selected, query=query
+    )
+    if not len(page.items):
         raise NoContentError()
-    return ResponseOK(data=data)
+    resource = sparse_resource(Person, selected) if selected else Person
+    return conditional_response(
+        request,
+        Validator(*person_service.page_version(page), query, *selected),
+        ResponsePage[Sequence[resource]].model_construct(  # type: ignore[valid-type]
+            data=to_resources(resource, page.items), next=page.next
+        ),
+    )
+
+
+@router.get(
+    "/v1/persons:export",
+    response_class=NDJSONResponse,
+    status_code=status.HTTP_200_OK,
+    responses=response_generator(
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ),
+)
+async def export_persons(ctx: Annotated[Context, Depends(check_access_token)]):
+    chunks = person_service.export_persons(ctx, chunk_size=settings.export_chunk_size)
+    return NDJSONResponse(chunks, Person)
 
 
 @router.post(
@@ -63,6 +159,7 @@ async def get_all_person(ctx: Annotated[Context, Depends(check_access_token)]):
     responses=response_generator(
         status.HTTP_400_BAD_REQUEST,
         status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_409_CONFLICT,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
@@ -70,7 +167,28 @@ async def create_person(
     ctx: Annotated[Context, Depends(check_access_token)], create_person: CreatePerson
 ):
     data = await person_service.create_person(ctx, create_person=create_person)
-    return ResponseOK(data=data)
+    return ResponseOK[Person].model_construct(data=to_resource(Person, data))
+
+
+@router.post(
+    "/v1/persons:batch",
+    response_model=ResponseOK[Sequence[Person]],
+    status_code=status.HTTP_201_CREATED,
+    responses=response_generator(
+        status.HTTP_400_BAD_REQUEST,
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_409_CONFLICT,
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ),
+)
+async def create_persons(
+    ctx: Annotated[Context, Depends(check_access_token)],
+    create_persons: Annotated[
+        list[CreatePerson], Body(min_length=1, max_length=settings.batch_max_size)
+    ],
+):
+    data = await person_service.create_persons(ctx, create_persons=create_persons)
+    return ResponseOK[Sequence[Person]].model_construct(data=to_resources(Person, data))
 
 
 @router.put(
@@ -80,18 +198,31 @@ async def create_person(
     responses=response_generator(
         status.HTTP_400_BAD_REQUEST,
         status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_409_CONFLICT,
+        status.HTTP_412_PRECONDITION_FAILED,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
 async def update_person(
+    request: Request,
     ctx: Annotated[Context, Depends(check_access_token)],
     person_id: int,
     update_person: UpdatePerson,
 ):
     data = await person_service.update_person(
-        ctx, person_id=person_id, update_person=update_person
+        ctx,
+        person_id=person_id,
+        update_person=update_person,
+        versions=if_match(request),
+    )
+    person = to_resource(Person, data)
+    return JSONResponse(
+        ResponseOK[Person].model_construct(data=person),
+        headers=Validator.of_version(
+            person.version, last_modified=person.updated_at
+        ).headers(),
     )
-    return ResponseOK(data=data)
 
 
 @router.patch(
@@ -101,18 +232,31 @@ async def update_person(
     responses=response_generator(
         status.HTTP_400_BAD_REQUEST,
         status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_409_CONFLICT,
+        status.HTTP_412_PRECONDITION_FAILED,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
 async def update_person_optional(
+    request: Request,
     ctx: Annotated[Context, Depends(check_access_token)],
     person_id: int,
     update_person: UpdatePersonOptional,
 ):
     data = await person_service.update_person_optional(
-        ctx, person_id=person_id, update_person=update_person
+        ctx,
+        person_id=person_id,
+        update_person=update_person,
+        versions=if_match(request),
+    )
+    person = to_resource(Person, data)
+    return JSONResponse(
+        ResponseOK[Person].model_construct(data=person),
+        headers=Validator.of_version(
+            person.version, last_modified=person.updated_at
+        ).headers(),
     )
-    return ResponseOK(data=data)
 
 
 @router.delete(
@@ -132,4 +276,28 @@ async def delete_person(
     return
 
 
+@router.delete(
+    "/v1/persons",
+    response_model=ResponseOK[Sequence[int]],
+    status_code=status.HTTP_200_OK,
+    responses=response_generator(
+        status.HTTP_400_BAD_REQUEST,
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ),
+)
+async def delete_persons(
+    ctx: Annotated[Context, Depends(check_access_token)],
+    person_ids: Annotated[
+        list[int],
+        Query(alias="id", min_length=1, max_length=settings.batch_max_size),
+    ],
+):
+    data = await person_service.delete_persons(ctx, person_ids=person_ids)
+    if not data:
+        raise NotFoundError("persons not found")
+    return ResponseOK[Sequence[int]](data=data)
+
+
 __all__ = ("router",)
@@ -1,25 +1,63 @@
 from typing import Annotated, Sequence
 
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic import BaseModel
 
+from server.core.conditional import (
+    Validator,
+    conditional_response,
+    if_match,
+    if_none_match,
+    not_modified,
+    not_modified_response,
+)
 from server.core.context import Context, get_context_with_request
 from server.core.exceptions import NoContentError
+from server.core.fields import parse_fields, sparse_resource
+from server.core.mapper import to_resource, to_resources
 from server.core.openapi import response_generator
-from server.core.schema import ResponseOK
+from server.core.query import RANGE, QuerySpec
+from server.core.response import JSONResponse, ResponseModelRoute
+from server.core.schema import ResponseOK, ResponsePage
+from server.core.settings import get_settings
+from server.core.streaming import NDJSONResponse
 from server.enums.openapi_enum import OpenApiTagEnum
+from server.enums.query_enum import QueryOperatorEnum
+from server.enums.user_enum import UserExpandEnum
 from server.resources.user_resource import (
     CreateUserPerson,
     UpdateUser,
     UpdateUserOptional,
     UpdateUserPassword,
     User,
+    UserPerson,
 )
 from server.services import user_service
 from server.services.auth_service import check_access_token
 
+settings = get_settings()
+
 router = APIRouter(
     prefix="/users",
     tags=[OpenApiTagEnum.USER],
+    route_class=ResponseModelRoute,
+)
+
+# only what an index can answer, see the list query indexes migration
+user_query = QuerySpec(
+    User,
+    filters={
+        "username": (QueryOperatorEnum.EQ, QueryOperatorEnum.PREFIX),
+        "active": (QueryOperatorEnum.EQ,),
+        "created_at": RANGE,
+        "updated_at": RANGE,
+    },
+    sorts={
+        "id": ("id",),
+        "username": ("username",),
+        "created_at": ("created_at", "id"),
+        "updated_at": ("updated_at", "id"),
+    },
 )
 
 
@@ -30,6 +68,7 @@ router = APIRouter(
     responses=response_generator(
         status.HTTP_400_BAD_REQUEST,
         status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_409_CONFLICT,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
@@ -40,7 +79,7 @@ async def create_user_and_person(
     data = await user_service.create_user_person(
         ctx=ctx, user_person_create=user_person_create
     )
-    return ResponseOK(data=data)
+    return ResponseOK[User].model_construct(data=to_resource(User, data))
 
 
 @router.post(
@@ -62,39 +101,123 @@ async def update_user_password(
     data = await user_service.change_password(
         ctx=ctx, user_id=user_id, update_password=update_password
     )
-    return ResponseOK(data=data)
+    return ResponseOK[User].model_construct(data=to_resource(User, data))
 
 
 @router.get(
     "/v1/users/{user_id}",
-    response_model=ResponseOK[User],
+    response_model=ResponseOK[UserPerson | User],
     status_code=status.HTTP_200_OK,
     responses=response_generator(
+        status.HTTP_304_NOT_MODIFIED,
         status.HTTP_401_UNAUTHORIZED,
         status.HTTP_404_NOT_FOUND,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
-async def get_user(ctx: Annotated[Context, Depends(check_access_token)], user_id: int):
-    data = await user_service.get_user(ctx, user_id=user_id)
-    return ResponseOK(data=data)
+async def get_user(
+    request: Request,
+    ctx: Annotated[Context, Depends(check_access_token)],
+    user_id: int,
+    expand: UserExpandEnum | None = None,
+):
+    data = await user_service.get_user(
+        ctx, user_id=user_id, with_person=expand == UserExpandEnum.PERSON
+    )
+    if isinstance(data, UserPerson):
+        # the person has its own version, the pair names this representation
+        validator = Validator(
+            data.version,
+            data.person.version,
+            last_modified=max(data.updated_at, data.person.updated_at),
+        )
+    else:
+        validator = Validator.of_version(data.version, last_modified=data.updated_at)
+    return conditional_response(
+        request, validator, ResponseOK[UserPerson | User].model_construct(data=data)
+    )
 
 
 @router.get(
     "/v1/users",
-    response_model=ResponseOK[Sequence[User]],
+    response_model=ResponsePage[Sequence[UserPerson] | Sequence[User]],
     status_code=status.HTTP_200_OK,
     responses=response_generator(
         status.HTTP_204_NO_CONTENT,
+        status.HTTP_304_NOT_MODIFIED,
+        status.HTTP_400_BAD_REQUEST,
         status.HTTP_401_UNAUTHORIZED,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
-async def get_all_users(ctx: Annotated[Context, Depends(check_access_token)]):
-    data = await user_service.get_all_users(ctx)
-    if not data:
+async def get_all_users(
+    request: Request,
+    ctx: Annotated[Context, Depends(check_access_token)],
+    limit: Annotated[
+        int, Query(ge=1, le=settings.pagination_max_limit)
+    ] = settings.pagination_default_limit,
+    cursor: str | None = None,
+    expand: UserExpandEnum | None = None,
+    fields: Annotated[
+        str | None, Query(description="comma separated fields, e.g. id,username")
+    ] = None,
+    filter_: Annotated[
+        list[str] | None,
+        Query(alias="filter", description="field:operator:value, e.g. active:eq:true"),
+    ] = None,
+    sort: Annotated[
+        str | None, Query(description="field to sort by, descending with a -")
+    ] = None,
+):
+    with_person = expand == UserExpandEnum.PERSON
+    resource: type[BaseModel] = User
+    if with_person:
+        resource = UserPerson
+    selected = parse_fields(resource, fields)
+    query = user_query.parse(filter_, sort)
+    if if_none_match(request):
+        # checked in SQL before reading the rows of the page
+        version = await user_service.get_all_users_version(
+            ctx, limit=limit, cursor=cursor, with_person=with_person, query=query
+        )
+        validator = Validator(*version, query, *selected)
+        if not_modified(request, validator):
+            return not_modified_response(validator)
+    page = await user_service.get_all_users(
+        ctx,
+        limit=limit,
+        cursor=cursor,
+        with_person=with_person,
+        fields=selected,
+        query=query,
+    )
+    if not page.items:
         raise NoContentError()
-    return ResponseOK(data=data)
+    if selected:
+        resource = sparse_resource(resource, selected)
+    return conditional_response(
+        request,
+        Validator(
+            *user_service.page_version(page, with_person=with_person), query, *selected
+        ),
+        ResponsePage[Sequence[resource]].model_construct(  # type: ignore[valid-type]
+            data=to_resources(resource, page.items), next=page.next
+        ),
+    )
+
+
+@router.get(
+    "/v1/users:export",
+    response_class=NDJSONResponse,
+    status_code=status.HTTP_200_OK,
+    responses=response_generator(
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ),
+)
+async def export_users(ctx: Annotated[Context, Depends(check_access_token)]):
+    chunks = user_service.export_users(ctx, chunk_size=settings.export_chunk_size)
+    return NDJSONResponse(chunks, User)
 
 
 @router.put(
@@ -104,16 +227,28 @@ async def get_all_users(ctx: Annotated[Context, Depends(check_access_token)]):
     responses=response_generator(
         status.HTTP_400_BAD_REQUEST,
         status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_409_CONFLICT,
+        status.HTTP_412_PRECONDITION_FAILED,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
 async def update_user(
+    request: Request,
     ctx: Annotated[Context, Depends(check_access_token)],
     user_id: int,
     update_user: UpdateUser,
 ):
-    data = await user_service.update_user(ctx, user_id=user_id, update_user=update_user)
-    return ResponseOK(data=data)
+    data = await user_service.update_user(
+        ctx, user_id=user_id, update_user=update_user, versions=if_match(request)
+    )
+    user = to_resource(User, data)
+    return JSONResponse(
+        ResponseOK[User].model_construct(data=user),
+        headers=Validator.of_version(
+            user.version, last_modified=user.updated_at
+        ).headers(),
+    )
 
 
 @router.patch(
@@ -123,18 +258,28 @@ async def update_user(
     responses=response_generator(
         status.HTTP_400_BAD_REQUEST,
         status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_409_CONFLICT,
+        status.HTTP_412_PRECONDITION_FAILED,
         status.HTTP_500_INTERNAL_SERVER_ERROR,
     ),
 )
 async def update_user_optional(
+    request: Request,
     ctx: Annotated[Context, Depends(check_access_token)],
     user_id: int,
     update_user: UpdateUserOptional,
 ):
     data = await user_service.update_user_optional(
-        ctx, user_id=user_id, update_user=update_user
+        ctx, user_id=user_id, update_user=update_user, versions=if_match(request)
+    )
+    user = to_resource(User, data)
+    return JSONResponse(
+        ResponseOK[User].model_construct(data=user),
+        headers=Validator.of_version(
+            user.version, last_modified=user.updated_at
+        ).headers(),
     )
-    return ResponseOK(data=data)
 
 
 @router.delete(
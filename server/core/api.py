@@ -1,17 +1,32 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
+
 from fastapi import FastAPI
 
 from server.core import handler, middleware, openapi, router
+from server.core.crypt import get_crypt
+from server.core.database import sessionio_maker
+from server.core.response import JSONResponse
 from server.core.settings import get_settings
 
 settings = get_settings()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, Any]:
+    yield
+    get_crypt().shutdown()
+    await sessionio_maker().kw["bind"].dispose()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         version=settings.app_version,
         description=settings.openapi_description,
         with_google_fonts=True,
+        lifespan=lifespan,
+        default_response_class=JSONResponse,
     )
     middleware.init_app(app)
     handler.init_app(app)
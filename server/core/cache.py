@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import struct
+import time
+from collections import OrderedDict
+from functools import cache
+from typing import Any, Awaitable, Callable, Generic, Hashable, Protocol, Self, TypeVar
+
+from pydantic import BaseModel
+
+from server.core.invalidation import InvalidationBus, get_invalidation_bus
+from server.core.settings import get_settings
+from server.core.singleflight import SingleFlight
+from server.enums.cache_enum import CacheBackendEnum
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+R = TypeVar("R", bound=BaseModel)
+
+VERSION = struct.Struct("<Q")
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self: Self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self: Self) -> int:
+        return len(self._data)
+
+    def __contains__(self: Self, key: K) -> bool:
+        return self.peek(key) is not None
+
+    def peek(self: Self, key: K) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expire_at, value = item
+        if expire_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def get(self: Self, key: K) -> V | None:
+        value = self.peek(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self: Self, key: K, value: V, ttl: float | None = None):
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self: Self, key: K):
+        self._data.pop(key, None)
+
+    def delete_where(self: Self, predicate: Callable[[V], bool]):
+        for key in [k for k, (_, v) in self._data.items() if predicate(v)]:
+            del self._data[key]
+
+    def clear(self: Self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self: Self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+class CacheBackendInterface(Protocol):
+    async def get(self: Self, key: str) -> bytes | None: ...
+    async def set(self: Self, key: str, value: bytes, ttl: float): ...
+    async def delete(self: Self, *keys: str): ...
+
+
+class MemoryCacheBackend(CacheBackendInterface):
+    def __init__(self: Self, maxsize: int, ttl: float):
+        self._cache = TTLCache[str, bytes](maxsize=maxsize, ttl=ttl)
+
+    async def get(self: Self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self: Self, key: str, value: bytes, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self: Self, *keys: str):
+        for key in keys:
+            self._cache.delete(key)
+
+    def clear(self: Self):
+        self._cache.clear()
+
+
+class RedisCacheBackend(CacheBackendInterface):
+    def __init__(self: Self, client: Any):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> RedisCacheBackend:
+        # optional dependency, installed with the `redis` extra
+        from redis.asyncio import Redis  # type: ignore[import-not-found,import-untyped]
+
+        return cls(Redis.from_url(url))
+
+    async def get(self: Self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self: Self, key: str, value: bytes, ttl: float):
+        if ttl <= 0:
+            await self.delete(key)
+            return
+        await self.client.set(key, value, px=max(int(ttl * 1000), 1))
+
+    async def delete(self: Self, *keys: str):
+        if keys:
+            await self.client.delete(*keys)
+
+
+class CacheVersionsInterface(Protocol):
+    async def version(self: Self, name: str, key: Hashable) -> int: ...
+    async def publish(self: Self, name: str, *keys: Hashable): ...
+
+
+class BusCacheVersions(CacheVersionsInterface):
+    # counters of the workers of one host, for entries kept in their memory
+    def __init__(self: Self, bus: InvalidationBus):
+        self._bus = bus
+
+    async def version(self: Self, name: str, key: Hashable) -> int:
+        return self._bus.version(name, key)
+
+    async def publish(self: Self, name: str, *keys: Hashable):
+        self._bus.publish(name, *keys)
+
+
+class RedisCacheVersions(CacheVersionsInterface):
+    # counters next to the entries, shared by every worker that shares them
+    def __init__(self: Self, client: Any, ttl: float):
+        self._client = client
+        # a counter outlives the entries stamped with it, an expired counter
+        # reads 0 again and must not match an entry loaded before it expired
+        self._px = max(int(ttl * 2000), 1)
+
+    @staticmethod
+    def _key(name: str, key: Hashable) -> str:
+        return f"{name}:{key}:version"
+
+    async def version(self: Self, name: str, key: Hashable) -> int:
+        return int(await self._client.get(self._key(name, key)) or 0)
+
+    async def publish(self: Self, name: str, *keys: Hashable):
+        if not keys:
+            return
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(self._key(name, key))
+                pipe.pexpire(self._key(name, key), self._px)
+            await pipe.execute()
+
+
+class EntityCache(Generic[R]):
+    def __init__(
+        self: Self,
+        name: str,
+        resource: type[R],
+        backend: CacheBackendInterface,
+        versions: CacheVersionsInterface,
+        ttl: float,
+    ):
+        self._name = name
+        self._prefix = f"{name}:"
+        self._resource = resource
+        self._backend = backend
+        self._versions = versions
+        self._ttl = ttl
+        self._flight = SingleFlight[Hashable, R](f"{name}_cache")
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self: Self, pk: Hashable) -> str:
+        return f"{self._prefix}{pk}"
+
+    async def get(self: Self, pk: Hashable) -> R | None:
+        data = await self._backend.get(self._key(pk))
+        if data is None:
+            return None
+        # entries are prefixed with the version they were loaded at
+        if VERSION.unpack_from(data)[0] != await self._versions.version(self._name, pk):
+            return None
+        return self._resource.model_validate_json(data[VERSION.size :])
+
+    async def set(self: Self, pk: Hashable, value: R, version: int | None = None):
+        if self._ttl <= 0:
+            return
+        if version is None:
+            version = await self._versions.version(self._name, pk)
+        data = VERSION.pack(version) + value.__pydantic_serializer__.to_json(value)
+        await self._backend.set(self._key(pk), data, ttl=self._ttl)
+
+    async def delete(self: Self, *pks: Hashable):
+        # called after commit, other workers see the new version on their next get
+        await self._versions.publish(self._name, *pks)
+        self._flight.forget(*pks)
+        await self._backend.delete(*(self._key(pk) for pk in pks))
+
+    async def get_or_load(
+        self: Self, pk: Hashable, loader: Callable[[], Awaitable[R]]
+    ) -> R:
+        value = await self.get(pk)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        async def load() -> R:
+            self.misses += 1
+            # a load that overlaps an invalidation is stored already stale
+            version = await self._versions.version(self._name, pk)
+            value = await loader()
+            await self.set(pk, value, version)
+            return value
+
+        # concurrent misses of the same row share a single query
+        return await self._flight.do(pk, load)
+
+    def clear(self: Self):
+        self._flight.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self: Self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._flight.collapsed,
+        }
+
+
+@cache
+def get_cache_backend() -> CacheBackendInterface:
+    config = get_settings()
+    if config.entity_cache_backend == CacheBackendEnum.REDIS:
+        return RedisCacheBackend.from_url(str(config.entity_cache_url))
+    return MemoryCacheBackend(
+        maxsize=config.entity_cache_maxsize, ttl=config.entity_cache_ttl
+    )
+
+
+@cache
+def get_cache_versions() -> CacheVersionsInterface:
+    config = get_settings()
+    backend = get_cache_backend()
+    if isinstance(backend, RedisCacheBackend):
+        # entries written by any host, host wide counters would disagree on them
+        return RedisCacheVersions(backend.client, ttl=config.entity_cache_ttl)
+    return BusCacheVersions(get_invalidation_bus())
+
+
+__all__ = (
+    "TTLCache",
+    "CacheBackendInterface",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "CacheVersionsInterface",
+    "BusCacheVersions",
+    "RedisCacheVersions",
+    "EntityCache",
+    "get_cache_backend",
+    "get_cache_versions",
+)
@@ -0,0 +1,114 @@
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+from typing import Any, Self
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from server.core.response import JSONResponse
+
+VERSION_TAG = re.compile(r'"([0-9]{1,10})"')
+# the version column is a 32 bit integer
+VERSION_MAX = 2**31 - 1
+
+
+def _utc(value: datetime) -> datetime:
+    # sqlite hands back naive timestamps, they are stored in utc
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class Validator:
+    __slots__ = ("etag", "last_modified")
+
+    def __init__(self: Self, *parts: Any, last_modified: datetime | None = None):
+        raw = "|".join(
+            _utc(part).isoformat() if isinstance(part, datetime) else str(part)
+            for part in parts
+        )
+        self.etag = f'"{blake2b(raw.encode(), digest_size=16).hexdigest()}"'
+        self.last_modified = last_modified
+
+    @classmethod
+    def of_version(
+        cls: type[Self], version: int, last_modified: datetime | None = None
+    ) -> Self:
+        # the row version changes with every write and ids are never handed
+        # out again (AUTOINCREMENT on sqlite), it is the etag as it is
+        validator = cls(last_modified=last_modified)
+        validator.etag = f'"{version}"'
+        return validator
+
+    def headers(self: Self) -> dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                _utc(self.last_modified), usegmt=True
+            )
+        return headers
+
+
+def if_none_match(request: Request) -> set[str] | None:
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    # weak comparison, as If-None-Match asks for
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def if_match(request: Request) -> list[int] | None:
+    header = request.headers.get("if-match")
+    if header is None:
+        return None
+    tags = [tag.strip() for tag in header.split(",")]
+    if "*" in tags:
+        # any version will do, a missing row is still a 404
+        return None
+    # strong comparison, a weak or foreign tag matches no version
+    matches = (VERSION_TAG.fullmatch(tag) for tag in tags)
+    versions = (int(match[1]) for match in matches if match)
+    return [version for version in versions if version <= VERSION_MAX]
+
+
+def not_modified(request: Request, validator: Validator) -> bool:
+    tags = if_none_match(request)
+    if tags is not None:
+        # If-Modified-Since is ignored when an etag was sent
+        return "*" in tags or validator.etag in tags
+    header = request.headers.get("if-modified-since")
+    if header is None or validator.last_modified is None:
+        return False
+    try:
+        since = _utc(parsedate_to_datetime(header))
+    except (TypeError, ValueError):
+        return False
+    # http dates have no fraction of a second
+    return _utc(validator.last_modified).replace(microsecond=0) <= since
+
+
+def not_modified_response(validator: Validator) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=validator.headers()
+    )
+
+
+def conditional_response(
+    request: Request, validator: Validator, content: BaseModel
+) -> Response:
+    # a match never serializes the content
+    if not_modified(request, validator):
+        return not_modified_response(validator)
+    return JSONResponse(content, headers=validator.headers())
+
+
+__all__ = (
+    "Validator",
+    "if_none_match",
+    "if_match",
+    "not_modified",
+    "not_modified_response",
+    "conditional_response",
+)
@@ -3,40 +3,43 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, AsyncGenerator, Self
 
 from fastapi import Request
-from pydantic import BaseModel, ConfigDict
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from server.core.database import SessionIO, get_sessionio
+from server.core.database import SessionIO, sessionio_maker
 
 if TYPE_CHECKING:
     from server.resources.user_resource import User
 
 
-class Context(BaseModel):
-    # private
-    _session: SessionIO | None = None
-    _user: User | None = None
-    _request: Request | None = None
-
-    # config
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+class Context:
+    __slots__ = ("_session", "_session_maker", "_user", "_request")
 
     def __init__(
         self: Self,
         session: SessionIO | None = None,
         user: User | None = None,
         request: Request | None = None,
+        session_maker: async_sessionmaker[SessionIO] | None = None,
     ):
-        super().__init__()
         self._session = session
+        self._session_maker = session_maker
         self._user = user
         self._request = request
 
     @property
     def session(self: Self) -> SessionIO:
         if not self._session:
-            raise ValueError("session not found")
+            if not self._session_maker:
+                raise ValueError("session not found")
+            self._session = self._session_maker()
         return self._session
 
+    def open_session(self: Self) -> SessionIO:
+        # a session owned by the caller, outliving the request (e.g. streaming)
+        if not self._session_maker:
+            raise ValueError("session maker not found")
+        return self._session_maker()
+
     @property
     def user(self: Self) -> User:
         if not self._user:
@@ -49,12 +52,21 @@ class Context(BaseModel):
             raise ValueError("request not found")
         return self._request
 
+    async def close(self: Self):
+        # only sessions opened by the context itself are released here
+        if self._session and self._session_maker:
+            await self._session.close()
+            self._session = None
+
 
 async def get_context_with_request(
     request: Request,
 ) -> AsyncGenerator[Context, Any]:
-    async for session in get_sessionio():
-        yield Context(session=session, request=request)
+    ctx = Context(session_maker=sessionio_maker(), request=request)
+    try:
+        yield ctx
+    finally:
+        await ctx.close()
 
 
 __all__ = ("Context", "get_context_with_request")
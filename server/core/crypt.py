@@ -1,28 +1,110 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from functools import cache
-from typing import Protocol, Self
+from typing import Any, Callable, Protocol, Self, TypeVar
 
 from passlib.context import CryptContext
 
+from server.core.exceptions import ServiceUnavailableError
+from server.core.settings import get_settings
+from server.enums.crypt_enum import CryptExecutorEnum
+
+T = TypeVar("T")
+
+
+@cache
+def _pw_context() -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _check_password(password: str, hashed_password: str) -> bool:
+    return _pw_context().verify(password, hashed_password)
+
+
+def _hash_password(password: str) -> str:
+    return _pw_context().hash(password)
+
 
 class CryptInterface(Protocol):
     def check_password(self: Self, password: str, hashed_password: str) -> bool: ...
     def hash_password(self: Self, password: str) -> str: ...
+    async def acheck_password(
+        self: Self, password: str, hashed_password: str
+    ) -> bool: ...
+    async def ahash_password(self: Self, password: str) -> str: ...
+    def shutdown(self: Self): ...
 
 
 class PasslibCore(CryptInterface):
-    def __init__(self: Self):
-        self._pw_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def __init__(
+        self: Self,
+        executor: CryptExecutorEnum = CryptExecutorEnum.THREAD,
+        max_workers: int = 4,
+        max_pending: int = 64,
+    ):
+        self._executor_type = executor
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    @property
+    def executor(self: Self) -> Executor:
+        if self._executor is None:
+            if self._executor_type == CryptExecutorEnum.PROCESS:
+                # fork would copy the locks held by the event loop threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="crypt"
+                )
+        return self._executor
+
+    @property
+    def pending(self: Self) -> int:
+        return self._pending
+
+    async def _run(self: Self, func: Callable[..., T], *args: Any) -> T:
+        # bounded queue: reject instead of piling up work behind the pool
+        if self._pending >= self._max_pending:
+            raise ServiceUnavailableError("crypt worker pool is busy")
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self._pending -= 1
 
     def check_password(self: Self, password: str, hashed_password: str) -> bool:
-        return self._pw_context.verify(password, hashed_password)
+        return _check_password(password, hashed_password)
 
     def hash_password(self: Self, password: str) -> str:
-        return self._pw_context.hash(password)
+        return _hash_password(password)
+
+    async def acheck_password(self: Self, password: str, hashed_password: str) -> bool:
+        return await self._run(_check_password, password, hashed_password)
+
+    async def ahash_password(self: Self, password: str) -> str:
+        return await self._run(_hash_password, password)
+
+    def shutdown(self: Self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
 
 @cache
 def get_crypt() -> CryptInterface:
-    return PasslibCore()
+    config = get_settings()
+    return PasslibCore(
+        executor=config.crypt_executor,
+        max_workers=config.crypt_max_workers,
+        max_pending=config.crypt_max_pending,
+    )
 
 
 __all__ = (
@@ -1,23 +1,112 @@
+import time
 from functools import cache
 from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from server.core.settings import get_settings
+from server.core import metrics
+from server.core.settings import Settings, get_settings
+
+pool_checkout_wait = metrics.Summary()
+pool_checkout_timeouts = metrics.Counter()
 
 
 class SessionIO(AsyncSession):
     pass
 
 
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    def connect(self) -> PoolProxiedConnection:
+        # every checkout of the engine, waiting for a free slot included
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_checkout_timeouts.inc()
+            raise
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - start)
+
+
+def is_memory_database(url: str) -> bool:
+    database = make_url(url).database
+    return database in (None, "", ":memory:") or "mode=memory" in url
+
+
+def dialect_options(config: Settings) -> dict[str, Any]:
+    match make_url(str(config.db_url)).get_backend_name():
+        case "postgresql":
+            # 0 disables server-side prepared statements (e.g. behind pgbouncer)
+            return {
+                "connect_args": {
+                    "statement_cache_size": config.db_statement_cache_size,
+                    "prepared_statement_cache_size": (
+                        config.db_prepared_statement_cache_size
+                    ),
+                }
+            }
+        case _:
+            return {}
+
+
+def engine_options(config: Settings) -> dict[str, Any]:
+    url = str(config.db_url)
+    options = dialect_options(config)
+    if is_memory_database(url):
+        # in-memory sqlite lives in a single connection, there is nothing to pool
+        return options
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": config.db_pool_size,
+        "max_overflow": config.db_pool_max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping,
+        **options,
+    }
+
+
+def sqlite_pragmas(config: Settings) -> list[str]:
+    return [
+        f"PRAGMA journal_mode={config.db_sqlite_journal_mode}",
+        f"PRAGMA synchronous={config.db_sqlite_synchronous}",
+        f"PRAGMA mmap_size={config.db_sqlite_mmap_size}",
+        f"PRAGMA cache_size={config.db_sqlite_cache_size}",
+        f"PRAGMA busy_timeout={config.db_sqlite_busy_timeout}",
+        f"PRAGMA temp_store={config.db_sqlite_temp_store}",
+    ]
+
+
+def init_engine(engine: AsyncEngine, config: Settings) -> AsyncEngine:
+    if engine.dialect.name == "sqlite" and config.db_sqlite_pragmas:
+        pragmas = sqlite_pragmas(config)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return engine
+
+
 @cache
 def sessionio_maker() -> async_sessionmaker[SessionIO]:
     config = get_settings()
     session_local = async_sessionmaker(
-        bind=create_async_engine(
-            url=str(config.db_url),
-            echo=config.db_debug,
+        bind=init_engine(
+            create_async_engine(
+                url=str(config.db_url),
+                echo=config.db_debug,
+                **engine_options(config),
+            ),
+            config,
         ),
         class_=SessionIO,
         expire_on_commit=False,
@@ -31,4 +120,26 @@ async def get_sessionio() -> AsyncGenerator[SessionIO, Any]:
         yield session
 
 
+def pool_stats() -> dict[str, Any]:
+    stats: dict[str, Any] = {
+        "checkout_wait": pool_checkout_wait.snapshot(),
+        "checkout_timeouts": pool_checkout_timeouts.value,
+    }
+    pool = sessionio_maker().kw["bind"].pool
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        # the pool was built from the settings, which also hold its max overflow
+        capacity = pool.size() + get_settings().db_pool_max_overflow
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            # overflow() counts down from -size while the pool fills up
+            overflow=max(pool.overflow(), 0),
+            saturation=pool.checkedout() / capacity if capacity else 0.0,
+        )
+    return stats
+
+
+metrics.register("db_pool", pool_stats)
+
+
 __all__ = ("sessionio_maker", "get_sessionio", "SessionIO")
@@ -14,11 +14,23 @@ class NoContentError(BaseError):
         super().__init__(http_status=status.HTTP_204_NO_CONTENT, message="")
 
 
+class BadRequestError(BaseError):
+    def __init__(self: Self, message: str):
+        super().__init__(http_status=status.HTTP_400_BAD_REQUEST, message=message)
+
+
 class NotFoundError(BaseError):
     def __init__(self: Self, message: str):
         super().__init__(http_status=status.HTTP_404_NOT_FOUND, message=message)
 
 
+class ServiceUnavailableError(BaseError):
+    def __init__(self: Self, message: str):
+        super().__init__(
+            http_status=status.HTTP_503_SERVICE_UNAVAILABLE, message=message
+        )
+
+
 class BusinessError(BaseError):
     def __init__(self: Self, message: str):
         super().__init__(
@@ -0,0 +1,46 @@
+from functools import cache
+from typing import Any
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, create_model
+
+
+def parse_fields(resource: type[BaseModel], value: str | None) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    names: dict[str, str] = {}
+    for name, field in resource.model_fields.items():
+        names[name] = names[field.serialization_alias or name] = name
+    requested = {item.strip() for item in value.split(",")}
+    unknown = sorted(requested - names.keys())
+    if unknown:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "value_error",
+                    "loc": ("query", "fields"),
+                    "msg": f"unknown fields: {', '.join(map(repr, unknown))}",
+                    "input": value,
+                }
+            ]
+        )
+    selected = {names[item] for item in requested}
+    # in the declared order, the same selection is always the same tuple
+    return tuple(name for name in resource.model_fields if name in selected)
+
+
+@cache
+def sparse_resource(resource: type[BaseModel], fields: tuple[str, ...]) -> Any:
+    # built once per selection, so its mapper and serializer are cached as well
+    definitions: dict[str, Any] = {
+        name: (resource.model_fields[name].annotation, resource.model_fields[name])
+        for name in fields
+    }
+    return create_model(  # type: ignore[call-overload]
+        f"{resource.__name__}Fields",
+        __config__=resource.model_config,
+        **definitions,
+    )
+
+
+__all__ = ("parse_fields", "sparse_resource")
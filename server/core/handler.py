@@ -1,10 +1,16 @@
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse, Response
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.orm.exc import StaleDataError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from server.core.exceptions import BusinessError, NotFoundError
+from server.core.exceptions import (
+    BadRequestError,
+    BusinessError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
 from server.core.schema import ValidationError
 
 
@@ -24,6 +30,34 @@ async def not_found_handler(request: Request, exc: Exception):
     return Response(status_code=status.HTTP_404_NOT_FOUND)
 
 
+async def precondition_failed_handler(request: Request, exc: Exception):
+    return JSONResponse(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        content={"errors": [{"message": "resource was modified since it was read"}]},
+    )
+
+
+def unique_violation(exc: IntegrityError) -> bool:
+    # sqlite3 names the failed constraint, asyncpg reports its SQLSTATE
+    orig = exc.orig
+    return getattr(orig, "sqlstate", None) == "23505" or getattr(
+        orig, "sqlite_errorname", None
+    ) in ("SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY")
+
+
+async def conflict_handler(request: Request, exc: IntegrityError):
+    # a client error, the statement and its parameters stay out of the response
+    message = (
+        "resource already exists"
+        if unique_violation(exc)
+        else "resource conflicts with the data it references"
+    )
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"errors": [{"message": message}]},
+    )
+
+
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     if exc.status_code in (status.HTTP_204_NO_CONTENT, status.HTTP_404_NOT_FOUND):
         return Response(status_code=exc.status_code)
@@ -37,9 +71,13 @@ def init_app(app: FastAPI):
     app.exception_handler(RequestValidationError)(request_validation_error_handler)
     app.exception_handler(NoResultFound)(not_found_handler)
     app.exception_handler(NotFoundError)(not_found_handler)
+    app.exception_handler(StaleDataError)(precondition_failed_handler)
+    app.exception_handler(IntegrityError)(conflict_handler)
     app.exception_handler(StarletteHTTPException)(http_exception_handler)
     app.exception_handler(HTTPException)(http_exception_handler)
     app.exception_handler(BusinessError)(http_exception_handler)
+    app.exception_handler(BadRequestError)(http_exception_handler)
+    app.exception_handler(ServiceUnavailableError)(http_exception_handler)
 
 
 __all__ = ("init_app",)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from functools import cache
+from pathlib import Path
+from typing import Hashable, Self
+
+from server.core.settings import get_settings
+
+SLOT = struct.Struct("<Q")
+
+
+# version counters shared by every worker on the host: a write publishes by
+# bumping the counter of what it changed, a cached entry remembers the counter
+# it was loaded at and is stale once it differs. Keys hash onto a fixed number
+# of slots, a collision only costs a reload.
+class InvalidationBus:
+    def __init__(self: Self, slots: int, path: Path | None = None):
+        self._slots = slots
+        size = slots * SLOT.size
+        self._fd: int | None = None
+        if path is None:
+            # process local, shared only with children forked after it
+            self._map = mmap.mmap(-1, size)
+            return
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    def _offset(self: Self, name: str, key: Hashable) -> int:
+        # crc32 instead of hash(): str hashes are salted per process
+        return zlib.crc32(f"{name}:{key}".encode()) % self._slots * SLOT.size
+
+    def version(self: Self, name: str, key: Hashable) -> int:
+        return SLOT.unpack_from(self._map, self._offset(name, key))[0]
+
+    def publish(self: Self, name: str, *keys: Hashable):
+        for key in keys:
+            offset = self._offset(name, key)
+            if self._fd is not None:
+                # record locks are per process, so they still exclude workers
+                # forked from a master that opened the file (gunicorn --preload)
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, SLOT.size, offset)
+            try:
+                SLOT.pack_into(
+                    self._map, offset, SLOT.unpack_from(self._map, offset)[0] + 1
+                )
+            finally:
+                if self._fd is not None:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, SLOT.size, offset)
+
+    def close(self: Self):
+        self._map.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def default_path() -> Path:
+    config = get_settings()
+    # one file per user and database, the workers of one app share it
+    digest = zlib.crc32(str(config.db_url).encode())
+    name = f"realworld-api-{os.getuid()}-{digest:08x}.versions"
+    return Path(tempfile.gettempdir()) / name
+
+
+@cache
+def get_invalidation_bus() -> InvalidationBus:
+    config = get_settings()
+    return InvalidationBus(
+        slots=config.invalidation_bus_slots,
+        path=config.invalidation_bus_path or default_path(),
+    )
+
+
+__all__ = ("InvalidationBus", "get_invalidation_bus")
@@ -0,0 +1,64 @@
+from functools import cache
+from operator import attrgetter
+from typing import Any, Callable, Generic, Iterable, Self, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class ResourceMapper(Generic[T]):
+    __slots__ = ("adapter", "many_adapter", "_aliases", "_get", "_nested")
+
+    def __init__(self: Self, resource: type[T]):
+        fields = resource.model_fields
+        self.adapter = TypeAdapter(resource)
+        self.many_adapter = TypeAdapter(list[resource])  # type: ignore[valid-type]
+        # validating by alias from a dict skips the failed alias lookups that
+        # from_attributes does on every field of an ORM object
+        self._aliases = tuple(field.alias or name for name, field in fields.items())
+        self._get = attrgetter(*fields)
+        self._nested: dict[str, Callable[[Any], Any]] = {
+            field.alias or name: get_mapper(field.annotation).read
+            for name, field in fields.items()
+            if isinstance(field.annotation, type)
+            and issubclass(field.annotation, BaseModel)
+        }
+
+    def read(self: Self, obj: Any) -> Any:
+        try:
+            values = self._get(obj)
+        except AttributeError:
+            # dicts and partial objects go through the regular from_attributes
+            return obj
+        if len(self._aliases) == 1:
+            values = (values,)
+        data = dict(zip(self._aliases, values))
+        for alias, read in self._nested.items():
+            if data[alias] is not None:
+                data[alias] = read(data[alias])
+        return data
+
+    def one(self: Self, obj: Any) -> T:
+        return self.adapter.validate_python(self.read(obj), from_attributes=True)
+
+    def many(self: Self, objs: Iterable[Any]) -> list[T]:
+        return self.many_adapter.validate_python(
+            [self.read(obj) for obj in objs], from_attributes=True
+        )
+
+
+@cache
+def get_mapper(resource: type[T]) -> ResourceMapper[T]:
+    return ResourceMapper(resource)
+
+
+def to_resource(resource: type[T], obj: Any) -> T:
+    return get_mapper(resource).one(obj)
+
+
+def to_resources(resource: type[T], objs: Iterable[Any]) -> list[T]:
+    return get_mapper(resource).many(objs)
+
+
+__all__ = ("ResourceMapper", "get_mapper", "to_resource", "to_resources")
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Self
+
+Collector = Callable[[], dict[str, Any]]
+
+_collectors: dict[str, Collector] = {}
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self: Self):
+        self.value = 0
+
+    def inc(self: Self, amount: int = 1):
+        self.value += amount
+
+    def reset(self: Self):
+        self.value = 0
+
+
+class Summary:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self: Self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self: Self, value: float):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def reset(self: Self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def snapshot(self: Self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+        }
+
+
+def register(name: str, collector: Collector):
+    _collectors[name] = collector
+
+
+def collect() -> dict[str, dict[str, Any]]:
+    return {name: collector() for name, collector in _collectors.items()}
+
+
+__all__ = ("Counter", "Summary", "register", "collect")
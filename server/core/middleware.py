@@ -1,23 +1,42 @@
-from typing import Awaitable, Callable
+from typing import Self
 
-from fastapi import FastAPI, Request, Response, status
+from fastapi import FastAPI, status
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-async def catch_exception_middleware(
-    request: Request, call_next: Callable[[Request], Awaitable[Response]]
-) -> Response:
-    try:
-        return await call_next(request)
-    except Exception as err:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"errors": [{"message": str(err)}]},
-        )
+class CatchExceptionMiddleware:
+    def __init__(self: Self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as err:
+            # once the headers are out there is no 500 left to send
+            if response_started:
+                raise
+            response = JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"errors": [{"message": str(err)}]},
+            )
+            await response(scope, receive, send)
 
 
 def init_app(app: FastAPI):
-    app.middleware("http")(catch_exception_middleware)
+    app.add_middleware(CatchExceptionMiddleware)
 
 
-__all__ = ("init_app",)
+__all__ = ("init_app", "CatchExceptionMiddleware")
@@ -19,7 +19,7 @@ def response_generator(*args: int) -> dict[int | str, dict[str, Any]]:
     responses: dict[int | str, dict[str, Any]] = {}
     for status in set(args):
         if status in HTTPStatus:
-            if status in (204, 404):
+            if status in (204, 304, 404):
                 responses[status] = {"model": None}
             elif status in (400,):
                 responses[status] = {"model": ResponseBadRequest}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Generic, Self, Sequence, TypeVar
+
+from server.core.exceptions import BadRequestError
+
+T = TypeVar("T")
+
+
+class Page(Generic[T]):
+    __slots__ = ("items", "next")
+
+    def __init__(self: Self, items: Sequence[T], next: str | None = None):
+        self.items = items
+        self.next = next
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value: Any, type_: type) -> Any:
+    if type_ is datetime:
+        return datetime.fromisoformat(value)
+    if type_ is int and isinstance(value, bool):
+        raise TypeError("bool is not an int")
+    if not isinstance(value, type_):
+        raise TypeError(f"{value!r} is not {type_.__name__}")
+    return value
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(value) for value in key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple[Any, ...]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor does not match the sort key")
+        return tuple(_decode_value(v, t) for v, t in zip(values, types))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise BadRequestError("invalid cursor")
+
+
+def paginate(
+    rows: Sequence[T], limit: int, key: Callable[[T], Sequence[Any]]
+) -> Page[T]:
+    # rows are fetched with limit + 1, the extra one only tells a next page exists
+    if len(rows) <= limit:
+        return Page(items=rows)
+    items = rows[:limit]
+    return Page(items=items, next=encode_cursor(key(items[-1])))
+
+
+__all__ = ("Page", "encode_cursor", "decode_cursor", "paginate")
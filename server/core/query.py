@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Mapping, NamedTuple, Self, Sequence
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import ColumnElement, select, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from server.core import pagination
+from server.enums.query_enum import QueryOperatorEnum
+
+RANGE = (
+    QueryOperatorEnum.GT,
+    QueryOperatorEnum.GTE,
+    QueryOperatorEnum.LT,
+    QueryOperatorEnum.LTE,
+)
+
+
+class Binary(ColumnElement[str]):
+    # the column compared byte by byte, the order in which a prefix is a range
+    inherit_cache = True
+    _traverse_internals = [("column", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self: Self, column: Any):
+        self.column = column
+        self.type = column.type
+
+
+@compiles(Binary)
+def compile_binary(element: Binary, compiler: SQLCompiler, **kw: Any) -> str:
+    # sqlite already compares text with the BINARY collation
+    return compiler.process(element.column, **kw)
+
+
+@compiles(Binary, "postgresql")
+def compile_binary_postgresql(element: Binary, compiler: SQLCompiler, **kw: Any) -> str:
+    return f'{compiler.process(element.column, **kw)} COLLATE "C"'
+
+
+def successor(value: str) -> str | None:
+    # the first string after all the ones starting with value, in code point
+    # order (the byte order of utf-8)
+    for idx in reversed(range(len(value))):
+        code = ord(value[idx]) + 1
+        if code == 0xD800:
+            # surrogates can not be stored
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return value[:idx] + chr(code)
+    return None
+
+
+class ListQuery(NamedTuple):
+    filters: tuple[tuple[str, QueryOperatorEnum, Any], ...] = ()
+    sort: tuple[str, ...] = ("id",)
+    types: tuple[type, ...] = (int,)
+    descending: bool = False
+
+    def where(self: Self, model: Any) -> list[ColumnElement[bool]]:
+        clauses: list[ColumnElement[bool]] = []
+        for name, operator, value in self.filters:
+            column = getattr(model, name)
+            match operator:
+                case QueryOperatorEnum.EQ:
+                    clauses.append(column == value)
+                case QueryOperatorEnum.PREFIX:
+                    # a range an index can seek, LIKE would scan
+                    clauses.append(Binary(column) >= value)
+                    if (upper := successor(value)) is not None:
+                        clauses.append(Binary(column) < upper)
+                case QueryOperatorEnum.GT:
+                    clauses.append(column > value)
+                case QueryOperatorEnum.GTE:
+                    clauses.append(column >= value)
+                case QueryOperatorEnum.LT:
+                    clauses.append(column < value)
+                case QueryOperatorEnum.LTE:
+                    clauses.append(column <= value)
+        return clauses
+
+    def order_by(self: Self, model: Any) -> list[Any]:
+        columns = [getattr(model, name) for name in self.sort]
+        if self.descending:
+            return [column.desc() for column in columns]
+        return columns
+
+    def after(self: Self, model: Any, key: Sequence[Any]) -> ColumnElement[bool]:
+        # keyset on the sort columns, the last one is unique
+        columns = [getattr(model, name) for name in self.sort]
+        left = columns[0] if len(columns) == 1 else tuple_(*columns)
+        right = key[0] if len(key) == 1 else tuple(key)
+        return left < right if self.descending else left > right
+
+    def ends(self: Self, page: Any) -> list[Any]:
+        # the first and the last id of a page selected with the sort columns
+        reverse = self._replace(descending=not self.descending)
+        return [
+            select(page.c.id)
+            .order_by(*query.order_by(page.c))
+            .limit(1)
+            .correlate(None)
+            .scalar_subquery()
+            for query in (self, reverse)
+        ]
+
+    def key(self: Self, row: Any) -> tuple[Any, ...]:
+        return tuple(getattr(row, name) for name in self.sort)
+
+    def decode_cursor(self: Self, cursor: str) -> tuple[Any, ...]:
+        return pagination.decode_cursor(cursor, *self.types)
+
+
+class QuerySpec:
+    __slots__ = ("_names", "_filters", "_sorts", "_adapters", "_types")
+
+    def __init__(
+        self: Self,
+        resource: type[BaseModel],
+        filters: Mapping[str, Sequence[QueryOperatorEnum]],
+        sorts: Mapping[str, Sequence[str]],
+    ):
+        fields = resource.model_fields
+        # the whitelist, by the names the api shows and by the field names
+        self._names: dict[str, str] = {}
+        for name in (*filters, *sorts):
+            self._names[name] = self._names[
+                fields[name].serialization_alias or name
+            ] = name
+        self._filters = {name: frozenset(ops) for name, ops in filters.items()}
+        self._sorts = {name: tuple(columns) for name, columns in sorts.items()}
+        self._adapters = {
+            name: TypeAdapter(fields[name].annotation) for name in filters
+        }
+        self._types: dict[str, Any] = {
+            column: fields[column].annotation
+            for columns in sorts.values()
+            for column in columns
+        }
+
+    def _filter(self: Self, item: str) -> tuple[str, QueryOperatorEnum, Any]:
+        field, _, rest = item.partition(":")
+        operator, separator, raw = rest.partition(":")
+        if not separator:
+            raise ValueError(f"{item!r} is not field:operator:value")
+        name = self._names.get(field)
+        if name not in self._filters:
+            raise ValueError(f"{field!r} can not be filtered")
+        if operator not in self._filters[name]:
+            raise ValueError(f"{field!r} does not support {operator!r}")
+        value = self._adapters[name].validate_python(raw)
+        if isinstance(value, datetime):
+            # naive means utc, the timezone the columns are written in
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            value = value.astimezone(timezone.utc)
+        if operator == QueryOperatorEnum.PREFIX and not value:
+            raise ValueError(f"{field!r} needs a prefix")
+        return name, QueryOperatorEnum(operator), value
+
+    def parse(self: Self, filters: Sequence[str] | None, sort: str | None) -> ListQuery:
+        errors: list[dict[str, Any]] = []
+        parsed = []
+        for item in filters or ():
+            try:
+                parsed.append(self._filter(item))
+                continue
+            except ValidationError:
+                msg = f"{item!r} has an invalid value"
+            except ValueError as err:
+                msg = str(err)
+            errors.append(
+                {
+                    "type": "value_error",
+                    "loc": ("query", "filter"),
+                    "msg": msg,
+                    "input": item,
+                }
+            )
+        descending = sort is not None and sort.startswith("-")
+        name = self._names.get((sort or "id").removeprefix("-"))
+        if name not in self._sorts:
+            errors.append(
+                {
+                    "type": "value_error",
+                    "loc": ("query", "sort"),
+                    "msg": f"{sort!r} can not be sorted",
+                    "input": sort,
+                }
+            )
+        if errors:
+            raise RequestValidationError(errors)
+        columns = self._sorts[name]  # type: ignore[index]
+        return ListQuery(
+            # the same filters in any order are the same query
+            filters=tuple(sorted(parsed, key=lambda f: (f[0], f[1], str(f[2])))),
+            sort=columns,
+            types=tuple(self._types[column] for column in columns),
+            descending=descending,
+        )
+
+
+__all__ = ("ListQuery", "QuerySpec")
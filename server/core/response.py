@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any, Callable, Coroutine
+
+import orjson
+from fastapi import status
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse as FastAPIJSONResponse
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.requests import Request
+
+
+class JSONResponse(FastAPIJSONResponse):
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            # pydantic-core writes the json itself, aliases included
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        return orjson.dumps(content)
+
+
+class ResponseModelRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        call = self.dependant.call
+        response_class: type[Response] = (
+            self.response_class.value
+            if isinstance(self.response_class, DefaultPlaceholder)
+            else self.response_class
+        )
+        exact_model = (
+            asyncio.iscoroutinefunction(call)
+            and isinstance(self.response_model, type)
+            and issubclass(self.response_model, BaseModel)
+            and issubclass(response_class, JSONResponse)
+            and not (
+                self.response_model_include
+                or self.response_model_exclude
+                or self.response_model_exclude_unset
+                or self.response_model_exclude_defaults
+                or self.response_model_exclude_none
+            )
+        )
+        if exact_model:
+            response_model = self.response_model
+            status_code = self.status_code or status.HTTP_200_OK
+
+            async def endpoint(**values: Any) -> Any:
+                content = await call(**values)  # type: ignore[misc]
+                # already validated when the handler built it, skip the second pass
+                if type(content) is response_model:
+                    return response_class(content, status_code=status_code)
+                return content
+
+            self.dependant.call = endpoint
+        return super().get_route_handler()
+
+
+__all__ = ("JSONResponse", "ResponseModelRoute")
@@ -1,6 +1,7 @@
-from typing import Any, Dict, Generic, Optional, Sequence, TypeVar
+from typing import Any, Generic, Optional, Sequence, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+from pydantic_core import PydanticUndefined
 
 T = TypeVar("T")
 
@@ -9,7 +10,13 @@ class ValidationError(BaseModel):
     type: str
     loc: Sequence[str]
     msg: str
-    input: Optional[Dict[str, Any]]
+    input: Any
+
+    @field_validator("input", mode="before")
+    @classmethod
+    def missing_input(cls, value: Any) -> Any:
+        # missing query/path params have no input at all
+        return None if value is PydanticUndefined else value
 
 
 class MessageError(BaseModel):
@@ -20,6 +27,10 @@ class ResponseOK(BaseModel, Generic[T]):
     data: T
 
 
+class ResponsePage(ResponseOK[T], Generic[T]):
+    next: Optional[str] = None
+
+
 class ResponseBadRequest(BaseModel):
     errors: Sequence[ValidationError]
 
@@ -28,4 +39,4 @@ class ResponseErrors(BaseModel):
     errors: Sequence[MessageError]
 
 
-__all__ = ("ResponseOK", "ResponseBadRequest", "ResponseErrors")
+__all__ = ("ResponseOK", "ResponsePage", "ResponseBadRequest", "ResponseErrors")
@@ -1,16 +1,26 @@
 from functools import cache
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, Self
 
-from pydantic import Field, UrlConstraints
+from pydantic import Field, UrlConstraints, model_validator
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from server.enums.cache_enum import CacheBackendEnum
+from server.enums.crypt_enum import CryptExecutorEnum
+from server.enums.sqlite_enum import (
+    SqliteJournalModeEnum,
+    SqliteSynchronousEnum,
+    SqliteTempStoreEnum,
+)
+
 DatabaseDsn = Annotated[
     MultiHostUrl,
     UrlConstraints(
         host_required=True,
         allowed_schemes=[
             "sqlite+aiosqlite",
+            "postgresql+asyncpg",
         ],
     ),
 ]
@@ -30,15 +40,69 @@ class Settings(BaseSettings):
     # database
     db_debug: bool = False
     db_url: DatabaseDsn = Field(default=None)
+    db_pool_size: int = Field(default=5, ge=1)
+    db_pool_max_overflow: int = Field(default=10, ge=0)
+    db_pool_timeout: float = Field(default=30, gt=0)
+    db_pool_recycle: int = Field(default=-1, ge=-1)
+    db_pool_pre_ping: bool = False
+    db_statement_cache_size: int = Field(default=100, ge=0)
+    db_prepared_statement_cache_size: int = Field(default=100, ge=0)
+
+    # database: sqlite pragmas applied on every new connection
+    db_sqlite_pragmas: bool = True
+    db_sqlite_journal_mode: SqliteJournalModeEnum = SqliteJournalModeEnum.WAL
+    db_sqlite_synchronous: SqliteSynchronousEnum = SqliteSynchronousEnum.NORMAL
+    db_sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, ge=0)
+    db_sqlite_cache_size: int = -64 * 1024
+    db_sqlite_busy_timeout: int = Field(default=5000, ge=0)
+    db_sqlite_temp_store: SqliteTempStoreEnum = SqliteTempStoreEnum.MEMORY
+
+    # pagination
+    pagination_default_limit: int = Field(default=250, ge=1)
+    pagination_max_limit: int = Field(default=250, ge=1)
+
+    # export
+    export_chunk_size: int = Field(default=1000, ge=1)
+
+    # batch
+    batch_max_size: int = Field(default=1000, ge=1)
 
     # token
     token_secret_key: str = Field(default=None)
     token_algorithm: str = "HS256"
     token_expire_minutes: int = 30
 
+    # principal cache
+    principal_cache_ttl: float = Field(default=60, ge=0)
+    principal_cache_maxsize: int = Field(default=1024, ge=1)
+
+    # entity cache: person and user reads, redis needs the `redis` extra
+    entity_cache_backend: CacheBackendEnum = CacheBackendEnum.MEMORY
+    entity_cache_url: str | None = None
+    entity_cache_ttl: float = Field(default=60, ge=0)
+    entity_cache_maxsize: int = Field(default=10_000, ge=1)
+
+    # invalidation bus: a file of version counters mmapped by the workers of
+    # one host, defaults to a file in the temp dir named after the database
+    invalidation_bus_path: Path | None = None
+    invalidation_bus_slots: int = Field(default=16_384, ge=1)
+
+    # crypt
+    crypt_executor: CryptExecutorEnum = CryptExecutorEnum.THREAD
+    crypt_max_workers: int = Field(default=4, ge=1)
+    crypt_max_pending: int = Field(default=64, ge=1)
+
     # config
     model_config = SettingsConfigDict(env_file=".env")
 
+    @model_validator(mode="after")
+    def check_entity_cache_url(self: Self) -> Self:
+        # fail at startup, not on the first cached read
+        redis = self.entity_cache_backend == CacheBackendEnum.REDIS
+        if redis and not self.entity_cache_url:
+            raise ValueError("entity_cache_url is required by the redis backend")
+        return self
+
 
 @cache
 def get_settings() -> Settings:
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+from functools import wraps
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Concatenate,
+    Coroutine,
+    Generic,
+    Hashable,
+    ParamSpec,
+    Self,
+    TypeVar,
+)
+from weakref import WeakValueDictionary
+
+from sqlalchemy import event
+
+from server.core import metrics
+from server.core.context import Context
+from server.core.database import SessionIO
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+P = ParamSpec("P")
+
+_flights: WeakValueDictionary[str, SingleFlight[Any, Any]] = WeakValueDictionary()
+
+
+class SingleFlight(Generic[K, V]):
+    def __init__(self: Self, name: str):
+        self._inflight: dict[K, asyncio.Future[V]] = {}
+        self.calls = 0
+        self.collapsed = 0
+        _flights[name] = self
+
+    async def do(self: Self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        self.calls += 1
+        while (inflight := self._inflight.get(key)) is not None:
+            # someone is already running this call, wait for its result
+            await asyncio.wait((inflight,))
+            if not inflight.cancelled():
+                self.collapsed += 1
+                return inflight.result()
+            # the caller that was running it went away, run it here instead
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # waiters re-raise it, nobody else needs to retrieve it
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def forget(self: Self, *keys: K):
+        # running calls still answer their waiters, later calls start their own
+        if not keys:
+            self._inflight.clear()
+        for key in keys:
+            self._inflight.pop(key, None)
+
+    def clear(self: Self):
+        self._inflight.clear()
+        self.calls = 0
+        self.collapsed = 0
+
+    def stats(self: Self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "collapsed": self.collapsed,
+            "inflight": len(self._inflight),
+        }
+
+
+def singleflight(
+    fn: Callable[Concatenate[Context, P], Coroutine[Any, Any, V]],
+) -> Callable[Concatenate[Context, P], Coroutine[Any, Any, V]]:
+    module = fn.__module__.rsplit(".", 1)[-1]
+    flight: SingleFlight[Hashable, V] = SingleFlight(f"{module}.{fn.__name__}")
+
+    @wraps(fn)
+    async def wrapper(ctx: Context, *args: P.args, **kwargs: P.kwargs) -> V:
+        # the context only carries the session, the result depends on the rest
+        key = (args, tuple(sorted(kwargs.items())))
+        return await flight.do(key, lambda: fn(ctx, *args, **kwargs))
+
+    return wrapper
+
+
+@event.listens_for(SessionIO.sync_session_class, "after_commit")
+def forget_all(session: Any):
+    # a read issued after a write never joins one that started before it
+    for flight in list(_flights.values()):
+        flight.forget()
+
+
+def stats() -> dict[str, dict[str, int]]:
+    return {name: flight.stats() for name, flight in _flights.items()}
+
+
+metrics.register("singleflight", stats)
+
+
+__all__ = ("SingleFlight", "singleflight", "stats")
@@ -0,0 +1,31 @@
+from typing import Any, AsyncIterable, AsyncIterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from server.core.mapper import get_mapper
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def ndjson_lines(
+    chunks: AsyncIterable[Sequence[Any]], resource: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    mapper = get_mapper(resource)
+    serializer = resource.__pydantic_serializer__
+    # one write per chunk of rows, nothing but the current chunk is kept alive
+    async for chunk in chunks:
+        yield b"".join(
+            serializer.to_json(item, by_alias=True) + b"\n"
+            for item in mapper.many(chunk)
+        )
+
+
+class NDJSONResponse(StreamingResponse):
+    media_type = NDJSON_MEDIA_TYPE
+
+    def __init__(self, chunks: AsyncIterable[Sequence[Any]], resource: type[BaseModel]):
+        super().__init__(ndjson_lines(chunks, resource), media_type=self.media_type)
+
+
+__all__ = ("NDJSON_MEDIA_TYPE", "NDJSONResponse", "ndjson_lines")
@@ -1,7 +1,22 @@
-from typing import Any
+from typing import Any, Callable
+
+from sqlalchemy.dialects import postgresql, sqlite
 
 
 def repository_columns_can_update(values: dict[str, Any]) -> dict[str, Any]:
-    for k in ("id", "created_at"):
+    for k in ("id", "created_at", "version"):
         values.pop(k, None)
     return values
+
+
+def dialect_insert(
+    dialect_name: str,
+) -> Callable[..., postgresql.Insert | sqlite.Insert]:
+    # INSERT ... ON CONFLICT is only available from the dialect specific insert
+    match dialect_name:
+        case "postgresql":
+            return postgresql.insert
+        case "sqlite":
+            return sqlite.insert
+        case _:
+            raise ValueError(f"upsert is not supported on {dialect_name}")
@@ -0,0 +1,9 @@
+from enum import StrEnum
+
+
+class CacheBackendEnum(StrEnum):
+    MEMORY = "memory"
+    REDIS = "redis"
+
+
+__all__ = ("CacheBackendEnum",)
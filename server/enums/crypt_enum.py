@@ -0,0 +1,9 @@
+from enum import StrEnum
+
+
+class CryptExecutorEnum(StrEnum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+__all__ = ("CryptExecutorEnum",)
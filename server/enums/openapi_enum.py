@@ -5,6 +5,7 @@ class OpenApiTagEnum(StrEnum):
     AUTH = "Auth"
     PERSON = "Person"
     USER = "User"
+    METRICS = "Metrics"
 
 
 __all__ = ("OpenApiTagEnum",)
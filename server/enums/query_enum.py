@@ -0,0 +1,13 @@
+from enum import StrEnum
+
+
+class QueryOperatorEnum(StrEnum):
+    EQ = "eq"
+    PREFIX = "prefix"
+    GT = "gt"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
+
+
+__all__ = ("QueryOperatorEnum",)
@@ -0,0 +1,30 @@
+from enum import StrEnum
+
+
+class SqliteJournalModeEnum(StrEnum):
+    DELETE = "DELETE"
+    TRUNCATE = "TRUNCATE"
+    PERSIST = "PERSIST"
+    MEMORY = "MEMORY"
+    WAL = "WAL"
+    OFF = "OFF"
+
+
+class SqliteSynchronousEnum(StrEnum):
+    OFF = "OFF"
+    NORMAL = "NORMAL"
+    FULL = "FULL"
+    EXTRA = "EXTRA"
+
+
+class SqliteTempStoreEnum(StrEnum):
+    DEFAULT = "DEFAULT"
+    FILE = "FILE"
+    MEMORY = "MEMORY"
+
+
+__all__ = (
+    "SqliteJournalModeEnum",
+    "SqliteSynchronousEnum",
+    "SqliteTempStoreEnum",
+)
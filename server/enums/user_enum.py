@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class UserExpandEnum(StrEnum):
+    PERSON = "person"
+
+
+__all__ = ("UserExpandEnum",)
@@ -1,25 +1,40 @@
 from datetime import datetime, timezone
 
-from sqlmodel import Column, DateTime, Field, SQLModel
+from sqlmodel import Column, DateTime, Field, Index, Integer, SQLModel
+
+# bumped by every UPDATE, a write that read an older one matches no row
+_version = Column("version", Integer, default=1, server_default="1", nullable=False)
 
 
 class Person(SQLModel, table=True):
+    __mapper_args__ = {"version_id_col": _version}
+    __table_args__ = (
+        Index("ix_person_first_name_last_name", "first_name", "last_name", unique=True),
+        # list filters and sorts, postgresql also has COLLATE "C" ones for prefixes
+        Index("ix_person_last_name_id", "last_name", "id"),
+        Index("ix_person_created_at_id", "created_at", "id"),
+        Index("ix_person_updated_at_id", "updated_at", "id"),
+        # ids are never handed out again, the etag of a row is its version
+        {"sqlite_autoincrement": True},
+    )
     # pk
     id: int | None = Field(default=None, primary_key=True)
     # columns
     first_name: str
     last_name: str
+    # optimistic locking
+    version: int | None = Field(sa_column=_version)
     # timestamp
     created_at: datetime | None = Field(
         sa_column=Column(
-            DateTime,
+            DateTime(timezone=True),
             default=lambda: datetime.now(timezone.utc),
             nullable=False,
         )
     )
     updated_at: datetime | None = Field(
         sa_column=Column(
-            DateTime,
+            DateTime(timezone=True),
             default=lambda: datetime.now(timezone.utc),
             onupdate=lambda: datetime.now(timezone.utc),
             nullable=False,
@@ -3,13 +3,25 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlmodel import Column, DateTime, Field, Relationship, SQLModel
+from sqlmodel import Column, DateTime, Field, Index, Integer, Relationship, SQLModel
 
 if TYPE_CHECKING:
     from server.models.person_model import Person
 
+# bumped by every UPDATE, a write that read an older one matches no row
+_version = Column("version", Integer, default=1, server_default="1", nullable=False)
+
 
 class User(SQLModel, table=True):
+    __mapper_args__ = {"version_id_col": _version}
+    __table_args__ = (
+        # list filters and sorts, postgresql also has a COLLATE "C" one for prefixes
+        Index("ix_user_active_id", "active", "id"),
+        Index("ix_user_created_at_id", "created_at", "id"),
+        Index("ix_user_updated_at_id", "updated_at", "id"),
+        # ids are never handed out again, the etag of a row is its version
+        {"sqlite_autoincrement": True},
+    )
     # pk
     id: int | None = Field(default=None, primary_key=True)
     # columns
@@ -19,17 +31,19 @@ class User(SQLModel, table=True):
     # relationship
     person_id: int = Field(foreign_key="person.id", nullable=False)
     person: Person = Relationship()
+    # optimistic locking
+    version: int | None = Field(sa_column=_version)
     # timestamp
     created_at: datetime | None = Field(
         sa_column=Column(
-            DateTime,
+            DateTime(timezone=True),
             default=lambda: datetime.now(timezone.utc),
             nullable=False,
         )
     )
     updated_at: datetime | None = Field(
         sa_column=Column(
-            DateTime,
+            DateTime(timezone=True),
             default=lambda: datetime.now(timezone.utc),
             onupdate=lambda: datetime.now(timezone.utc),
             nullable=False,
@@ -1,9 +1,16 @@
-from typing import Any, Sequence
+from typing import Any, AsyncIterator, Sequence
 
-from sqlmodel import select
+from sqlalchemy import func, insert
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import update as sql_update
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import col, select
 
 from server.core import utils
 from server.core.database import SessionIO
+from server.core.query import ListQuery
 from server.models.person_model import Person
 
 
@@ -12,6 +19,16 @@ async def create(session: SessionIO, person: Person) -> Person:
     return person
 
 
+async def create_many(
+    session: SessionIO, persons: Sequence[Person]
+) -> Sequence[Person]:
+    # one multi-row INSERT ... RETURNING, rows come back in the input order
+    statement = insert(Person).returning(Person, sort_by_parameter_order=True)
+    values = [person.model_dump(exclude_unset=True) for person in persons]
+    result = await session.exec(statement, params=values)  # type: ignore[call-overload]
+    return result.scalars().all()
+
+
 async def get(session: SessionIO, pk: int) -> Person:
     statement = select(Person).where(Person.id == pk)
     result = await session.exec(statement)
@@ -19,43 +36,138 @@ async def get(session: SessionIO, pk: int) -> Person:
 
 
 async def get_all(
-    session: SessionIO, limit: int = 250, **values: Any
+    session: SessionIO,
+    limit: int = 250,
+    after: Sequence[Any] | None = None,
+    columns: Sequence[str] | None = None,
+    query: ListQuery = ListQuery(),
+    **values: Any,
 ) -> Sequence[Person]:
-    statement = select(Person).filter_by(**values).limit(limit)
+    statement = select(Person).filter_by(**values).where(*query.where(Person))
+    if columns:
+        # only these columns are selected, the others are never read
+        statement = statement.options(
+            load_only(*(getattr(Person, column) for column in columns))
+        )
+    if after is not None:
+        statement = statement.where(query.after(Person, after))
+    statement = statement.order_by(*query.order_by(Person)).limit(limit)
     result = await session.exec(statement)
     return result.all()
 
 
-async def update(session: SessionIO, pk: int, **values: Any) -> Person:
+async def get_page_version(
+    session: SessionIO,
+    limit: int,
+    after: Sequence[Any] | None = None,
+    query: ListQuery = ListQuery(),
+) -> tuple[Any, ...]:
+    # what the page of get_all depends on, read without its rows: size, first
+    # and last id in its order, sum of the ids, newest update and how many rows
+    # a page one longer would have
+    names = dict.fromkeys(("id", "updated_at", *query.sort))
+    columns: list[Any] = [getattr(Person, name) for name in names]
+    window = select(*columns)
+    window = window.where(*query.where(Person))
+    if after is not None:
+        window = window.where(query.after(Person, after))
+    window = window.order_by(*query.order_by(Person))
+    page = window.limit(limit).cte("page")
+    ahead = window.limit(limit + 1).subquery()
+    aggregates: list[Any] = [
+        func.count(),
+        *query.ends(page),
+        func.coalesce(func.sum(page.c.id), 0),
+        func.max(page.c.updated_at),
+        select(func.count()).select_from(ahead).scalar_subquery(),
+    ]
+    statement = select(*aggregates).select_from(page)
+    result = await session.exec(statement)
+    return tuple(result.one())
+
+
+async def stream_all(
+    session: SessionIO, chunk_size: int = 1000, **values: Any
+) -> AsyncIterator[Sequence[Person]]:
+    statement = (
+        select(Person)
+        .filter_by(**values)
+        .order_by(col(Person.id))
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await session.stream_scalars(statement)
+    async for chunk in result.partitions():
+        yield chunk
+
+
+async def update(
+    session: SessionIO, pk: int, versions: Sequence[int] | None = None, **values: Any
+) -> Person:
     utils.repository_columns_can_update(values)
-    person = await get(session=session, pk=pk)
-    person.sqlmodel_update(values)
-    session.add(person)
-    return person
+    # single round trip, the version is checked and bumped by the same UPDATE
+    statement = sql_update(Person).where(col(Person.id) == pk)
+    if versions is not None:
+        statement = statement.where(col(Person.version).in_(versions))
+    statement = statement.values(**values, version=col(Person.version) + 1).returning(
+        Person
+    )
+    result = await session.exec(statement)  # type: ignore[call-overload]
+    person = result.scalars().one_or_none()
+    if person is not None:
+        return person
+    # only a failed write pays for telling a missing row from a stale one
+    if versions is not None:
+        exists = await session.exec(select(col(Person.id)).where(col(Person.id) == pk))
+        if exists.first() is not None:
+            raise StaleDataError(f"person {pk} is not at version {versions}")
+    raise NoResultFound("No row was found when one was required")
 
 
 async def delete(session: SessionIO, pk: int):
-    person = await get(session=session, pk=pk)
-    await session.delete(person)
+    statement = sql_delete(Person).where(col(Person.id) == pk)
+    result = await session.exec(statement)  # type: ignore[call-overload]
+    if not result.rowcount:
+        raise NoResultFound("No row was found when one was required")
+
+
+async def delete_many(session: SessionIO, pks: Sequence[int]) -> Sequence[int]:
+    statement = (
+        sql_delete(Person).where(col(Person.id).in_(pks)).returning(col(Person.id))
+    )
+    result = await session.exec(statement)  # type: ignore[call-overload]
+    return result.scalars().all()
 
 
 async def get_or_create(session: SessionIO, person: Person) -> Person:
-    person_ = await get_all(
-        session=session,
-        limit=1,
-        first_name=person.first_name,
-        last_name=person.last_name,
+    # the unique (first_name, last_name) index settles concurrent signups
+    insert_ = utils.dialect_insert(session.bind.dialect.name)
+    upsert = (
+        insert_(Person)
+        .values(first_name=person.first_name, last_name=person.last_name)
+        .on_conflict_do_nothing(index_elements=["first_name", "last_name"])
+        .returning(Person)
+    )
+    result = await session.exec(upsert)  # type: ignore[call-overload]
+    created = result.scalars().one_or_none()
+    if created:
+        return created
+    # already there, nothing was returned: fetch it through the same index
+    statement = select(Person).filter_by(
+        first_name=person.first_name, last_name=person.last_name
     )
-    if person_:
-        return person_[0]
-    return await create(session=session, person=person)
+    existing = await session.exec(statement)
+    return existing.one()
 
 
 __all__ = (
     "get",
     "get_all",
+    "get_page_version",
+    "stream_all",
     "create",
+    "create_many",
     "update",
     "delete",
+    "delete_many",
     "get_or_create",
 )
@@ -1,9 +1,17 @@
-from typing import Any, Sequence
+from typing import Any, AsyncIterator, Sequence
 
-from sqlmodel import select
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import func
+from sqlalchemy import update as sql_update
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import col, select
 
 from server.core import utils
 from server.core.database import SessionIO
+from server.core.query import ListQuery
+from server.models.person_model import Person
 from server.models.user_model import User
 
 
@@ -12,36 +20,124 @@ async def create(session: SessionIO, user: User) -> User:
     return user
 
 
-async def get(session: SessionIO, pk: int) -> User:
+async def get(session: SessionIO, pk: int, with_person: bool = False) -> User:
     statement = select(User).where(User.id == pk)
+    if with_person:
+        # many-to-one, a JOIN keeps the person in the same round trip
+        statement = statement.options(joinedload(User.person))  # type: ignore[arg-type]
     result = await session.exec(statement)
     return result.one()
 
 
 async def get_all(
-    session: SessionIO, limit: int = 250, **values: Any
+    session: SessionIO,
+    limit: int = 250,
+    after: Sequence[Any] | None = None,
+    with_person: bool = False,
+    columns: Sequence[str] | None = None,
+    query: ListQuery = ListQuery(),
+    **values: Any,
 ) -> Sequence[User]:
-    statement = select(User).filter_by(**values).limit(limit)
+    statement = select(User).filter_by(**values).where(*query.where(User))
+    if columns:
+        # only these columns are selected, the others are never read
+        statement = statement.options(
+            load_only(*(getattr(User, column) for column in columns))
+        )
+    if with_person:
+        statement = statement.options(joinedload(User.person))  # type: ignore[arg-type]
+    if after is not None:
+        statement = statement.where(query.after(User, after))
+    statement = statement.order_by(*query.order_by(User)).limit(limit)
     result = await session.exec(statement)
     return result.all()
 
 
-async def update(session: SessionIO, pk: int, **values: Any) -> User:
+async def get_page_version(
+    session: SessionIO,
+    limit: int,
+    after: Sequence[Any] | None = None,
+    with_person: bool = False,
+    query: ListQuery = ListQuery(),
+) -> tuple[Any, ...]:
+    # what the page of get_all depends on, read without its rows: size, first
+    # and last id in its order, sum of the ids, newest update, how many rows a
+    # page one longer would have and, with the person, its newest update
+    names = dict.fromkeys(("id", "updated_at", *query.sort))
+    columns: list[Any] = [getattr(User, name) for name in names]
+    if with_person:
+        columns.append(col(Person.updated_at).label("person_updated_at"))
+    window = select(*columns)
+    if with_person:
+        window = window.join(Person, col(User.person_id) == col(Person.id))
+    window = window.where(*query.where(User))
+    if after is not None:
+        window = window.where(query.after(User, after))
+    window = window.order_by(*query.order_by(User))
+    page = window.limit(limit).cte("page")
+    ahead = window.limit(limit + 1).subquery()
+    aggregates: list[Any] = [
+        func.count(),
+        *query.ends(page),
+        func.coalesce(func.sum(page.c.id), 0),
+        func.max(page.c.updated_at),
+        select(func.count()).select_from(ahead).scalar_subquery(),
+    ]
+    if with_person:
+        aggregates.append(func.max(page.c.person_updated_at))
+    result = await session.exec(select(*aggregates).select_from(page))
+    return tuple(result.one())
+
+
+async def stream_all(
+    session: SessionIO, chunk_size: int = 1000, **values: Any
+) -> AsyncIterator[Sequence[User]]:
+    statement = (
+        select(User)
+        .filter_by(**values)
+        .order_by(col(User.id))
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await session.stream_scalars(statement)
+    async for chunk in result.partitions():
+        yield chunk
+
+
+async def update(
+    session: SessionIO, pk: int, versions: Sequence[int] | None = None, **values: Any
+) -> User:
     utils.repository_columns_can_update(values)
-    user = await get(session=session, pk=pk)
-    user.sqlmodel_update(values)
-    session.add(user)
-    return user
+    # single round trip, the version is checked and bumped by the same UPDATE
+    statement = sql_update(User).where(col(User.id) == pk)
+    if versions is not None:
+        statement = statement.where(col(User.version).in_(versions))
+    statement = statement.values(**values, version=col(User.version) + 1).returning(
+        User
+    )
+    result = await session.exec(statement)  # type: ignore[call-overload]
+    user = result.scalars().one_or_none()
+    if user is not None:
+        return user
+    # only a failed write pays for telling a missing row from a stale one
+    if versions is not None:
+        exists = await session.exec(select(col(User.id)).where(col(User.id) == pk))
+        if exists.first() is not None:
+            raise StaleDataError(f"user {pk} is not at version {versions}")
+    raise NoResultFound("No row was found when one was required")
 
 
 async def delete(session: SessionIO, pk: int):
-    user = await get(session=session, pk=pk)
-    await session.delete(user)
+    statement = sql_delete(User).where(col(User.id) == pk)
+    result = await session.exec(statement)  # type: ignore[call-overload]
+    if not result.rowcount:
+        raise NoResultFound("No row was found when one was required")
 
 
 __all__ = (
     "get",
     "get_all",
+    "get_page_version",
+    "stream_all",
     "create",
     "update",
     "delete",
@@ -12,6 +12,7 @@ class BaseResource(PydanticBaseModel):
             validation_alias=PydanticToCamel, serialization_alias=PydanticToCamel
         ),
         populate_by_name=True,
+        from_attributes=True,
     )
 
 
@@ -18,6 +18,7 @@ class UpdatePersonOptional(CreatePerson, metaclass=AllOptionalMetaclass):
 
 class Person(TimestampMixin, CreatePerson):
     id: int
+    version: int
 
 
 __all__ = ("CreatePerson", "Person", "UpdatePerson", "UpdatePersonOptional")
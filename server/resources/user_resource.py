@@ -5,7 +5,7 @@ from pydantic import model_validator
 from server.resources.base_resource import BaseResource
 from server.resources.metaclasses.all_optional_metaclass import AllOptionalMetaclass
 from server.resources.mixins.timestamp_mixin import TimestampMixin
-from server.resources.person_resource import CreatePerson
+from server.resources.person_resource import CreatePerson, Person
 
 
 class CreateUserPerson(CreatePerson):
@@ -48,11 +48,17 @@ class UpdateUserOptional(UpdateUser, metaclass=AllOptionalMetaclass):
 
 class User(TimestampMixin, UpdateUser):
     id: int
+    version: int
+
+
+class UserPerson(User):
+    person: Person
 
 
 __all__ = (
     "CreateUserPerson",
     "User",
+    "UserPerson",
     "UpdateUserPassword",
     "UpdateUser",
     "UpdateUserOptional",
@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Annotated, Any, AsyncGenerator
 
@@ -5,9 +6,13 @@ from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
+from server.core import metrics
+from server.core.cache import TTLCache
 from server.core.context import Context
 from server.core.crypt import get_crypt
-from server.core.database import SessionIO, get_sessionio
+from server.core.database import SessionIO, sessionio_maker
+from server.core.invalidation import get_invalidation_bus
+from server.core.mapper import to_resource
 from server.core.settings import get_settings
 from server.models.user_model import User
 from server.repositories import user_repository
@@ -24,6 +29,23 @@ credentials_error = HTTPException(
 
 crypt = get_crypt()
 settings = get_settings()
+bus = get_invalidation_bus()
+
+# bumped by every principal invalidation, before the user id: a load reads
+# it before its SELECT, so a write landing meanwhile keeps it out of the cache
+PRINCIPAL_EPOCH = "*"
+
+# the principal with the bus version of its user id when it was loaded
+principal_cache: TTLCache[str, tuple[int, UserResource]] = TTLCache(
+    maxsize=settings.principal_cache_maxsize, ttl=settings.principal_cache_ttl
+)
+
+metrics.register("principal_cache", principal_cache.stats)
+
+
+def invalidate_principal(user_id: int):
+    bus.publish("principal", PRINCIPAL_EPOCH, user_id)
+    principal_cache.delete_where(lambda item: item[1].id == user_id)
 
 
 async def get_active_user_by_username(session: SessionIO, username: str) -> User | None:
@@ -39,7 +61,9 @@ async def authenticate_user(ctx: Context, username: str, password: str) -> Token
     user = await get_active_user_by_username(session=ctx.session, username=username)
     if not user:
         raise credentials_error
-    if not crypt.check_password(password=password, hashed_password=user.password):
+    if not await crypt.acheck_password(
+        password=password, hashed_password=user.password
+    ):
         raise credentials_error
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.token_expire_minutes
@@ -57,20 +81,45 @@ async def check_access_token(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> AsyncGenerator[Context, Any]:
     try:
-        async for session in get_sessionio():
-            payload = jwt.decode(
-                token=token,
-                key=settings.token_secret_key,
-                algorithms=[settings.token_algorithm],
-            )
-            username: str = payload.get("sub", "")
-            user = await get_active_user_by_username(session=session, username=username)
-            if not (username and user):
-                raise credentials_error
-            user_resource = UserResource(**user.model_dump())
-            yield Context(session=session, user=user_resource, request=request)
+        payload = jwt.decode(
+            token=token,
+            key=settings.token_secret_key,
+            algorithms=[settings.token_algorithm],
+        )
     except JWTError:
         raise credentials_error
+    username: str = payload.get("sub", "")
+    if not username:
+        raise credentials_error
+    session_maker = sessionio_maker()
+    cached = principal_cache.get(username)
+    if cached and cached[0] == bus.version("principal", cached[1].id):
+        user_resource = cached[1]
+    else:
+        # the user id is only known after the SELECT, the epoch before it
+        epoch = bus.version("principal", PRINCIPAL_EPOCH)
+        async with session_maker() as session:
+            user = await get_active_user_by_username(session=session, username=username)
+        if not user:
+            raise credentials_error
+        user_resource = to_resource(UserResource, user)
+        version = bus.version("principal", user_resource.id)
+        if bus.version("principal", PRINCIPAL_EPOCH) == epoch:
+            principal_cache.set(
+                username,
+                (version, user_resource),
+                ttl=payload.get("exp", 0) - time.time(),
+            )
+    ctx = Context(session_maker=session_maker, user=user_resource, request=request)
+    try:
+        yield ctx
+    finally:
+        await ctx.close()
 
 
-__all__ = ("check_access_token", "authenticate_user")
+__all__ = (
+    "check_access_token",
+    "authenticate_user",
+    "principal_cache",
+    "invalidate_principal",
+)
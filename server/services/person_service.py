@@ -1,6 +1,13 @@
-from typing import Sequence
+from typing import Any, AsyncIterator, Sequence
 
+from server.core import metrics, pagination
+from server.core.cache import EntityCache, get_cache_backend, get_cache_versions
 from server.core.context import Context
+from server.core.mapper import to_resource
+from server.core.pagination import Page
+from server.core.query import ListQuery
+from server.core.settings import get_settings
+from server.core.singleflight import singleflight
 from server.models.person_model import Person
 from server.repositories import person_repository
 from server.resources.person_resource import (
@@ -8,16 +15,85 @@ from server.resources.person_resource import (
     UpdatePerson,
     UpdatePersonOptional,
 )
+from server.resources.person_resource import Person as PersonResource
 
+settings = get_settings()
 
-async def get_all_persons(ctx: Context) -> Sequence[Person]:
-    person = await person_repository.get_all(ctx.session)
-    return person
+person_cache = EntityCache(
+    "person",
+    PersonResource,
+    backend=get_cache_backend(),
+    versions=get_cache_versions(),
+    ttl=settings.entity_cache_ttl,
+)
 
+metrics.register("person_cache", person_cache.stats)
+
+
+@singleflight
+async def get_all_persons(
+    ctx: Context,
+    limit: int,
+    cursor: str | None = None,
+    fields: tuple[str, ...] = (),
+    query: ListQuery = ListQuery(),
+) -> Page[Person]:
+    after = query.decode_cursor(cursor) if cursor else None
+    # the cursor and page_version read these whatever was asked for
+    columns = sorted({"id", "updated_at", *query.sort, *fields}) if fields else None
+    persons = await person_repository.get_all(
+        ctx.session, limit=limit + 1, after=after, columns=columns, query=query
+    )
+    return pagination.paginate(persons, limit=limit, key=query.key)
+
+
+@singleflight
+async def get_all_persons_version(
+    ctx: Context, limit: int, cursor: str | None = None, query: ListQuery = ListQuery()
+) -> tuple[Any, ...]:
+    after = query.decode_cursor(cursor) if cursor else None
+    (
+        count,
+        first_id,
+        last_id,
+        id_sum,
+        updated_at,
+        ahead,
+    ) = await person_repository.get_page_version(
+        ctx.session, limit=limit, after=after, query=query
+    )
+    return count, first_id, last_id, id_sum, updated_at, ahead > limit
+
+
+def page_version(page: Page[Person]) -> tuple[Any, ...]:
+    # the same values get_all_persons_version reads in SQL, the ends and the
+    # sum of the ids change with any row that leaves, joins or moves in a page
+    items = page.items
+    return (
+        len(items),
+        items[0].id if items else None,
+        items[-1].id if items else None,
+        sum(p.id for p in items if p.id),
+        max((p.updated_at for p in items if p.updated_at), default=None),
+        page.next is not None,
+    )
+
+
+async def export_persons(
+    ctx: Context, chunk_size: int
+) -> AsyncIterator[Sequence[Person]]:
+    # the stream outlives the request dependencies, so it owns its session
+    async with ctx.open_session() as session:
+        async for chunk in person_repository.stream_all(session, chunk_size=chunk_size):
+            yield chunk
 
-async def get_person(ctx: Context, person_id: int) -> Person:
-    person = await person_repository.get(ctx.session, pk=person_id)
-    return person
+
+async def get_person(ctx: Context, person_id: int) -> PersonResource:
+    async def load() -> PersonResource:
+        person = await person_repository.get(ctx.session, pk=person_id)
+        return to_resource(PersonResource, person)
+
+    return await person_cache.get_or_load(person_id, load)
 
 
 async def create_person(ctx: Context, create_person: CreatePerson) -> Person:
@@ -29,34 +105,72 @@ async def create_person(ctx: Context, create_person: CreatePerson) -> Person:
     return person
 
 
+async def create_persons(
+    ctx: Context, create_persons: Sequence[CreatePerson]
+) -> Sequence[Person]:
+    async with ctx.session.begin():
+        persons = await person_repository.create_many(
+            ctx.session,
+            persons=[
+                Person(first_name=p.first_name, last_name=p.last_name)
+                for p in create_persons
+            ],
+        )
+    return persons
+
+
 async def update_person(
-    ctx: Context, person_id: int, update_person: UpdatePerson
+    ctx: Context,
+    person_id: int,
+    update_person: UpdatePerson,
+    versions: Sequence[int] | None = None,
 ) -> Person:
     async with ctx.session.begin():
         values = update_person.model_dump()
-        person = await person_repository.update(ctx.session, pk=person_id, **values)
+        person = await person_repository.update(
+            ctx.session, pk=person_id, versions=versions, **values
+        )
+    await person_cache.delete(person_id)
     return person
 
 
 async def update_person_optional(
-    ctx: Context, person_id: int, update_person: UpdatePersonOptional
+    ctx: Context,
+    person_id: int,
+    update_person: UpdatePersonOptional,
+    versions: Sequence[int] | None = None,
 ) -> Person:
     async with ctx.session.begin():
         values = update_person.model_dump(exclude_none=True)
-        person = await person_repository.update(ctx.session, pk=person_id, **values)
+        person = await person_repository.update(
+            ctx.session, pk=person_id, versions=versions, **values
+        )
+    await person_cache.delete(person_id)
     return person
 
 
 async def delete_person(ctx: Context, person_id: int):
     async with ctx.session.begin():
         await person_repository.delete(ctx.session, pk=person_id)
+    await person_cache.delete(person_id)
+
+
+async def delete_persons(ctx: Context, person_ids: Sequence[int]) -> Sequence[int]:
+    async with ctx.session.begin():
+        deleted = await person_repository.delete_many(ctx.session, pks=person_ids)
+    await person_cache.delete(*deleted)
+    return deleted
 
 
 __all__ = (
+    "person_cache",
     "get_person",
     "get_all_persons",
+    "export_persons",
     "create_person",
+    "create_persons",
     "update_person",
     "update_person_optional",
     "delete_person",
+    "delete_persons",
 )
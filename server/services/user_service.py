@@ -1,8 +1,15 @@
-from typing import Sequence
+from typing import Any, AsyncIterator, Sequence
 
+from server.core import metrics, pagination
+from server.core.cache import EntityCache, get_cache_backend, get_cache_versions
 from server.core.context import Context
 from server.core.crypt import get_crypt
 from server.core.exceptions import BusinessError
+from server.core.mapper import to_resource
+from server.core.pagination import Page
+from server.core.query import ListQuery
+from server.core.settings import get_settings
+from server.core.singleflight import singleflight
 from server.models.person_model import Person
 from server.models.user_model import User
 from server.repositories import person_repository, user_repository
@@ -11,14 +18,32 @@ from server.resources.user_resource import (
     UpdateUser,
     UpdateUserOptional,
     UpdateUserPassword,
+    UserPerson,
 )
+from server.resources.person_resource import Person as PersonResource
+from server.resources.user_resource import User as UserResource
+from server.services import person_service
+from server.services.auth_service import invalidate_principal
 
 crypt = get_crypt()
+settings = get_settings()
+
+user_cache = EntityCache(
+    "user",
+    UserResource,
+    backend=get_cache_backend(),
+    versions=get_cache_versions(),
+    ttl=settings.entity_cache_ttl,
+)
+
+metrics.register("user_cache", user_cache.stats)
 
 
 async def create_user_person(
     ctx: Context, user_person_create: CreateUserPerson
 ) -> User:
+    # bcrypt runs before the transaction, which only holds the two inserts
+    password_hash = await crypt.ahash_password(user_person_create.password)
     async with ctx.session.begin():
         person = await person_repository.get_or_create(
             session=ctx.session,
@@ -27,8 +52,6 @@ async def create_user_person(
                 last_name=user_person_create.last_name,
             ),
         )
-    async with ctx.session.begin():
-        password_hash = crypt.hash_password(user_person_create.password)
         user = await user_repository.create(
             session=ctx.session,
             user=User(
@@ -43,54 +66,171 @@ async def create_user_person(
 async def change_password(
     ctx: Context, user_id: int, update_password: UpdateUserPassword
 ) -> User:
-    user = await user_repository.get(session=ctx.session, pk=user_id)
-    if not crypt.check_password(update_password.current_password, user.password):
+    # the read ends its own transaction, bcrypt runs outside of both
+    async with ctx.session.begin():
+        user = await user_repository.get(session=ctx.session, pk=user_id)
+    if not await crypt.acheck_password(update_password.current_password, user.password):
         raise BusinessError("current password invalid")
+    password_hash = await crypt.ahash_password(update_password.new_password)
     async with ctx.session.begin():
-        password_hash = crypt.hash_password(update_password.new_password)
         res = await user_repository.update(
             session=ctx.session,
             pk=user_id,
             password=password_hash,
         )
+    invalidate_principal(user_id)
+    await user_cache.delete(user_id)
     return res
 
 
-async def get_all_users(ctx: Context) -> Sequence[User]:
-    user = await user_repository.get_all(ctx.session)
-    return user
-
-
-async def get_user(ctx: Context, user_id: int) -> User:
-    user = await user_repository.get(ctx.session, pk=user_id)
-    return user
-
-
-async def update_user(ctx: Context, user_id: int, update_user: UpdateUser) -> User:
+@singleflight
+async def get_all_users(
+    ctx: Context,
+    limit: int,
+    cursor: str | None = None,
+    with_person: bool = False,
+    fields: tuple[str, ...] = (),
+    query: ListQuery = ListQuery(),
+) -> Page[User]:
+    after = query.decode_cursor(cursor) if cursor else None
+    # the cursor and page_version read these whatever was asked for, the
+    # person is a relationship loaded by with_person
+    columns = (
+        sorted({"id", "updated_at", *query.sort, *fields} - {"person"})
+        if fields
+        else None
+    )
+    users = await user_repository.get_all(
+        ctx.session,
+        limit=limit + 1,
+        after=after,
+        with_person=with_person,
+        columns=columns,
+        query=query,
+    )
+    return pagination.paginate(users, limit=limit, key=query.key)
+
+
+@singleflight
+async def get_all_users_version(
+    ctx: Context,
+    limit: int,
+    cursor: str | None = None,
+    with_person: bool = False,
+    query: ListQuery = ListQuery(),
+) -> tuple[Any, ...]:
+    after = query.decode_cursor(cursor) if cursor else None
+    (
+        count,
+        first_id,
+        last_id,
+        id_sum,
+        updated_at,
+        ahead,
+        *person,
+    ) = await user_repository.get_page_version(
+        ctx.session, limit=limit, after=after, with_person=with_person, query=query
+    )
+    return count, first_id, last_id, id_sum, updated_at, ahead > limit, *person
+
+
+def page_version(page: Page[User], with_person: bool = False) -> tuple[Any, ...]:
+    # the same values get_all_users_version reads in SQL, the ends and the sum
+    # of the ids change with any row that leaves, joins or moves in a page
+    items = page.items
+    version: tuple[Any, ...] = (
+        len(items),
+        items[0].id if items else None,
+        items[-1].id if items else None,
+        sum(u.id for u in items if u.id),
+        max((u.updated_at for u in items if u.updated_at), default=None),
+        page.next is not None,
+    )
+    if with_person:
+        updated = (u.person.updated_at for u in items if u.person)
+        version += (max((u for u in updated if u), default=None),)
+    return version
+
+
+async def export_users(ctx: Context, chunk_size: int) -> AsyncIterator[Sequence[User]]:
+    # the stream outlives the request dependencies, so it owns its session
+    async with ctx.open_session() as session:
+        async for chunk in user_repository.stream_all(session, chunk_size=chunk_size):
+            yield chunk
+
+
+async def get_user(
+    ctx: Context, user_id: int, with_person: bool = False
+) -> UserResource:
+    joined: list[PersonResource] = []
+
+    async def load() -> UserResource:
+        user = await user_repository.get(
+            ctx.session, pk=user_id, with_person=with_person
+        )
+        if with_person:
+            joined.append(to_resource(PersonResource, user.person))
+        return to_resource(UserResource, user)
+
+    user = await user_cache.get_or_load(user_id, load)
+    if not with_person:
+        return user
+    # user and person are cached apart, so a person update never leaves it
+    # stale; a miss already has the person from its JOIN, which is not cached
+    # since its version can not be read before the SELECT that finds it
+    person = (
+        joined[0]
+        if joined
+        else await person_service.get_person(ctx, person_id=user.person_id)
+    )
+    return UserPerson.model_construct(**dict(user), person=person)
+
+
+async def update_user(
+    ctx: Context,
+    user_id: int,
+    update_user: UpdateUser,
+    versions: Sequence[int] | None = None,
+) -> User:
     async with ctx.session.begin():
         values = update_user.model_dump()
-        user = await user_repository.update(ctx.session, pk=user_id, **values)
+        user = await user_repository.update(
+            ctx.session, pk=user_id, versions=versions, **values
+        )
+    invalidate_principal(user_id)
+    await user_cache.delete(user_id)
     return user
 
 
 async def update_user_optional(
-    ctx: Context, user_id: int, update_user: UpdateUserOptional
+    ctx: Context,
+    user_id: int,
+    update_user: UpdateUserOptional,
+    versions: Sequence[int] | None = None,
 ) -> User:
     async with ctx.session.begin():
         values = update_user.model_dump(exclude_none=True)
-        user = await user_repository.update(ctx.session, pk=user_id, **values)
+        user = await user_repository.update(
+            ctx.session, pk=user_id, versions=versions, **values
+        )
+    invalidate_principal(user_id)
+    await user_cache.delete(user_id)
     return user
 
 
 async def delete_user(ctx: Context, user_id: int):
     async with ctx.session.begin():
         await user_repository.delete(ctx.session, pk=user_id)
+    invalidate_principal(user_id)
+    await user_cache.delete(user_id)
 
 
 __all__ = (
+    "user_cache",
     "create_user_person",
     "change_password",
     "get_all_users",
+    "export_users",
     "get_user",
     "update_user",
     "update_user_optional",
@@ -0,0 +1,9 @@
+import os
+import secrets
+import tempfile
+from pathlib import Path
+
+# benchmarks always run against a throwaway database, never the one in .env
+BENCHMARK_FOLDER = Path(tempfile.mkdtemp(prefix="benchmark-"))
+os.environ["DB_URL"] = f"sqlite+aiosqlite:///{BENCHMARK_FOLDER / 'benchmark.db'}"
+os.environ.setdefault("TOKEN_SECRET_KEY", secrets.token_hex(32))
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+from httpx import AsyncClient
+
+from tests.benchmarks.utils import (
+    get_token,
+    http_client,
+    seed_user,
+    throughput_summary,
+    use_database,
+)
+
+ROWS = 2000
+CONCURRENCY = 8
+BATCH_SIZES = (10, 100, 1000)
+
+
+def payload(idx: int) -> dict[str, str]:
+    return {"firstName": f"first{idx}", "lastName": f"last{idx}"}
+
+
+async def single_worker(client: AsyncClient, headers: dict[str, str], rows: range):
+    for idx in rows:
+        response = await client.post(
+            "/persons/v1/persons", json=payload(idx), headers=headers
+        )
+        response.raise_for_status()
+
+
+async def batch_worker(
+    client: AsyncClient, headers: dict[str, str], rows: range, batch_size: int
+):
+    for start in range(rows.start, rows.stop, batch_size):
+        items = [
+            payload(idx) for idx in range(start, min(start + batch_size, rows.stop))
+        ]
+        response = await client.post(
+            "/persons/v1/persons:batch", json=items, headers=headers
+        )
+        response.raise_for_status()
+
+
+async def scenario(batch_size: int | None):
+    name = f"batch-{batch_size}" if batch_size else "single"
+    await use_database(name)
+    await seed_user()
+    async with http_client() as client:
+        headers = {"Authorization": f"Bearer {await get_token(client)}"}
+        share = ROWS // CONCURRENCY
+        ranges = [range(i * share, (i + 1) * share) for i in range(CONCURRENCY)]
+        start = time.perf_counter()
+        if batch_size:
+            workers = [batch_worker(client, headers, r, batch_size) for r in ranges]
+        else:
+            workers = [single_worker(client, headers, r) for r in ranges]
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - start
+    label = (
+        f"POST /persons:batch, {batch_size} per request"
+        if batch_size
+        else "POST /persons, 1 per request"
+    )
+    print(throughput_summary(label, ROWS, elapsed, unit="row"))
+
+
+async def main():
+    print(f"person inserts, {ROWS} rows, {CONCURRENCY} clients")
+    await scenario(None)
+    for batch_size in BATCH_SIZES:
+        await scenario(batch_size)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, AsyncGenerator, Self, cast
+
+from fastapi import Request
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from server.core.context import Context, get_context_with_request
+from server.core.database import SessionIO, sessionio_maker
+from server.resources.user_resource import User
+from tests.benchmarks.utils import Timer, throughput_summary
+
+ROUNDS = 200_000
+
+
+class PydanticContext(BaseModel):
+    # Context as it was before the slotted rewrite
+    _session: SessionIO | None = None
+    _session_maker: async_sessionmaker[SessionIO] | None = None
+    _user: User | None = None
+    _request: Request | None = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def __init__(
+        self: Self,
+        session: SessionIO | None = None,
+        user: User | None = None,
+        request: Request | None = None,
+        session_maker: async_sessionmaker[SessionIO] | None = None,
+    ):
+        super().__init__()
+        self._session = session
+        self._session_maker = session_maker
+        self._user = user
+        self._request = request
+
+
+async def get_pydantic_context_with_request(
+    request: Request,
+) -> AsyncGenerator[PydanticContext, Any]:
+    ctx = PydanticContext(session_maker=sessionio_maker(), request=request)
+    yield ctx
+
+
+async def resolve(dependency: Any, request: Request) -> float:
+    with Timer() as timer:
+        for _ in range(ROUNDS):
+            async for _ in dependency(request=request):
+                pass
+    return timer.elapsed
+
+
+async def main():
+    request = cast(Request, object())
+    print("per-request context dependency")
+    elapsed = await resolve(get_pydantic_context_with_request, request)
+    print(throughput_summary("pydantic BaseModel context", ROUNDS, elapsed))
+    print(f"{'':<40} {elapsed / ROUNDS * 1e6:.2f}us per request")
+    elapsed = await resolve(get_context_with_request, request)
+    print(throughput_summary("slotted context", ROUNDS, elapsed))
+    print(f"{'':<40} {elapsed / ROUNDS * 1e6:.2f}us per request")
+    assert not hasattr(Context(), "__dict__")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from httpx import AsyncClient
+
+from server.core.crypt import PasslibCore
+from tests.benchmarks.utils import (
+    PASSWORD,
+    USERNAME,
+    create_database,
+    get_token,
+    http_client,
+    latency_summary,
+    seed_persons,
+    seed_user,
+)
+
+DURATION = 5.0
+STORM_CONCURRENCY = 8
+
+
+async def blocking_acheck_password(
+    self: PasslibCore, password: str, hashed_password: str
+) -> bool:
+    # behaviour before the worker pool: bcrypt on the event loop thread
+    return self.check_password(password, hashed_password)
+
+
+async def login_storm(client: AsyncClient, stop: asyncio.Event):
+    while not stop.is_set():
+        await client.post(
+            "/auth/v1/token", data={"username": USERNAME, "password": PASSWORD}
+        )
+
+
+async def read_persons(client: AsyncClient, token: str) -> list[float]:
+    latencies: list[float] = []
+    headers = {"Authorization": f"Bearer {token}"}
+    deadline = time.perf_counter() + DURATION
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/persons/v1/persons", headers=headers)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return latencies
+
+
+async def scenario(client: AsyncClient, token: str, storm: bool) -> list[float]:
+    stop = asyncio.Event()
+    workers = [
+        asyncio.create_task(login_storm(client, stop))
+        for _ in range(STORM_CONCURRENCY if storm else 0)
+    ]
+    await asyncio.sleep(0.1)
+    latencies = await read_persons(client, token)
+    stop.set()
+    await asyncio.gather(*workers)
+    return latencies
+
+
+async def main():
+    await create_database()
+    await seed_persons(250)
+    await seed_user()
+    async with http_client() as client:
+        token = await get_token(client)
+        print("GET /persons/v1/persons latency")
+        print(latency_summary("idle", await scenario(client, token, storm=False)))
+        with patch.object(PasslibCore, "acheck_password", blocking_acheck_password):
+            latencies = await scenario(client, token, storm=True)
+        print(latency_summary("login storm, bcrypt on event loop", latencies))
+        latencies = await scenario(client, token, storm=True)
+        print(latency_summary("login storm, bcrypt on worker pool", latencies))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+from server.core.mapper import to_resources
+from server.core.response import JSONResponse
+from server.core.schema import ResponsePage
+from server.models.person_model import Person as PersonModel
+from server.models.user_model import User as UserModel
+from server.resources.person_resource import Person
+from server.resources.user_resource import User, UserPerson
+
+ROUNDS = 200
+SIZES = (50, 250)
+
+Users = ResponsePage[Sequence[UserPerson] | Sequence[User]]
+
+
+def users(size: int) -> list[UserModel]:
+    now = datetime.now()
+    rows = []
+    for idx in range(size):
+        user = UserModel(
+            id=idx,
+            username=f"user{idx}",
+            password="secret",
+            active=True,
+            person_id=idx,
+            created_at=now,
+            updated_at=now,
+            version=1,
+        )
+        user.person = PersonModel(
+            id=idx,
+            first_name=f"first{idx}",
+            last_name=f"last{idx}",
+            created_at=now,
+            updated_at=now,
+            version=1,
+        )
+        rows.append(user)
+    return rows
+
+
+def persons(rows: list[UserModel]) -> list[PersonModel]:
+    return [row.person for row in rows]
+
+
+def measure(label: str, render: Callable[[], Any]):
+    render()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        render()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {elapsed * 1e6:10.1f}us {peak / 1024:10.1f}KiB peak")
+
+
+def main():
+    for size in SIZES:
+        rows = users(size)
+        print(f"list response, {size} rows, per request")
+        measure(
+            "persons, envelope from attributes",
+            lambda: JSONResponse(
+                ResponsePage[Sequence[Person]].model_validate({"data": persons(rows)})
+            ),
+        )
+        measure(
+            "persons, mapper",
+            lambda: JSONResponse(
+                ResponsePage[Sequence[Person]].model_construct(
+                    data=to_resources(Person, persons(rows))
+                )
+            ),
+        )
+        measure(
+            "users, envelope from attributes",
+            lambda: JSONResponse(Users.model_validate({"data": rows})),
+        )
+        measure(
+            "users, mapper",
+            lambda: JSONResponse(Users.model_construct(data=to_resources(User, rows))),
+        )
+        measure(
+            "users?expand=person, envelope",
+            lambda: JSONResponse(
+                Users.model_validate(
+                    {
+                        "data": [
+                            UserPerson.model_validate(u, from_attributes=True)
+                            for u in rows
+                        ]
+                    }
+                )
+            ),
+        )
+        measure(
+            "users?expand=person, mapper",
+            lambda: JSONResponse(
+                Users.model_construct(data=to_resources(UserPerson, rows))
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
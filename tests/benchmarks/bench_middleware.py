@@ -0,0 +1,69 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from server.core.middleware import CatchExceptionMiddleware
+from tests.benchmarks.utils import Timer, throughput_summary
+
+REQUESTS = 20_000
+CONCURRENCY = 8
+
+
+async def catch_exception_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # middleware as it was before the pure ASGI rewrite
+    try:
+        return await call_next(request)
+    except Exception as err:
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"errors": [{"message": str(err)}]},
+        )
+
+
+def create_app(middleware: str | None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    match middleware:
+        case "base_http":
+            app.middleware("http")(catch_exception_middleware)
+        case "asgi":
+            app.add_middleware(CatchExceptionMiddleware)
+    return app
+
+
+async def worker(client: AsyncClient, total: int):
+    for _ in range(total):
+        response = await client.get("/ping")
+        response.raise_for_status()
+
+
+async def scenario(label: str, middleware: str | None):
+    transport = ASGITransport(app=create_app(middleware))  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await worker(client, 500)
+        with Timer() as timer:
+            await asyncio.gather(
+                *(worker(client, REQUESTS // CONCURRENCY) for _ in range(CONCURRENCY))
+            )
+    print(throughput_summary(label, REQUESTS, timer.elapsed))
+    print(f"{'':<40} {timer.elapsed / REQUESTS * 1e6:.2f}us per request")
+
+
+async def main():
+    print(f"GET /ping, {REQUESTS} requests, {CONCURRENCY} clients")
+    await scenario("no middleware", None)
+    await scenario("BaseHTTPMiddleware", "base_http")
+    await scenario("CatchExceptionMiddleware (ASGI)", "asgi")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
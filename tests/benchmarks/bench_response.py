@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime
+from typing import Sequence
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse as StdlibJSONResponse
+from fastapi.routing import APIRoute
+from httpx import ASGITransport, AsyncClient
+
+from server.core.response import JSONResponse, ResponseModelRoute
+from server.core.schema import ResponseOK
+from server.models.person_model import Person as PersonModel
+from server.resources.person_resource import Person
+from tests.benchmarks.utils import Timer, throughput_summary
+
+REQUESTS = 5_000
+SIZES = (1, 250)
+
+
+def persons(size: int) -> list[PersonModel]:
+    now = datetime.now()
+    return [
+        PersonModel(
+            id=idx,
+            first_name=f"first{idx}",
+            last_name=f"last{idx}",
+            created_at=now,
+            updated_at=now,
+            version=1,
+        )
+        for idx in range(size)
+    ]
+
+
+def create_app(fast: bool, size: int) -> FastAPI:
+    rows = persons(size)
+    app = FastAPI(default_response_class=JSONResponse if fast else StdlibJSONResponse)
+    router = APIRouter(route_class=ResponseModelRoute if fast else APIRoute)
+
+    if fast:
+
+        @router.get("/persons", response_model=ResponseOK[Sequence[Person]])
+        async def exact_model():
+            return ResponseOK[Sequence[Person]].model_validate({"data": rows})
+
+    else:
+
+        @router.get("/persons", response_model=ResponseOK[Sequence[Person]])
+        async def untyped_envelope():
+            # controllers as they were: FastAPI validates and serializes again
+            return ResponseOK(data=rows)
+
+    app.include_router(router)
+    return app
+
+
+async def scenario(label: str, fast: bool, size: int) -> float:
+    transport = ASGITransport(app=create_app(fast, size))  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        expected = (await client.get("/persons")).content
+        with Timer() as timer:
+            for _ in range(REQUESTS):
+                response = await client.get("/persons")
+        assert response.content == expected
+    print(throughput_summary(label, REQUESTS, timer.elapsed))
+    print(f"{'':<40} {timer.elapsed / REQUESTS * 1e6:.2f}us per request")
+    return timer.elapsed
+
+
+async def main():
+    for size in SIZES:
+        print(f"GET /persons, {size} item(s) per response, {REQUESTS} requests")
+        await scenario("stdlib json + response validation", False, size)
+        await scenario("pydantic-core json, exact model", True, size)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+import asyncio
+
+from sqlmodel import text
+
+from server.core.database import sessionio_maker
+from server.models.person_model import Person
+from server.repositories import person_repository
+from tests.benchmarks.utils import (
+    Timer,
+    bulk_seed_persons,
+    http_client,
+    latency_summary,
+    use_database,
+)
+
+SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+SAMPLES = 200
+SIGNUPS = 20
+
+
+async def get_or_create(first_name: str, last_name: str) -> float:
+    async with sessionio_maker()() as session:
+        with Timer() as timer:
+            async with session.begin():
+                await person_repository.get_or_create(
+                    session, Person(first_name=first_name, last_name=last_name)
+                )
+    return timer.elapsed
+
+
+async def unindexed_lookup(first_name: str, last_name: str) -> float:
+    # the lookup get_or_create used to run before the unique index existed
+    async with sessionio_maker()() as session:
+        with Timer() as timer:
+            await person_repository.get_all(
+                session, limit=1, first_name=first_name, last_name=last_name
+            )
+    return timer.elapsed
+
+
+async def signup(idx: int) -> float:
+    async with http_client() as client:
+        with Timer() as timer:
+            response = await client.post(
+                "/users/v1/user-person",
+                json={
+                    "firstName": f"signup{idx}",
+                    "lastName": "bench",
+                    "username": f"signup{idx}",
+                    "password": "benchmark123456",
+                    "passwordCheck": "benchmark123456",
+                },
+            )
+        response.raise_for_status()
+    return timer.elapsed
+
+
+async def scenario(size: int):
+    await use_database(f"signup-{size}")
+    with Timer() as seed:
+        await bulk_seed_persons(size)
+    print(f"{size:,} persons (seeded in {seed.elapsed:.1f}s)")
+    step = max(size // SAMPLES, 1)
+    existing = [
+        await get_or_create(f"first{i}", f"last{i}") for i in range(1, size, step)
+    ]
+    new = [await get_or_create(f"new{i}", f"new{i}") for i in range(SAMPLES)]
+    signups = [await signup(i) for i in range(SIGNUPS)]
+    print(latency_summary("  get_or_create, existing person", existing))
+    print(latency_summary("  get_or_create, new person", new))
+    print(latency_summary("  POST /users/v1/user-person", signups))
+    async with sessionio_maker()() as session:
+        await session.exec(text("DROP INDEX ix_person_first_name_last_name"))  # type: ignore
+    unindexed = [
+        await unindexed_lookup(f"first{i}", f"last{i}")
+        for i in range(1, size, max(size // 20, 1))
+    ]
+    print(latency_summary("  lookup without the index (before)", unindexed))
+
+
+async def main():
+    for size in SIZES:
+        await scenario(size)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
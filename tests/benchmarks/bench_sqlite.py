@@ -0,0 +1,99 @@
+import asyncio
+import itertools
+import random
+import time
+
+from httpx import AsyncClient
+
+from server.core.database import sessionio_maker
+from server.core.settings import get_settings
+from server.models.person_model import Person
+from server.repositories import person_repository
+from tests.benchmarks.utils import (
+    get_token,
+    http_client,
+    seed_persons,
+    seed_user,
+    throughput_summary,
+    use_database,
+)
+
+DURATION = 5.0
+CONCURRENCY = 16
+WRITE_RATIO = 0.2
+PERSONS = 1000
+
+# (first_name, last_name) is unique, every write inserts a new person
+writes = itertools.count()
+
+
+async def http_worker(
+    client: AsyncClient, token: str, deadline: float
+) -> tuple[int, int]:
+    headers = {"Authorization": f"Bearer {token}"}
+    done = errors = 0
+    while time.perf_counter() < deadline:
+        if random.random() < WRITE_RATIO:
+            response = await client.post(
+                "/persons/v1/persons",
+                json={"firstName": "bench", "lastName": f"mark{next(writes)}"},
+                headers=headers,
+            )
+        else:
+            person_id = random.randint(1, PERSONS)
+            response = await client.get(
+                f"/persons/v1/persons/{person_id}", headers=headers
+            )
+        done += 1
+        errors += response.status_code >= 400
+    return done, errors
+
+
+async def repository_worker(deadline: float) -> tuple[int, int]:
+    # same mix without the HTTP stack, so the database is the bottleneck
+    session_local = sessionio_maker()
+    done = 0
+    while time.perf_counter() < deadline:
+        async with session_local() as session:
+            if random.random() < WRITE_RATIO:
+                async with session.begin():
+                    person = Person(first_name="bench", last_name=f"mark{next(writes)}")
+                    await person_repository.create(session, person=person)
+            else:
+                await person_repository.get(session, pk=random.randint(1, PERSONS))
+        done += 1
+    return done, 0
+
+
+async def scenario(name: str, pragmas: bool):
+    get_settings().db_sqlite_pragmas = pragmas
+    await use_database(f"{name}-{pragmas}")
+    await seed_persons(PERSONS)
+    await seed_user()
+    async with http_client() as client:
+        token = await get_token(client)
+        start = time.perf_counter()
+        if name == "http":
+            workers = [
+                http_worker(client, token, start + DURATION) for _ in range(CONCURRENCY)
+            ]
+        else:
+            workers = [repository_worker(start + DURATION) for _ in range(CONCURRENCY)]
+        results = await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - start
+    done = sum(r[0] for r in results)
+    errors = sum(r[1] for r in results)
+    label = f"{name}, {'tuned pragmas' if pragmas else 'sqlite defaults'}"
+    print(throughput_summary(label, done, elapsed, unit="op"), f"errors={errors}")
+
+
+async def main():
+    random.seed(0)
+    print(f"person reads/writes, {WRITE_RATIO:.0%} writes, {CONCURRENCY} clients")
+    for name in ("http", "repository"):
+        await scenario(name, pragmas=False)
+        await scenario(name, pragmas=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
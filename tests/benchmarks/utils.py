@@ -0,0 +1,141 @@
+import time
+from statistics import mean, quantiles
+from typing import Any, Self, Sequence, cast
+
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import SQLModel
+
+from server.api import app
+from server.core.cache import MemoryCacheBackend, get_cache_backend
+from server.core.crypt import get_crypt
+from server.core.database import sessionio_maker
+from server.core.settings import DatabaseDsn, get_settings
+from server.models.person_model import Person
+from server.models.user_model import User
+from server.repositories import person_repository, user_repository
+from server.services.auth_service import principal_cache
+from server.services.person_service import person_cache
+from server.services.user_service import user_cache
+from tests.benchmarks import BENCHMARK_FOLDER
+
+USERNAME = "benchmark"
+PASSWORD = "benchmark123456"
+
+
+async def use_database(name: str):
+    # point the app to a brand new database file
+    await sessionio_maker().kw["bind"].dispose()
+    get_settings().db_url = DatabaseDsn(
+        f"sqlite+aiosqlite:///{BENCHMARK_FOLDER / f'{name}.db'}"
+    )
+    sessionio_maker.cache_clear()
+    principal_cache.clear()
+    person_cache.clear()
+    user_cache.clear()
+    cast(MemoryCacheBackend, get_cache_backend()).clear()
+    await create_database()
+
+
+async def create_database():
+    engine = sessionio_maker().kw["bind"]
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+async def seed_persons(total: int):
+    session_local = sessionio_maker()
+    async with session_local() as session:
+        async with session.begin():
+            for idx in range(total):
+                await person_repository.create(
+                    session, Person(first_name=f"first{idx}", last_name=f"last{idx}")
+                )
+
+
+async def bulk_seed_persons(total: int):
+    # generated inside the database, fast enough for millions of rows
+    engine = sessionio_maker().kw["bind"]
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            """
+            INSERT INTO person (first_name, last_name, created_at, updated_at)
+            WITH RECURSIVE seq(i) AS (
+                SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < ?
+            )
+            SELECT 'first' || i, 'last' || i, datetime(), datetime() FROM seq
+            """,
+            (total,),
+        )
+
+
+async def seed_user(username: str = USERNAME, password: str = PASSWORD) -> User:
+    session_local = sessionio_maker()
+    async with session_local() as session:
+        async with session.begin():
+            person = Person(first_name=username, last_name=username)
+            await person_repository.create(session, person)
+            await session.flush()
+            user = User(
+                username=username,
+                password=get_crypt().hash_password(password),
+                person_id=person.id,
+            )
+            await user_repository.create(session, user)
+    return user
+
+
+def http_client() -> AsyncClient:
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    return AsyncClient(transport=transport, base_url="http://benchmark")
+
+
+async def get_token(
+    client: AsyncClient, username: str = USERNAME, password: str = PASSWORD
+) -> str:
+    response = await client.post(
+        "/auth/v1/token", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+class Timer:
+    def __init__(self: Self):
+        self.elapsed = 0.0
+
+    def __enter__(self: Self) -> Self:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self: Self, *args: Any):
+        self.elapsed = time.perf_counter() - self._start
+
+
+def latency_summary(name: str, latencies: Sequence[float]) -> str:
+    ms = [value * 1000 for value in latencies]
+    cuts = quantiles(ms, n=100, method="inclusive")
+    return (
+        f"{name:<40} n={len(ms):<6} mean={mean(ms):8.2f}ms "
+        f"p50={cuts[49]:8.2f}ms p95={cuts[94]:8.2f}ms p99={cuts[98]:8.2f}ms"
+    )
+
+
+def throughput_summary(name: str, total: int, elapsed: float, unit: str = "req") -> str:
+    return f"{name:<40} {total:>8} {unit} in {elapsed:8.3f}s = {total / elapsed:10.1f} {unit}/s"
+
+
+__all__ = (
+    "USERNAME",
+    "PASSWORD",
+    "use_database",
+    "create_database",
+    "seed_persons",
+    "bulk_seed_persons",
+    "seed_user",
+    "http_client",
+    "get_token",
+    "Timer",
+    "latency_summary",
+    "throughput_summary",
+)
@@ -1,17 +1,44 @@
-from typing import Any, Generator
+from typing import Any, Generator, cast
 
 import pytest
 
 from server.api import app
+from server.core.cache import MemoryCacheBackend, get_cache_backend
 from server.core.settings import Settings, get_settings
+from server.services.auth_service import principal_cache
+from server.services.person_service import person_cache
+from server.services.user_service import user_cache
 from tests.utils.http_client import HttpClient
 
 
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        "--postgres",
+        action="store_true",
+        default=False,
+        help="run integration tests on a PostgreSQL spawned in a temp dir",
+    )
+    parser.addoption(
+        "--slow",
+        action="store_true",
+        default=False,
+        help="run slow tests (e.g. exporting a 1M rows database)",
+    )
+
+
 @pytest.fixture
 def httpclient() -> HttpClient:
     return HttpClient(app)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    principal_cache.clear()
+    person_cache.clear()
+    user_cache.clear()
+    cast(MemoryCacheBackend, get_cache_backend()).clear()
+
+
 @pytest.fixture
 def settings() -> Generator[Settings, Any, Any]:
     settings = get_settings()
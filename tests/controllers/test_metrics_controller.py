@@ -0,0 +1,22 @@
+from http import HTTPStatus
+
+from server.services.auth_service import check_access_token
+from tests.mocks.context_mock import ContextMock
+from tests.utils.http_client import HttpClient
+
+
+def test_get_metrics_ok(httpclient: HttpClient):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+
+    # WHEN
+    url = "/metrics/v1/metrics"
+    response = httpclient.get(url)
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert "db_pool" in response.json()["data"]
+    assert "principal_cache" in response.json()["data"]
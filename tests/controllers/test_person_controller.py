@@ -1,19 +1,29 @@
+import json
+import sqlite3
 from datetime import datetime
 from http import HTTPStatus
-from unittest.mock import AsyncMock, patch
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from faker import Faker
 from pydash import get
-from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.exc import IntegrityError, NoResultFound, OperationalError
+from sqlalchemy.orm.exc import StaleDataError
 
 from server.core.exceptions import BusinessError, NotFoundError
+from server.core.pagination import Page, encode_cursor
+from server.core.query import ListQuery
+from server.core.settings import Settings
+from server.enums.query_enum import QueryOperatorEnum
 from server.models.person_model import Person
 from server.resources.person_resource import (
     CreatePerson,
     UpdatePerson,
     UpdatePersonOptional,
 )
+from server.resources.person_resource import Person as PersonResource
 from server.services.auth_service import check_access_token
+from server.services.person_service import page_version
 from tests.mocks.context_mock import ContextMock
 from tests.utils.http_client import HttpClient
 from tests.utils.utils import snake_to_camel
@@ -40,9 +50,12 @@ def test_get_person_ok(
         first_name=fake.first_name(),
         last_name=fake.last_name(),
         updated_at=datetime.now(),
+        version=1,
         created_at=datetime.now(),
     )
-    person_service_mock.get_person.return_value = person_mock
+    person_service_mock.get_person.return_value = PersonResource.model_validate(
+        person_mock
+    )
 
     # WHEN
     url = f"/persons/v1/persons/{person_id}"
@@ -55,6 +68,46 @@ def test_get_person_ok(
     }
 
 
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_get_person_not_modified(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # GIVEN
+    person_id = 1
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    person_service_mock.get_person.return_value = PersonResource.model_validate(
+        Person(
+            id=person_id,
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            updated_at=datetime(2024, 5, 23, 12, 0, 0),
+            version=1,
+            created_at=datetime(2024, 5, 23, 12, 0, 0),
+        )
+    )
+    url = f"/persons/v1/persons/{person_id}"
+    etag = httpclient.get(url).headers["etag"]
+
+    # WHEN
+    response = httpclient.get(url, headers={"If-None-Match": etag})
+    since = httpclient.get(
+        url, headers={"If-Modified-Since": "Thu, 23 May 2024 12:00:00 GMT"}
+    )
+
+    # THEN
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["last-modified"] == "Thu, 23 May 2024 12:00:00 GMT"
+    assert since.status_code == HTTPStatus.NOT_MODIFIED
+
+
 @patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
 def test_get_person_not_found(
     person_service_mock: AsyncMock,
@@ -118,8 +171,8 @@ def test_get_person_internal_server_error(
     httpclient.current_app.dependency_overrides[check_access_token] = (
         lambda: context_mock
     )
-    message_error = 'insert or update on table "person" violates foreign key constraint "person_some_column_fkey"'
-    person_service_mock.get_person.side_effect = IntegrityError(
+    message_error = "could not connect to server: Connection refused"
+    person_service_mock.get_person.side_effect = OperationalError(
         orig=Exception(message_error),
         params={},
         statement="",
@@ -150,11 +203,13 @@ def test_get_all_persons_ok(
             first_name=fake.first_name(),
             last_name=fake.last_name(),
             updated_at=datetime.now(),
+            version=1,
             created_at=datetime.now(),
         )
         for idx in range(10)
     ]
-    person_service_mock.get_all_persons.return_value = person_mock
+    person_service_mock.page_version = page_version
+    person_service_mock.get_all_persons.return_value = Page(person_mock)
 
     # WHEN
     url = "/persons/v1/persons"
@@ -163,7 +218,8 @@ def test_get_all_persons_ok(
     # THEN
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {
-        "data": [snake_to_camel(p.model_dump(mode="json")) for p in person_mock]
+        "data": [snake_to_camel(p.model_dump(mode="json")) for p in person_mock],
+        "next": None,
     }
 
 
@@ -177,7 +233,7 @@ def test_all_person_nocontent(
     httpclient.current_app.dependency_overrides[check_access_token] = (
         lambda: context_mock
     )
-    person_service_mock.get_all_persons.return_value = []
+    person_service_mock.get_all_persons.return_value = Page([])
 
     # WHEN
     url = "/persons/v1/persons"
@@ -187,6 +243,283 @@ def test_all_person_nocontent(
     assert response.status_code == HTTPStatus.NO_CONTENT
 
 
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_get_all_persons_next_page(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # GIVEN
+    cursor = encode_cursor((1,))
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    person_mock = Person(
+        id=2,
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        updated_at=datetime.now(),
+        version=1,
+        created_at=datetime.now(),
+    )
+    person_service_mock.page_version = page_version
+    person_service_mock.get_all_persons.return_value = Page(
+        [person_mock], next=encode_cursor((2,))
+    )
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.get(url, params={"limit": 1, "cursor": cursor})
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["next"] == encode_cursor((2,))
+    person_service_mock.get_all_persons.assert_awaited_once_with(
+        context_mock, limit=1, cursor=cursor, fields=(), query=ListQuery()
+    )
+
+
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_get_all_persons_fields(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    persons_mock = [
+        Person(
+            id=idx + 1,
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            version=1,
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+        )
+        for idx in range(2)
+    ]
+    person_service_mock.page_version = page_version
+    person_service_mock.get_all_persons.return_value = Page(persons_mock)
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.get(url, params={"fields": "firstName, id"})
+    full = httpclient.get(url)
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["data"] == [
+        {"id": p.id, "firstName": p.first_name} for p in persons_mock
+    ]
+    # another representation of the same page
+    assert response.headers["etag"] != full.headers["etag"]
+    assert person_service_mock.get_all_persons.await_args_list[0].kwargs == {
+        "limit": 250,
+        "cursor": None,
+        "fields": ("first_name", "id"),
+        "query": ListQuery(),
+    }
+
+
+def test_get_all_persons_fields_unknown(httpclient: HttpClient):
+    # MOCK
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: ContextMock.context_session_mock()
+    )
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.get(url, params={"fields": "id,password"})
+
+    # THEN
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert get(response.json(), "errors.0.loc") == ["query", "fields"]
+
+
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_get_all_persons_filter_sort(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    person_mock = Person(
+        id=1,
+        first_name=fake.first_name(),
+        last_name="Silva",
+        version=1,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+    person_service_mock.page_version = page_version
+    person_service_mock.get_all_persons.return_value = Page([person_mock])
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.get(
+        url, params={"filter": ["lastName:prefix:Sil"], "sort": "-lastName"}
+    )
+    full = httpclient.get(url)
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert get(response.json(), "data.0.lastName") == "Silva"
+    # another query of the same rows
+    assert response.headers["etag"] != full.headers["etag"]
+    assert person_service_mock.get_all_persons.await_args_list[0].kwargs[
+        "query"
+    ] == ListQuery(
+        filters=(("last_name", QueryOperatorEnum.PREFIX, "Sil"),),
+        sort=("last_name", "id"),
+        types=(str, int),
+        descending=True,
+    )
+
+
+def test_get_all_persons_filter_invalid(httpclient: HttpClient):
+    # MOCK
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: ContextMock.context_session_mock()
+    )
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.get(
+        url, params={"filter": ["lastName:gt:Sil"], "sort": "firstName"}
+    )
+
+    # THEN
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert [e["loc"] for e in response.json()["errors"]] == [
+        ["query", "filter"],
+        ["query", "sort"],
+    ]
+
+
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_get_all_persons_not_modified(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    page = Page(
+        [
+            Person(
+                id=1,
+                first_name=fake.first_name(),
+                last_name=fake.last_name(),
+                updated_at=datetime.now(),
+                version=1,
+                created_at=datetime.now(),
+            )
+        ]
+    )
+    person_service_mock.page_version = page_version
+    person_service_mock.get_all_persons.return_value = page
+    person_service_mock.get_all_persons_version.return_value = page_version(page)
+    url = "/persons/v1/persons?limit=10"
+    etag = httpclient.get(url).headers["etag"]
+    person_service_mock.get_all_persons.reset_mock()
+
+    # WHEN
+    response = httpclient.get(url, headers={"If-None-Match": etag})
+    changed = httpclient.get(url, headers={"If-None-Match": '"other"'})
+
+    # THEN
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert "last-modified" not in response.headers
+    # the rows are read only when the page changed
+    assert changed.status_code == HTTPStatus.OK
+    person_service_mock.get_all_persons.assert_awaited_once()
+    person_service_mock.get_all_persons_version.assert_awaited_with(
+        context_mock, limit=10, cursor=None, query=ListQuery()
+    )
+
+
+def test_get_all_persons_invalid_cursor(httpclient: HttpClient):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.get(url, params={"cursor": "invalid"})
+
+    # THEN
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "invalid cursor" in get(response.json(), "errors[0].message")
+
+
+def test_get_all_persons_limit_too_large(httpclient: HttpClient):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.get(url, params={"limit": 100000})
+
+    # THEN
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert get(response.json(), "errors[0].loc") == ["query", "limit"]
+
+
+@patch("server.controllers.person_controller.person_service")
+def test_export_persons_ok(
+    person_service_mock: MagicMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    person_mock = [
+        Person(
+            id=idx + 1,
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            updated_at=datetime.now(),
+            version=1,
+            created_at=datetime.now(),
+        )
+        for idx in range(3)
+    ]
+
+    async def chunks_mock(*args: Any, **kwargs: Any):
+        yield person_mock[:2]
+        yield person_mock[2:]
+
+    person_service_mock.export_persons.side_effect = chunks_mock
+
+    # WHEN
+    url = "/persons/v1/persons:export"
+    response = httpclient.get(url)
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        snake_to_camel(p.model_dump(mode="json")) for p in person_mock
+    ]
+
+
 @patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
 def test_create_person_ok(
     person_service_mock: AsyncMock,
@@ -202,6 +535,7 @@ def test_create_person_ok(
         first_name=fake.first_name(),
         last_name=fake.last_name(),
         updated_at=datetime.now(),
+        version=1,
         created_at=datetime.now(),
     )
     person_service_mock.create_person.return_value = person_mock
@@ -222,6 +556,43 @@ def test_create_person_ok(
     }
 
 
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_create_person_conflict(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    unique = sqlite3.IntegrityError("UNIQUE constraint failed: person.first_name")
+    unique.sqlite_errorname = "SQLITE_CONSTRAINT_UNIQUE"
+    person_service_mock.create_person.side_effect = IntegrityError(
+        statement="INSERT INTO person", params=("Ana", "Silva"), orig=unique
+    )
+    foreign_key = Exception("violates foreign key constraint")
+    foreign_key.sqlstate = "23503"  # type: ignore[attr-defined]
+    person_service_mock.create_persons.side_effect = IntegrityError(
+        statement="INSERT INTO person", params=("Ana", "Silva"), orig=foreign_key
+    )
+
+    # GIVEN
+    create_person = {"firstName": "Ana", "lastName": "Silva"}
+
+    # WHEN
+    response = httpclient.post("/persons/v1/persons", json=create_person)
+    batch = httpclient.post("/persons/v1/persons:batch", json=[create_person] * 2)
+
+    # THEN
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {"errors": [{"message": "resource already exists"}]}
+    assert batch.status_code == HTTPStatus.CONFLICT
+    assert get(batch.json(), "errors.0.message") == (
+        "resource conflicts with the data it references"
+    )
+
+
 @patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
 def test_create_person_validation_error(
     person_service_mock: AsyncMock,
@@ -262,6 +633,7 @@ def test_create_person_business_error(
         first_name=fake.first_name(),
         last_name=fake.last_name(),
         updated_at=datetime.now(),
+        version=1,
         created_at=datetime.now(),
     )
     message_error = "Business error mock"
@@ -281,6 +653,82 @@ def test_create_person_business_error(
     assert message_error == get(response.json(), "errors[0].message")
 
 
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_create_persons_ok(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    person_mock = [
+        Person(
+            id=idx + 1,
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            updated_at=datetime.now(),
+            version=1,
+            created_at=datetime.now(),
+        )
+        for idx in range(3)
+    ]
+    person_service_mock.create_persons.return_value = person_mock
+
+    # WHEN
+    url = "/persons/v1/persons:batch"
+    response = httpclient.post(
+        url,
+        json=[
+            {"firstName": p.first_name, "lastName": p.last_name} for p in person_mock
+        ],
+    )
+
+    # THEN
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json() == {
+        "data": [snake_to_camel(p.model_dump(mode="json")) for p in person_mock]
+    }
+    create_persons = person_service_mock.create_persons.await_args.kwargs[
+        "create_persons"
+    ]
+    assert [p.first_name for p in create_persons] == [p.first_name for p in person_mock]
+
+
+def test_create_persons_too_many(httpclient: HttpClient, settings: Settings):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+
+    # WHEN
+    url = "/persons/v1/persons:batch"
+    response = httpclient.post(
+        url,
+        json=[{"firstName": "a", "lastName": "b"}] * (settings.batch_max_size + 1),
+    )
+
+    # THEN
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_create_persons_empty(httpclient: HttpClient):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+
+    # WHEN
+    url = "/persons/v1/persons:batch"
+    response = httpclient.post(url, json=[])
+
+    # THEN
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
 @patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
 def test_update_person_ok(
     person_service_mock: AsyncMock,
@@ -302,6 +750,7 @@ def test_update_person_ok(
         first_name=person_update.first_name,
         last_name=person_update.last_name,
         updated_at=datetime.now(),
+        version=1,
         created_at=datetime.now(),
     )
     person_service_mock.update_person.return_value = person_mock
@@ -315,6 +764,79 @@ def test_update_person_ok(
     assert response.json() == {
         "data": snake_to_camel(person_mock.model_dump(mode="json"))
     }
+    assert response.headers["etag"] == '"1"'
+    person_service_mock.update_person.assert_awaited_once_with(
+        context_mock, person_id=person_id, update_person=person_update, versions=None
+    )
+
+
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_update_person_if_match(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # GIVEN
+    person_id = fake.pyint()
+    person_update = UpdatePerson(
+        first_name=fake.first_name(), last_name=fake.last_name()
+    )
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    person_service_mock.update_person.return_value = Person(
+        id=person_id,
+        first_name=person_update.first_name,
+        last_name=person_update.last_name,
+        version=4,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+
+    # WHEN
+    url = f"/persons/v1/persons/{person_id}"
+    response = httpclient.put(
+        url, json=person_update.model_dump(), headers={"If-Match": '"3"'}
+    )
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["etag"] == '"4"'
+    person_service_mock.update_person.assert_awaited_once_with(
+        context_mock, person_id=person_id, update_person=person_update, versions=[3]
+    )
+
+
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_update_person_precondition_failed(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # GIVEN
+    person_id = fake.pyint()
+    person_update = UpdatePersonOptional(first_name=fake.first_name())  # type: ignore
+
+    # MOCK
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: ContextMock.context_session_mock()
+    )
+    person_service_mock.update_person_optional.side_effect = StaleDataError(
+        f"person {person_id} is not at version [3]"
+    )
+
+    # WHEN
+    url = f"/persons/v1/persons/{person_id}"
+    response = httpclient.patch(
+        url, json=person_update.model_dump(), headers={"If-Match": '"3"'}
+    )
+
+    # THEN
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+    assert response.json() == {
+        "errors": [{"message": "resource was modified since it was read"}]
+    }
 
 
 @patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
@@ -336,6 +858,7 @@ def test_update_person_optional_ok(
         first_name=person_update.first_name,
         last_name=fake.last_name(),
         updated_at=datetime.now(),
+        version=1,
         created_at=datetime.now(),
     )
     person_service_mock.update_person_optional.return_value = person_mock
@@ -370,3 +893,64 @@ def test_delete_person_ok(
 
     # THEN
     assert response.status_code == HTTPStatus.OK
+
+
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_delete_persons_ok(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    person_service_mock.delete_persons.return_value = [1, 3]
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.delete(url, params={"id": [1, 2, 3]})
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"data": [1, 3]}
+    person_service_mock.delete_persons.assert_awaited_once_with(
+        context_mock, person_ids=[1, 2, 3]
+    )
+
+
+@patch("server.controllers.person_controller.person_service", new_callable=AsyncMock)
+def test_delete_persons_not_found(
+    person_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    person_service_mock.delete_persons.return_value = []
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.delete(url, params={"id": [1, 2]})
+
+    # THEN
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_delete_persons_without_ids(httpclient: HttpClient):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+
+    # WHEN
+    url = "/persons/v1/persons"
+    response = httpclient.delete(url)
+
+    # THEN
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert get(response.json(), "errors[0].loc") == ["query", "id"]
+    assert get(response.json(), "errors[0].input") is None
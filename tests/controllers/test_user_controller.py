@@ -1,13 +1,23 @@
+import json
 from datetime import datetime
 from http import HTTPStatus
 from typing import Any
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from faker import Faker
+from pydash import get
+from sqlalchemy.orm.exc import StaleDataError
 
 from server.controllers.user_controller import UpdateUser, UpdateUserOptional
+from server.core.conditional import Validator
+from server.core.pagination import Page
+from server.core.query import ListQuery
+from server.enums.query_enum import QueryOperatorEnum
+from server.models.person_model import Person as PersonModel
 from server.models.user_model import User as UserModel
+from server.resources.user_resource import User, UserPerson
 from server.services.auth_service import check_access_token, crypt
+from server.services.user_service import page_version
 from tests.mocks.context_mock import ContextMock
 from tests.utils.http_client import HttpClient
 from tests.utils.utils import snake_to_camel
@@ -31,13 +41,14 @@ def test_get_user_ok(
         person_id=fake.pyint(1, 999),
         active=fake.pybool(),
         updated_at=datetime.now(),
+        version=1,
         created_at=datetime.now(),
     )
 
     httpclient.current_app.dependency_overrides[check_access_token] = (
         lambda: ContextMock.context_session_mock()
     )
-    user_service_mock.get_user.return_value = user_mock
+    user_service_mock.get_user.return_value = User.model_validate(user_mock)
 
     # WHEN
     url = f"/users/v1/users/{user_id}"
@@ -50,6 +61,249 @@ def test_get_user_ok(
     }
 
 
+@patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
+def test_get_user_expand_person(
+    user_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # GIVEN
+    person = PersonModel(
+        id=fake.pyint(1, 999),
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        updated_at=datetime.now(),
+        version=1,
+        created_at=datetime.now(),
+    )
+    user_mock = UserModel(
+        id=fake.pyint(1, 999),
+        username=fake.user_name(),
+        person_id=person.id,
+        active=fake.pybool(),
+        updated_at=datetime.now(),
+        version=1,
+        created_at=datetime.now(),
+    )
+    user_mock.person = person
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    user_service_mock.get_user.return_value = UserPerson.model_validate(user_mock)
+
+    # WHEN
+    url = f"/users/v1/users/{user_mock.id}"
+    response = httpclient.get(url, params={"expand": "person"})
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        "data": {
+            **snake_to_camel(user_mock.model_dump(mode="json")),
+            "person": snake_to_camel(person.model_dump(mode="json")),
+        }
+    }
+    user_service_mock.get_user.assert_awaited_once_with(
+        context_mock, user_id=user_mock.id, with_person=True
+    )
+
+
+@patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
+def test_get_user_expand_person_not_modified(
+    user_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # GIVEN
+    person = PersonModel(
+        id=fake.pyint(1, 999),
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        updated_at=datetime(2024, 5, 23, 12, 0, 0),
+        version=1,
+        created_at=datetime(2024, 5, 23, 12, 0, 0),
+    )
+    user_mock = UserModel(
+        id=fake.pyint(1, 999),
+        username=fake.user_name(),
+        person_id=person.id,
+        active=True,
+        updated_at=datetime(2024, 5, 22, 12, 0, 0),
+        version=1,
+        created_at=datetime(2024, 5, 22, 12, 0, 0),
+    )
+    user_mock.person = person
+
+    # MOCK
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: ContextMock.context_session_mock()
+    )
+    user_service_mock.get_user.return_value = UserPerson.model_validate(user_mock)
+    url = f"/users/v1/users/{user_mock.id}?expand=person"
+    first = httpclient.get(url)
+
+    # WHEN
+    response = httpclient.get(url, headers={"If-None-Match": first.headers["etag"]})
+    person.updated_at = datetime(2024, 5, 24, 12, 0, 0)
+    person.version = 2
+    user_service_mock.get_user.return_value = UserPerson.model_validate(user_mock)
+    changed = httpclient.get(url, headers={"If-None-Match": first.headers["etag"]})
+
+    # THEN
+    # the person is part of the body, so it is part of the validator
+    assert first.headers["last-modified"] == "Thu, 23 May 2024 12:00:00 GMT"
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers["etag"] != first.headers["etag"]
+
+
+def test_get_user_expand_invalid(httpclient: HttpClient):
+    # MOCK
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: ContextMock.context_session_mock()
+    )
+
+    # WHEN
+    url = "/users/v1/users/1"
+    response = httpclient.get(url, params={"expand": "password"})
+
+    # THEN
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
+def test_get_all_users_expand_person(
+    user_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # GIVEN
+    users_mock = []
+    for idx in range(3):
+        person = PersonModel(
+            id=idx + 1,
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            updated_at=datetime.now(),
+            version=1,
+            created_at=datetime.now(),
+        )
+        user = UserModel(
+            id=idx + 1,
+            username=fake.user_name(),
+            person_id=person.id,
+            active=True,
+            updated_at=datetime.now(),
+            version=1,
+            created_at=datetime.now(),
+        )
+        user.person = person
+        users_mock.append(user)
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    user_service_mock.page_version = page_version
+    user_service_mock.get_all_users.return_value = Page(users_mock)
+
+    # WHEN
+    url = "/users/v1/users"
+    response = httpclient.get(url, params={"expand": "person"})
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert [get(u, "person.firstName") for u in response.json()["data"]] == [
+        u.person.first_name for u in users_mock
+    ]
+    user_service_mock.get_all_users.assert_awaited_once_with(
+        context_mock,
+        limit=250,
+        cursor=None,
+        with_person=True,
+        fields=(),
+        query=ListQuery(),
+    )
+
+    # WHEN
+    response = httpclient.get(url, params={"expand": "person", "fields": "person"})
+
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["data"] == [
+        {"person": snake_to_camel(u.person.model_dump(mode="json"))} for u in users_mock
+    ]
+    # the person is only a field of the expanded user
+    response = httpclient.get(url, params={"fields": "person"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
+def test_get_all_users_filter_sort(
+    user_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    user_service_mock.get_all_users_version.return_value = (1, 1, datetime.now(), False)
+    query = ListQuery(
+        filters=(("active", QueryOperatorEnum.EQ, True),),
+        sort=("username",),
+        types=(str,),
+    )
+    etag = Validator(*user_service_mock.get_all_users_version.return_value, query).etag
+
+    # WHEN
+    url = "/users/v1/users"
+    response = httpclient.get(
+        url,
+        params={"filter": ["active:eq:true"], "sort": "username"},
+        headers={"If-None-Match": etag},
+    )
+    invalid = httpclient.get(url, params={"filter": ["active:prefix:t"]})
+
+    # THEN
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    user_service_mock.get_all_users_version.assert_awaited_once_with(
+        context_mock, limit=250, cursor=None, with_person=False, query=query
+    )
+    assert invalid.status_code == HTTPStatus.BAD_REQUEST
+    assert get(invalid.json(), "errors.0.loc") == ["query", "filter"]
+
+
+@patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
+def test_get_all_users_not_modified(
+    user_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: context_mock
+    )
+    user_service_mock.get_all_users_version.return_value = (1, 1, datetime.now(), False)
+    etag = Validator(
+        *user_service_mock.get_all_users_version.return_value, ListQuery()
+    ).etag
+
+    # WHEN
+    url = "/users/v1/users"
+    response = httpclient.get(
+        url, params={"expand": "person"}, headers={"If-None-Match": etag}
+    )
+
+    # THEN
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    user_service_mock.get_all_users.assert_not_awaited()
+    user_service_mock.get_all_users_version.assert_awaited_once_with(
+        context_mock, limit=250, cursor=None, with_person=True, query=ListQuery()
+    )
+
+
 @patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
 def test_get_all_users_ok(
     user_service_mock: AsyncMock,
@@ -65,6 +319,7 @@ def test_get_all_users_ok(
             person_id=fake.pyint(1, 999),
             active=fake.pybool(),
             updated_at=datetime.now(),
+            version=1,
             created_at=datetime.now(),
         )
         for _ in range(fake.pyint(1, 10))
@@ -72,7 +327,8 @@ def test_get_all_users_ok(
     httpclient.current_app.dependency_overrides[check_access_token] = (
         lambda: ContextMock.context_session_mock()
     )
-    user_service_mock.get_all_users.return_value = user_mock
+    user_service_mock.page_version = page_version
+    user_service_mock.get_all_users.return_value = Page(user_mock)
 
     # WHEN
     url = "/users/v1/users"
@@ -81,10 +337,50 @@ def test_get_all_users_ok(
     # THEN
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {
-        "data": [snake_to_camel(u.model_dump(mode="json")) for u in user_mock]
+        "data": [snake_to_camel(u.model_dump(mode="json")) for u in user_mock],
+        "next": None,
     }
 
 
+@patch("server.controllers.user_controller.user_service")
+def test_export_users_ok(
+    user_service_mock: MagicMock,
+    httpclient: HttpClient,
+):
+    # MOCK
+    user_mock = [
+        UserModel(
+            id=idx + 1,
+            username=fake.user_name(),
+            password=fake.password(),
+            person_id=fake.pyint(1, 999),
+            active=fake.pybool(),
+            updated_at=datetime.now(),
+            version=1,
+            created_at=datetime.now(),
+        )
+        for idx in range(3)
+    ]
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: ContextMock.context_session_mock()
+    )
+
+    async def chunks_mock(*args: Any, **kwargs: Any):
+        yield user_mock
+
+    user_service_mock.export_users.side_effect = chunks_mock
+
+    # WHEN
+    url = "/users/v1/users:export"
+    response = httpclient.get(url)
+
+    # THEN
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == HTTPStatus.OK
+    assert [row["id"] for row in rows] == [u.id for u in user_mock]
+    assert all("password" not in row for row in rows)
+
+
 @patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
 def test_get_all_users_nocontent(
     user_service_mock: AsyncMock,
@@ -97,7 +393,8 @@ def test_get_all_users_nocontent(
     httpclient.current_app.dependency_overrides[check_access_token] = (
         lambda: ContextMock.context_session_mock()
     )
-    user_service_mock.get_all_users.return_value = user_mock
+    user_service_mock.page_version = page_version
+    user_service_mock.get_all_users.return_value = Page(user_mock)
 
     # WHEN
     url = "/users/v1/users"
@@ -127,6 +424,7 @@ def test_update_user_ok(
         person_id=update_user.person_id,
         active=update_user.active,
         updated_at=datetime.now(),
+        version=1,
         created_at=datetime.now(),
     )
     httpclient.current_app.dependency_overrides[check_access_token] = (
@@ -165,6 +463,7 @@ def test_update_user_optional_ok(
         person_id=fake.pyint(1, 999),
         active=fake.pybool(),
         updated_at=datetime.now(),
+        version=3,
         created_at=datetime.now(),
     )
     httpclient.current_app.dependency_overrides[check_access_token] = (
@@ -174,13 +473,50 @@ def test_update_user_optional_ok(
 
     # WHEN
     url = f"/users/v1/users/{user_id}"
-    response = httpclient.patch(url, json=update_user.model_dump())
+    response = httpclient.patch(
+        url, json=update_user.model_dump(), headers={"If-Match": '"1", "2"'}
+    )
 
     # THEN
     assert response.status_code == HTTPStatus.OK
     data: dict[str, Any] = response.json()["data"]
     assert data.get("username") == update_user.username
     assert not data.get("password")
+    assert response.headers["etag"] == '"3"'
+    kwargs = user_service_mock.update_user_optional.await_args.kwargs
+    assert kwargs["versions"] == [1, 2]
+
+
+@patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
+def test_update_user_precondition_failed(
+    user_service_mock: AsyncMock,
+    httpclient: HttpClient,
+):
+    # GIVEN
+    user_id = fake.pyint(1, 999)
+    update_user = UpdateUser(  # type: ignore
+        username=fake.user_name(),
+        person_id=fake.pyint(1, 999),
+        active=fake.pybool(),
+    )
+
+    # MOCK
+    httpclient.current_app.dependency_overrides[check_access_token] = (
+        lambda: ContextMock.context_session_mock()
+    )
+    user_service_mock.update_user.side_effect = StaleDataError(
+        f"user {user_id} is not at version []"
+    )
+
+    # WHEN
+    url = f"/users/v1/users/{user_id}"
+    response = httpclient.put(
+        url, json=update_user.model_dump(), headers={"If-Match": 'W/"1"'}
+    )
+
+    # THEN
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+    assert user_service_mock.update_user.await_args.kwargs["versions"] == []
 
 
 @patch("server.controllers.user_controller.user_service", new_callable=AsyncMock)
@@ -229,6 +565,7 @@ def test_user_person_create_ok(
         person_id=fake.pyint(1, 999),
         active=True,
         updated_at=datetime_now,
+        version=1,
         created_at=datetime_now,
     )
     httpclient.current_app.dependency_overrides[check_access_token] = (
@@ -300,6 +637,7 @@ def test_update_user_password_ok(
         person_id=fake.pyint(1, 999),
         active=True,
         updated_at=datetime_now,
+        version=1,
         created_at=datetime_now,
     )
     httpclient.current_app.dependency_overrides[check_access_token] = (
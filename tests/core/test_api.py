@@ -0,0 +1,14 @@
+from server.api import app
+from server.core.crypt import get_crypt
+from tests.utils.http_client import HttpClient
+
+
+def test_lifespan_shutdown_crypt():
+    # GIVEN
+    crypt = get_crypt()
+
+    # WHEN
+    with HttpClient(app):
+        crypt.executor
+    # THEN
+    assert getattr(crypt, "_executor") is None
@@ -0,0 +1,463 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from server.core.cache import (
+    BusCacheVersions,
+    CacheVersionsInterface,
+    EntityCache,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    RedisCacheVersions,
+    TTLCache,
+    get_cache_backend,
+    get_cache_versions,
+)
+from server.core.invalidation import InvalidationBus
+from server.core.settings import Settings
+from server.enums.cache_enum import CacheBackendEnum
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class FakeRedis:
+    # local stand-in for redis.asyncio.Redis
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.px: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, px: int):
+        self.data[key] = value
+        self.px[key] = px
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction: bool) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.commands: list[tuple[str, str, int]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *args: Any):
+        self.commands.clear()
+
+    def incr(self, key: str):
+        self.commands.append(("incr", key, 1))
+
+    def pexpire(self, key: str, px: int):
+        self.commands.append(("pexpire", key, px))
+
+    async def execute(self):
+        for command, key, value in self.commands:
+            if command == "incr":
+                self.client.data[key] = b"%d" % (int(self.client.data.get(key, 0)) + 1)
+            else:
+                self.client.px[key] = value
+
+
+def entity_cache(
+    ttl: float = 60,
+    versions: CacheVersionsInterface | None = None,
+    backend: MemoryCacheBackend | RedisCacheBackend | None = None,
+) -> EntityCache[Item]:
+    return EntityCache(
+        "item",
+        Item,
+        backend=backend or MemoryCacheBackend(10, 60),
+        versions=versions or BusCacheVersions(InvalidationBus(slots=64)),
+        ttl=ttl,
+    )
+
+
+def test_ttl_cache_get_hit():
+    # GIVEN
+    cache = TTLCache[str, int](maxsize=10, ttl=60)
+    cache.set("a", 1)
+
+    # WHEN
+    res = cache.get("a")
+
+    # THEN
+    assert res == 1
+    assert cache.stats() == {"hits": 1, "misses": 0, "size": 1}
+
+
+def test_ttl_cache_get_miss():
+    # GIVEN
+    cache = TTLCache[str, int](maxsize=10, ttl=60)
+
+    # WHEN
+    res = cache.get("a")
+
+    # THEN
+    assert res is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "size": 0}
+
+
+def test_ttl_cache_expired():
+    # GIVEN
+    cache = TTLCache[str, int](maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=1)
+
+    # WHEN
+    with patch("server.core.cache.time.monotonic", return_value=time.monotonic() + 2):
+        res = cache.get("a")
+
+    # THEN
+    assert res is None
+    assert "a" not in cache
+    assert len(cache) == 0
+
+
+def test_ttl_cache_ttl_not_positive():
+    # GIVEN
+    cache = TTLCache[str, int](maxsize=10, ttl=60)
+    cache.set("a", 1)
+
+    # WHEN
+    cache.set("a", 2, ttl=-1)
+
+    # THEN
+    assert "a" not in cache
+
+
+def test_ttl_cache_lru_eviction():
+    # GIVEN
+    cache = TTLCache[str, int](maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    # WHEN
+    cache.set("c", 3)
+
+    # THEN
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_ttl_cache_delete():
+    # GIVEN
+    cache = TTLCache[str, int](maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    # WHEN
+    cache.delete("a")
+    cache.delete_where(lambda value: value == 2)
+
+    # THEN
+    assert "a" not in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_ttl_cache_clear():
+    # GIVEN
+    cache = TTLCache[str, int](maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+
+    # WHEN
+    cache.clear()
+
+    # THEN
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0}
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_backend():
+    # GIVEN
+    backend = MemoryCacheBackend(maxsize=10, ttl=60)
+    await backend.set("a", b"1", ttl=60)
+    await backend.set("b", b"2", ttl=60)
+
+    # WHEN
+    await backend.delete("a")
+
+    # THEN
+    assert await backend.get("a") is None
+    assert await backend.get("b") == b"2"
+    backend.clear()
+    assert await backend.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_backend():
+    # GIVEN
+    client = FakeRedis()
+    backend = RedisCacheBackend(client)
+
+    # WHEN
+    await backend.set("a", b"1", ttl=1.5)
+    await backend.set("b", b"2", ttl=60)
+    await backend.set("b", b"3", ttl=0)
+    await backend.delete()
+
+    # THEN
+    assert await backend.get("a") == b"1"
+    assert client.px == {"a": 1500, "b": 60000}
+    assert await backend.get("b") is None
+
+
+def test_get_cache_backend(settings: Settings, monkeypatch: pytest.MonkeyPatch):
+    # GIVEN
+    # redis is an optional extra
+    pytest.importorskip("redis")
+    # restored on teardown, even when an assert fails
+    monkeypatch.setattr(settings, "entity_cache_backend", CacheBackendEnum.REDIS)
+    monkeypatch.setattr(settings, "entity_cache_url", "redis://localhost:6379/0")
+
+    # WHEN
+    backend = get_cache_backend.__wrapped__()
+
+    # THEN
+    assert isinstance(backend, RedisCacheBackend)
+    assert isinstance(get_cache_backend(), MemoryCacheBackend)
+
+
+def test_settings_redis_without_url():
+    # WHEN
+    with pytest.raises(ValidationError) as exc_info:
+        Settings(entity_cache_backend=CacheBackendEnum.REDIS)
+    # THEN
+    assert "entity_cache_url is required by the redis backend" in str(exc_info.value)
+
+
+def test_get_cache_versions():
+    # GIVEN
+    client = FakeRedis()
+
+    # WHEN
+    with patch(
+        "server.core.cache.get_cache_backend", return_value=RedisCacheBackend(client)
+    ):
+        versions = get_cache_versions.__wrapped__()
+
+    # THEN
+    assert isinstance(versions, RedisCacheVersions)
+    assert isinstance(get_cache_versions(), BusCacheVersions)
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_versions():
+    # GIVEN
+    client = FakeRedis()
+    versions = RedisCacheVersions(client, ttl=1.5)
+
+    # WHEN
+    await versions.publish("item", 1, 2)
+    await versions.publish("item", 1)
+    await versions.publish("item")
+
+    # THEN
+    assert await versions.version("item", 1) == 2
+    assert await versions.version("item", 2) == 1
+    assert await versions.version("item", 3) == 0
+    assert client.px == {"item:1:version": 3000, "item:2:version": 3000}
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_get_or_load():
+    # GIVEN
+    cache = entity_cache()
+    calls = 0
+
+    async def loader() -> Item:
+        nonlocal calls
+        calls += 1
+        return Item(id=1, name="a")
+
+    # WHEN
+    first = await cache.get_or_load(1, loader)
+    second = await cache.get_or_load(1, loader)
+
+    # THEN
+    assert first == second == Item(id=1, name="a")
+    assert first is not second
+    assert calls == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "coalesced": 0}
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_ttl_disabled():
+    # GIVEN
+    cache = entity_cache(ttl=0)
+
+    # WHEN
+    await cache.set(1, Item(id=1, name="a"))
+
+    # THEN
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_coalesces_concurrent_misses():
+    # GIVEN
+    cache = entity_cache()
+    release = asyncio.Event()
+    calls = 0
+
+    async def loader() -> Item:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return Item(id=1, name="a")
+
+    # WHEN
+    tasks = [asyncio.create_task(cache.get_or_load(1, loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    # THEN
+    assert calls == 1
+    assert all(item == Item(id=1, name="a") for item in results)
+    assert cache.stats() == {"hits": 0, "misses": 1, "coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_coalesced_error():
+    # GIVEN
+    cache = entity_cache()
+    release = asyncio.Event()
+
+    async def loader() -> Item:
+        await release.wait()
+        raise LookupError("not found")
+
+    # WHEN
+    tasks = [asyncio.create_task(cache.get_or_load(1, loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results: list[Any] = await asyncio.gather(*tasks, return_exceptions=True)
+
+    # THEN
+    assert all(isinstance(err, LookupError) for err in results)
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_leader_cancelled():
+    # GIVEN
+    cache = entity_cache()
+    started = asyncio.Event()
+
+    async def slow_loader() -> Item:
+        started.set()
+        await asyncio.sleep(60)
+        return Item(id=1, name="slow")
+
+    async def loader() -> Item:
+        return Item(id=1, name="a")
+
+    # WHEN
+    leader = asyncio.create_task(cache.get_or_load(1, slow_loader))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_load(1, loader))
+    await asyncio.sleep(0)
+    leader.cancel()
+    result = await waiter
+
+    # THEN
+    assert leader.cancelled()
+    assert result == Item(id=1, name="a")
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_invalidated_while_loading():
+    # GIVEN
+    cache = entity_cache()
+
+    async def loader() -> Item:
+        # a write lands while the stale row is on its way back
+        await cache.delete(1)
+        return Item(id=1, name="stale")
+
+    # WHEN
+    result = await cache.get_or_load(1, loader)
+
+    # THEN
+    assert result.name == "stale"
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_invalidated_by_other_worker(tmp_path: Path):
+    # GIVEN
+    # two workers, each with its own memory, on the same host
+    first = entity_cache(
+        versions=BusCacheVersions(InvalidationBus(slots=64, path=tmp_path / "bus"))
+    )
+    second = entity_cache(
+        versions=BusCacheVersions(InvalidationBus(slots=64, path=tmp_path / "bus"))
+    )
+    await first.set(1, Item(id=1, name="a"))
+    await second.set(1, Item(id=1, name="a"))
+
+    # WHEN
+    await first.delete(1)
+
+    # THEN
+    assert await second.get(1) is None
+    await second.set(1, Item(id=1, name="b"))
+    assert await second.get(1) == Item(id=1, name="b")
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_shared_by_redis_workers():
+    # GIVEN
+    # two workers, on any host, each with its own connection to the same redis
+    client = FakeRedis()
+    first, second = (
+        entity_cache(
+            versions=RedisCacheVersions(client, ttl=60),
+            backend=RedisCacheBackend(client),
+        )
+        for _ in range(2)
+    )
+    await first.set(1, Item(id=1, name="a"))
+
+    # WHEN
+    await second.delete(1)
+    cached = await first.get(1)
+    await first.set(1, Item(id=1, name="b"))
+
+    # THEN
+    # an entry reloaded after a write is a hit for every worker
+    assert cached is None
+    assert await second.get(1) == Item(id=1, name="b")
+    assert await first.get(1) == Item(id=1, name="b")
+
+
+def test_entity_cache_clear():
+    # GIVEN
+    cache = entity_cache()
+    cache.hits = 3
+
+    # WHEN
+    cache.clear()
+
+    # THEN
+    assert cache.stats() == {"hits": 0, "misses": 0, "coalesced": 0}
@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import cast
+
+from fastapi import Request
+
+from server.core.conditional import (
+    Validator,
+    conditional_response,
+    if_match,
+    if_none_match,
+    not_modified,
+)
+from server.core.schema import ResponseOK
+
+UPDATED_AT = datetime(2024, 5, 23, 12, 0, 0, 500_000, tzinfo=timezone.utc)
+
+
+class RequestMock:
+    def __init__(self, **headers: str):
+        self.headers = {k.replace("_", "-"): v for k, v in headers.items()}
+
+
+def request(**headers: str) -> Request:
+    return cast(Request, RequestMock(**headers))
+
+
+def test_validator_etag():
+    # WHEN
+    validator = Validator(1, UPDATED_AT, last_modified=UPDATED_AT)
+
+    # THEN
+    # sqlite hands back the same instant without the timezone
+    assert validator.etag == Validator(1, UPDATED_AT.replace(tzinfo=None)).etag
+    assert validator.etag != Validator(2, UPDATED_AT).etag
+    assert validator.etag.startswith('"') and validator.etag.endswith('"')
+    assert validator.headers() == {
+        "ETag": validator.etag,
+        "Last-Modified": "Thu, 23 May 2024 12:00:00 GMT",
+    }
+    assert Validator(1).headers() == {"ETag": Validator(1).etag}
+
+
+def test_validator_of_version():
+    # WHEN
+    validator = Validator.of_version(3, last_modified=UPDATED_AT)
+
+    # THEN
+    assert validator.etag == '"3"'
+    assert validator.headers()["Last-Modified"] == "Thu, 23 May 2024 12:00:00 GMT"
+
+
+def test_if_match():
+    # THEN
+    assert if_match(request()) is None
+    assert if_match(request(if_match="*")) is None
+    assert if_match(request(if_match='"3", "4"')) == [3, 4]
+    # weak tags, hashed tags and versions the column can not hold never match
+    assert if_match(request(if_match='W/"3", "a1", "4294967296"')) == []
+
+
+def test_if_none_match():
+    # THEN
+    assert if_none_match(request()) is None
+    assert if_none_match(request(if_none_match='"a", W/"b"')) == {'"a"', '"b"'}
+
+
+def test_not_modified_etag():
+    # GIVEN
+    validator = Validator(1, UPDATED_AT)
+
+    # THEN
+    assert not_modified(request(if_none_match=validator.etag), validator)
+    assert not_modified(request(if_none_match=f'"x", W/{validator.etag}'), validator)
+    assert not_modified(request(if_none_match="*"), validator)
+    assert not not_modified(request(if_none_match='"x"'), validator)
+    assert not not_modified(request(), validator)
+
+
+def test_not_modified_since():
+    # GIVEN
+    validator = Validator(1, UPDATED_AT, last_modified=UPDATED_AT)
+
+    # THEN
+    assert not_modified(
+        request(if_modified_since="Thu, 23 May 2024 12:00:00 GMT"), validator
+    )
+    assert not not_modified(
+        request(if_modified_since="Thu, 23 May 2024 11:59:59 GMT"), validator
+    )
+    assert not not_modified(request(if_modified_since="yesterday"), validator)
+    # the etag wins over the date
+    assert not not_modified(
+        request(if_none_match='"x"', if_modified_since="Thu, 23 May 2024 12:00:00 GMT"),
+        validator,
+    )
+    assert not not_modified(
+        request(if_modified_since="Thu, 23 May 2024 12:00:00 GMT"), Validator(1)
+    )
+
+
+def test_conditional_response():
+    # GIVEN
+    validator = Validator(1, UPDATED_AT, last_modified=UPDATED_AT)
+    content = ResponseOK[int](data=1)
+
+    # WHEN
+    fresh = conditional_response(request(), validator, content)
+    cached = conditional_response(
+        request(if_none_match=validator.etag), validator, content
+    )
+
+    # THEN
+    assert fresh.status_code == HTTPStatus.OK
+    assert fresh.body == b'{"data":1}'
+    assert fresh.headers["etag"] == validator.etag
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert cached.body == b""
+    assert cached.headers["etag"] == validator.etag
+    assert cached.headers["last-modified"] == "Thu, 23 May 2024 12:00:00 GMT"
@@ -26,6 +26,49 @@ async def test_get_context_with_request_ok(settings: Settings):
     async for context in get_context_with_request(request=request_mock):
         # THEN
         assert isinstance(context, Context)
+        assert getattr(context, "_session") is None
+
+
+@pytest.mark.asyncio
+async def test_get_context_with_request_lazy_session(settings: Settings):
+    # GIVEN
+    settings.db_url = DatabaseDsn(r"sqlite+aiosqlite://")
+    request_mock = cast(Request, RequestMock())
+    # WHEN
+    async for context in get_context_with_request(request=request_mock):
+        session = context.session
+        # THEN
+        assert context.session is session
+    assert getattr(context, "_session") is None
+
+
+@pytest.mark.asyncio
+async def test_context_close_not_owned_session():
+    # GIVEN
+    session_mock = SessionIOMock()
+    ctx = Context(session=cast(SessionIO, session_mock))
+    # WHEN
+    await ctx.close()
+    # THEN
+    assert ctx.session is session_mock
+
+
+def test_context_open_session_not_shared():
+    # GIVEN
+    ctx = Context(session_maker=lambda: cast(SessionIO, SessionIOMock()))  # type: ignore
+    # WHEN
+    session = ctx.open_session()
+    # THEN
+    assert session is not ctx.open_session()
+    assert session is not ctx.session
+
+
+def test_context_open_session_not_maker():
+    # WHEN
+    with pytest.raises(ValueError) as exc_info:
+        Context().open_session()
+    # THEN
+    assert "session maker not found" in str(exc_info.value)
 
 
 def test_context_ok_request():
@@ -54,6 +97,7 @@ def test_context_ok_user():
         active=fake.boolean(50),
         person_id=fake.random_int(1, 99),
         updated_at=fake.date_time(),
+        version=1,
         created_at=fake.date_time(),
     )
     # WHEN
@@ -87,3 +131,12 @@ def test_context_not_request():
         ctx.request
     # THEN
     assert "request not found" in str(exc_info.value)
+
+
+def test_context_slots():
+    # WHEN
+    ctx = Context()
+    # THEN
+    assert not hasattr(ctx, "__dict__")
+    with pytest.raises(AttributeError):
+        setattr(ctx, "other", 1)
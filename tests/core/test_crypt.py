@@ -1,4 +1,11 @@
-from server.core.crypt import get_crypt
+import asyncio
+import warnings
+
+import pytest
+
+from server.core.crypt import PasslibCore, get_crypt
+from server.core.exceptions import ServiceUnavailableError
+from server.enums.crypt_enum import CryptExecutorEnum
 
 
 def test_hash_password_ok():
@@ -38,3 +45,90 @@ def test_check_password_false():
 
     # THEN
     assert res is False
+
+
+@pytest.mark.asyncio
+async def test_ahash_password_ok():
+    crypt = get_crypt()
+
+    # GIVEN
+    pw = "123456"
+
+    # WHEN
+    pw_hash = await crypt.ahash_password(pw)
+
+    # THEN
+    assert crypt.check_password(pw, pw_hash) is True
+
+
+@pytest.mark.asyncio
+async def test_acheck_password_ok():
+    crypt = get_crypt()
+
+    # GIVEN
+    pw = "123456"
+    pw_hash = crypt.hash_password(pw)
+
+    # WHEN
+    res = await crypt.acheck_password(pw, pw_hash)
+
+    # THEN
+    assert res is True
+
+
+@pytest.mark.asyncio
+async def test_acheck_password_false():
+    crypt = get_crypt()
+
+    # GIVEN
+    pw = "123456"
+    pw_hash = crypt.hash_password(pw)
+    pw_ne = "987654"
+
+    # WHEN
+    res = await crypt.acheck_password(pw_ne, pw_hash)
+
+    # THEN
+    assert res is False
+
+
+@pytest.mark.asyncio
+async def test_acheck_password_process_executor(monkeypatch: pytest.MonkeyPatch):
+    # the forkserver outlives the session, pytest-cov would start coverage in
+    # it and leave its data file behind
+    monkeypatch.delenv("COV_CORE_DATAFILE", raising=False)
+    crypt = PasslibCore(executor=CryptExecutorEnum.PROCESS, max_workers=1)
+
+    # GIVEN
+    pw = "123456"
+
+    # WHEN
+    # the loop's default executor keeps a thread alive, as in a served worker
+    await asyncio.to_thread(int)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        pw_hash = await crypt.ahash_password(pw)
+        res = await crypt.acheck_password(pw, pw_hash)
+    crypt.shutdown()
+
+    # THEN
+    # forking this multi-threaded process would warn of deadlocks
+    assert [w for w in caught if "fork" in str(w.message)] == []
+    assert res is True
+    assert crypt.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_ahash_password_pool_busy():
+    crypt = PasslibCore(max_workers=1, max_pending=1)
+
+    # GIVEN
+    pw = "123456"
+
+    # WHEN
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        await asyncio.gather(crypt.ahash_password(pw), crypt.ahash_password(pw))
+    crypt.shutdown()
+
+    # THEN
+    assert "crypt worker pool is busy" in str(exc_info.value.detail)
@@ -1,7 +1,21 @@
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
-from sqlalchemy.exc import OperationalError
+from pydantic import ValidationError
+from sqlalchemy.exc import OperationalError, TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
 
-from server.core.database import get_sessionio
+from server.core.database import (
+    MeteredQueuePool,
+    engine_options,
+    get_sessionio,
+    init_engine,
+    pool_checkout_timeouts,
+    pool_checkout_wait,
+    pool_stats,
+    sqlite_pragmas,
+)
 from server.core.settings import DatabaseDsn, Settings
 from server.repositories import person_repository
 
@@ -20,3 +34,132 @@ async def test_get_sessionio_error(settings: Settings):
         async for session in get_sessionio():
             await person_repository.get(pk=99999, session=session)
     assert "no such table: person" in str(exc_info.value)
+
+
+def test_engine_options_memory(settings: Settings):
+    # GIVEN
+    settings.db_url = DatabaseDsn(r"sqlite+aiosqlite://")
+    # WHEN
+    options = engine_options(settings)
+    # THEN
+    assert options == {}
+
+
+def test_engine_options_pool(settings: Settings):
+    # GIVEN
+    settings.db_url = DatabaseDsn(r"sqlite+aiosqlite:///database.db")
+    settings.db_pool_size = 3
+    settings.db_pool_max_overflow = 2
+    settings.db_pool_pre_ping = True
+    # WHEN
+    options = engine_options(settings)
+    # THEN
+    assert options["poolclass"] is MeteredQueuePool
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 2
+    assert options["pool_timeout"] == settings.db_pool_timeout
+    assert options["pool_recycle"] == settings.db_pool_recycle
+    assert options["pool_pre_ping"] is True
+
+
+def test_settings_pool_invalid():
+    # WHEN
+    with pytest.raises(ValidationError) as exc_info:
+        Settings(db_pool_size=0, db_pool_timeout=0)
+    # THEN
+    assert "db_pool_size" in str(exc_info.value)
+    assert "db_pool_timeout" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_metered_queue_pool_timeout(tmp_path: Path):
+    # GIVEN
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    checkouts = pool_checkout_wait.count
+    timeouts = pool_checkout_timeouts.value
+    # WHEN
+    async with engine.connect():
+        with pytest.raises(TimeoutError):
+            async with engine.connect():
+                pass
+    await engine.dispose()
+    # THEN
+    assert pool_checkout_wait.count == checkouts + 2
+    assert pool_checkout_wait.max >= 0.05
+    assert pool_checkout_timeouts.value == timeouts + 1
+
+
+def test_pool_stats():
+    # WHEN
+    stats = pool_stats()
+    # THEN
+    assert "checkout_wait" in stats
+    assert "checkout_timeouts" in stats
+    assert 0 <= stats.get("saturation", 0) <= 1
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_overflow(tmp_path: Path, settings: Settings):
+    # GIVEN
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=settings.db_pool_max_overflow,
+    )
+    # WHEN
+    with patch("server.core.database.sessionio_maker") as maker_mock:
+        maker_mock.return_value.kw = {"bind": engine.sync_engine}
+        idle = pool_stats()
+        async with engine.connect(), engine.connect():
+            busy = pool_stats()
+    await engine.dispose()
+    # THEN
+    # an idle pool has no overflow, not -size
+    assert (idle["overflow"], idle["checked_out"], idle["saturation"]) == (0, 0, 0)
+    assert busy["overflow"] == 1
+    assert busy["saturation"] == 2 / (1 + settings.db_pool_max_overflow)
+
+
+def test_engine_options_postgres(settings: Settings):
+    # GIVEN
+    settings.db_url = DatabaseDsn(r"postgresql+asyncpg://user:pw@localhost/db")
+    settings.db_statement_cache_size = 0
+    # WHEN
+    options = engine_options(settings)
+    # THEN
+    assert options["poolclass"] is MeteredQueuePool
+    assert options["connect_args"] == {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    }
+
+
+def test_sqlite_pragmas(settings: Settings):
+    # GIVEN
+    settings.db_sqlite_mmap_size = 0
+    # WHEN
+    pragmas = sqlite_pragmas(settings)
+    # THEN
+    assert "PRAGMA journal_mode=WAL" in pragmas
+    assert "PRAGMA synchronous=NORMAL" in pragmas
+    assert "PRAGMA mmap_size=0" in pragmas
+
+
+@pytest.mark.asyncio
+async def test_init_engine_without_pragmas(settings: Settings):
+    # GIVEN
+    settings.db_sqlite_pragmas = False
+    engine = init_engine(create_async_engine("sqlite+aiosqlite://"), settings)
+    # WHEN
+    async with engine.connect() as conn:
+        synchronous = (await conn.exec_driver_sql("PRAGMA synchronous")).scalar()
+    await engine.dispose()
+    # THEN
+    assert synchronous == 2  # FULL, sqlite default
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+
+from server.core.fields import parse_fields, sparse_resource
+from server.resources.person_resource import Person
+
+
+def test_parse_fields():
+    # THEN
+    assert parse_fields(Person, None) == ()
+    # aliases or names, always in the declared order
+    assert parse_fields(Person, "id, firstName") == ("first_name", "id")
+    assert parse_fields(Person, "first_name,id,id") == ("first_name", "id")
+
+
+def test_parse_fields_unknown():
+    # WHEN
+    with pytest.raises(RequestValidationError) as exc_info:
+        parse_fields(Person, "id,password,")
+
+    # THEN
+    [error] = exc_info.value.errors()
+    assert error["loc"] == ("query", "fields")
+    assert error["msg"] == "unknown fields: '', 'password'"
+
+
+def test_sparse_resource():
+    # GIVEN
+    person = Person(
+        id=1,
+        first_name="Ana",
+        last_name="Silva",
+        version=1,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+
+    # WHEN
+    resource = sparse_resource(Person, ("first_name", "id"))
+    data = resource.model_validate(person, from_attributes=True)
+
+    # THEN
+    assert resource is sparse_resource(Person, ("first_name", "id"))
+    assert data.model_dump(by_alias=True) == {"firstName": "Ana", "id": 1}
@@ -0,0 +1,68 @@
+import os
+import tempfile
+from pathlib import Path
+
+from server.core.invalidation import InvalidationBus, default_path, get_invalidation_bus
+from server.core.settings import Settings
+
+
+def test_invalidation_bus_publish():
+    # GIVEN
+    bus = InvalidationBus(slots=64)
+
+    # WHEN
+    bus.publish("person", 1)
+    bus.publish("person", 1, 2)
+
+    # THEN
+    assert bus.version("person", 1) == 2
+    assert bus.version("person", 2) == 1
+    bus.close()
+
+
+def test_invalidation_bus_shared_file(tmp_path: Path):
+    # GIVEN
+    first = InvalidationBus(slots=64, path=tmp_path / "bus")
+    second = InvalidationBus(slots=64, path=tmp_path / "bus")
+    version = second.version("user", 7)
+
+    # WHEN
+    first.publish("user", 7)
+
+    # THEN
+    assert second.version("user", 7) == version + 1
+    assert os.path.getsize(tmp_path / "bus") == 64 * 8
+    first.close()
+    second.close()
+
+
+def test_invalidation_bus_keeps_counters(tmp_path: Path):
+    # GIVEN
+    bus = InvalidationBus(slots=64, path=tmp_path / "bus")
+    bus.publish("user", 7)
+    bus.close()
+
+    # WHEN
+    # a worker restarted by the master maps the same counters again
+    bus = InvalidationBus(slots=64, path=tmp_path / "bus")
+
+    # THEN
+    assert bus.version("user", 7) == 1
+    bus.close()
+
+
+def test_get_invalidation_bus(settings: Settings, tmp_path: Path):
+    # GIVEN
+    settings.invalidation_bus_path = tmp_path / "bus"
+
+    # WHEN
+    bus = get_invalidation_bus.__wrapped__()
+    bus.publish("person", 1)
+
+    # THEN
+    other = InvalidationBus(settings.invalidation_bus_slots, path=tmp_path / "bus")
+    assert other.version("person", 1) == 1
+    assert default_path().parent == Path(tempfile.gettempdir())
+    other.close()
+    bus.close()
+    settings.invalidation_bus_path = None
@@ -0,0 +1,122 @@
+from datetime import datetime
+from typing import Optional
+
+from faker import Faker
+from pydantic import BaseModel
+
+from server.core import mapper
+from server.models.person_model import Person as PersonModel
+from server.models.user_model import User as UserModel
+from server.resources.person_resource import Person
+from server.resources.user_resource import User, UserPerson
+
+faker = Faker("pt_BR")
+
+
+class Name(BaseModel):
+    name: str
+
+
+class Owner(BaseModel):
+    id: int
+    person: Optional[Person] = None
+
+
+def person_model(idx: int = 1) -> PersonModel:
+    now = datetime.now()
+    return PersonModel(
+        id=idx,
+        first_name=faker.first_name(),
+        last_name=faker.last_name(),
+        created_at=now,
+        updated_at=now,
+        version=1,
+    )
+
+
+def user_model(person: PersonModel) -> UserModel:
+    now = datetime.now()
+    user = UserModel(
+        id=1,
+        username=faker.user_name(),
+        password=faker.password(),
+        active=True,
+        person_id=person.id,
+        created_at=now,
+        updated_at=now,
+        version=1,
+    )
+    user.person = person
+    return user
+
+
+def test_to_resource():
+    # GIVEN
+    person = person_model()
+    # WHEN
+    result = mapper.to_resource(Person, person)
+    # THEN
+    assert isinstance(result, Person)
+    assert result.model_dump() == person.model_dump()
+
+
+def test_to_resource_nested():
+    # GIVEN
+    person = person_model()
+    user = user_model(person)
+    # WHEN
+    result = mapper.to_resource(UserPerson, user)
+    # THEN
+    assert isinstance(result.person, Person)
+    assert result.person.first_name == person.first_name
+    assert result.username == user.username
+    assert "password" not in result.model_dump()
+
+
+def test_to_resource_nested_none():
+    # GIVEN
+    class Row:
+        id = 1
+        person = None
+
+    # WHEN
+    result = mapper.to_resource(Owner, Row())
+    # THEN
+    assert result == Owner(id=1, person=None)
+
+
+def test_to_resource_dict():
+    # GIVEN
+    person = person_model()
+    data = person.model_dump()
+    # WHEN
+    result = mapper.to_resource(Person, data)
+    # THEN
+    assert result.model_dump() == data
+
+
+def test_to_resource_single_field():
+    # GIVEN
+    person = person_model()
+    # WHEN
+    result = mapper.to_resource(Name, type("Row", (), {"name": person.first_name}))
+    # THEN
+    assert result.name == person.first_name
+
+
+def test_to_resources():
+    # GIVEN
+    persons = [person_model(idx) for idx in range(3)]
+    # WHEN
+    result = mapper.to_resources(User, [user_model(p) for p in persons])
+    # THEN
+    assert [type(u) for u in result] == [User, User, User]
+    assert [u.person_id for u in result] == [0, 1, 2]
+
+
+def test_get_mapper_cached():
+    # WHEN
+    first = mapper.get_mapper(Person)
+    second = mapper.get_mapper(Person)
+    # THEN
+    assert first is second
@@ -0,0 +1,36 @@
+from server.core import metrics
+
+
+def test_counter_ok():
+    # GIVEN
+    counter = metrics.Counter()
+    # WHEN
+    counter.inc()
+    counter.inc(2)
+    # THEN
+    assert counter.value == 3
+    counter.reset()
+    assert counter.value == 0
+
+
+def test_summary_ok():
+    # GIVEN
+    summary = metrics.Summary()
+    # WHEN
+    summary.observe(1.0)
+    summary.observe(3.0)
+    # THEN
+    assert summary.snapshot() == {"count": 2, "total": 4.0, "max": 3.0, "mean": 2.0}
+    summary.reset()
+    assert summary.snapshot() == {"count": 0, "total": 0.0, "max": 0.0, "mean": 0.0}
+
+
+def test_collect_ok():
+    # GIVEN
+    metrics.register("test", lambda: {"value": 1})
+    # WHEN
+    res = metrics.collect()
+    # THEN
+    assert res["test"] == {"value": 1}
+    assert "db_pool" in res
+    assert "principal_cache" in res
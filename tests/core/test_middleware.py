@@ -0,0 +1,72 @@
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from server.core import middleware
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    middleware.init_app(app)
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/error")
+    async def error():
+        raise RuntimeError("boom")
+
+    @app.get("/stream-error")
+    async def stream_error():
+        async def body():
+            yield b"partial"
+            raise RuntimeError("boom")
+
+        return StreamingResponse(body())
+
+    return app
+
+
+def test_catch_exception_middleware_ok():
+    # WHEN
+    response = TestClient(create_app()).get("/ok")
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"ok": True}
+
+
+def test_catch_exception_middleware_error():
+    # WHEN
+    response = TestClient(create_app()).get("/error")
+    # THEN
+    assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert response.json() == {"errors": [{"message": "boom"}]}
+
+
+def test_catch_exception_middleware_error_after_response_started():
+    # GIVEN
+    client = TestClient(create_app())
+    # WHEN
+    with pytest.raises(ExceptionGroup) as exc_info:
+        client.get("/stream-error")
+    # THEN
+    assert exc_info.group_contains(RuntimeError, match="boom")
+
+
+@pytest.mark.asyncio
+async def test_catch_exception_middleware_not_http():
+    # GIVEN
+    scopes: list[Any] = []
+
+    async def app(scope: Any, receive: Any, send: Any):
+        scopes.append(scope)
+
+    # WHEN
+    await middleware.CatchExceptionMiddleware(app)({"type": "websocket"}, None, None)  # type: ignore[arg-type]
+    # THEN
+    assert scopes == [{"type": "websocket"}]
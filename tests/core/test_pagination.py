@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from server.core.exceptions import BadRequestError
+from server.core.pagination import decode_cursor, encode_cursor, paginate
+
+
+def test_cursor_roundtrip():
+    # GIVEN
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+    # WHEN
+    cursor = encode_cursor((created_at, 42))
+
+    # THEN
+    assert "=" not in cursor
+    assert decode_cursor(cursor, datetime, int) == (created_at, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "%%%",
+        "bm90LWpzb24",  # not-json
+        encode_cursor(("42",)),
+        encode_cursor((True,)),
+        encode_cursor((1, 2)),
+    ],
+)
+def test_decode_cursor_invalid(cursor: str):
+    # WHEN
+    with pytest.raises(BadRequestError) as exc_info:
+        decode_cursor(cursor, int)
+
+    # THEN
+    assert "invalid cursor" in str(exc_info.value)
+
+
+def test_paginate_last_page():
+    # WHEN
+    page = paginate([1, 2, 3], limit=3, key=lambda i: (i,))
+
+    # THEN
+    assert page.items == [1, 2, 3]
+    assert page.next is None
+
+
+def test_paginate_next_page():
+    # WHEN
+    page = paginate([1, 2, 3, 4], limit=3, key=lambda i: (i,))
+
+    # THEN
+    assert page.items == [1, 2, 3]
+    assert page.next is not None
+    assert decode_cursor(page.next, int) == (3,)
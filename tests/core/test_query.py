@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+
+from server.core.exceptions import BadRequestError
+from server.core.pagination import encode_cursor
+from server.core.query import RANGE, ListQuery, QuerySpec, successor
+from server.enums.query_enum import QueryOperatorEnum
+from server.models.person_model import Person
+from server.resources.person_resource import Person as PersonResource
+
+spec = QuerySpec(
+    PersonResource,
+    filters={
+        "last_name": (QueryOperatorEnum.EQ, QueryOperatorEnum.PREFIX),
+        "created_at": RANGE,
+    },
+    sorts={"id": ("id",), "created_at": ("created_at", "id")},
+)
+
+
+def test_successor():
+    # THEN
+    assert successor("Sil") == "Sim"
+    assert successor("a\U0010ffff") == "b"
+    assert successor("\ud7ff") == "\ue000"
+    assert successor("\U0010ffff") is None
+
+
+def test_parse():
+    # WHEN
+    query = spec.parse(
+        ["lastName:prefix:Sil", "created_at:gte:2024-05-01T00:00:00-03:00"],
+        "-createdAt",
+    )
+
+    # THEN
+    assert query == ListQuery(
+        filters=(
+            (
+                "created_at",
+                QueryOperatorEnum.GTE,
+                datetime(2024, 5, 1, 3, tzinfo=timezone.utc),
+            ),
+            ("last_name", QueryOperatorEnum.PREFIX, "Sil"),
+        ),
+        sort=("created_at", "id"),
+        types=(datetime, int),
+        descending=True,
+    )
+    # naive timestamps are utc, no filter is the default query
+    assert spec.parse(["createdAt:lt:2024-05-01T00:00:00"], None).filters[0][2] == (
+        datetime(2024, 5, 1, tzinfo=timezone.utc)
+    )
+    assert spec.parse(None, None) == ListQuery()
+
+
+def test_parse_errors():
+    # WHEN
+    with pytest.raises(RequestValidationError) as exc_info:
+        spec.parse(
+            [
+                "lastName",
+                "firstName:eq:Ana",
+                "lastName:gt:Sil",
+                "createdAt:gte:yesterday",
+                "lastName:prefix:",
+            ],
+            "-firstName",
+        )
+
+    # THEN
+    assert [(e["loc"], e["msg"]) for e in exc_info.value.errors()] == [
+        (("query", "filter"), "'lastName' is not field:operator:value"),
+        (("query", "filter"), "'firstName' can not be filtered"),
+        (("query", "filter"), "'lastName' does not support 'gt'"),
+        (("query", "filter"), "'createdAt:gte:yesterday' has an invalid value"),
+        (("query", "filter"), "'lastName' needs a prefix"),
+        (("query", "sort"), "'-firstName' can not be sorted"),
+    ]
+
+
+def test_compile():
+    # GIVEN
+    query = spec.parse(["lastName:prefix:Sil", "lastName:eq:Silva"], "-createdAt")
+    after = query.decode_cursor(encode_cursor((datetime(2024, 5, 1), 7)))
+
+    # WHEN
+    statement = (
+        select(Person)
+        .where(*query.where(Person), query.after(Person, after))
+        .order_by(*query.order_by(Person))
+    )
+    sqlite_sql = str(statement.compile(dialect=sqlite.dialect()))
+    postgresql_sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    # THEN
+    assert "person.last_name = ?" in sqlite_sql
+    assert "person.last_name >= ? AND person.last_name < ?" in sqlite_sql
+    assert "(person.created_at, person.id) < (?, ?)" in sqlite_sql
+    assert "ORDER BY person.created_at DESC, person.id DESC" in sqlite_sql
+    # the prefix compares in the order of its COLLATE "C" index
+    assert 'person.last_name COLLATE "C" >= %(param_1)s' in postgresql_sql
+    assert "LIKE" not in postgresql_sql
+
+
+def test_compile_default():
+    # GIVEN
+    query = ListQuery()
+
+    # WHEN
+    statement = (
+        select(Person)
+        .where(*query.where(Person), query.after(Person, (7,)))
+        .order_by(*query.order_by(Person))
+    )
+
+    # THEN
+    assert "WHERE person.id > ? ORDER BY person.id" in str(
+        statement.compile(dialect=sqlite.dialect())
+    )
+    assert query.key(Person(id=7)) == (7,)
+    with pytest.raises(BadRequestError):
+        query.decode_cursor(encode_cursor(("7",)))
@@ -0,0 +1,102 @@
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import patch
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from server.core.response import JSONResponse, ResponseModelRoute
+from server.core.schema import ResponseOK
+from server.resources.person_resource import Person
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse)
+    router = APIRouter(route_class=ResponseModelRoute)
+
+    @router.post(
+        "/exact", response_model=ResponseOK[Person], status_code=HTTPStatus.CREATED
+    )
+    async def exact():
+        return ResponseOK[Person].model_validate({"data": person()})
+
+    @router.get("/dict", response_model=ResponseOK[Person])
+    async def as_dict():
+        return {"data": {**person().model_dump(), "password": "secret"}}
+
+    @router.get(
+        "/exclude",
+        response_model=ResponseOK[Person],
+        response_model_exclude={"data": {"id"}},
+    )
+    async def exclude():
+        return ResponseOK[Person].model_validate({"data": person()})
+
+    app.include_router(router)
+    return app
+
+
+def person() -> Person:
+    now = datetime(2024, 5, 23, 12, 0, 0)
+    return Person.model_validate(
+        {
+            "id": 1,
+            "first_name": "Ana",
+            "last_name": "Silva",
+            "created_at": now,
+            "updated_at": now,
+            "version": 1,
+        }
+    )
+
+
+def test_json_response_render_model():
+    # GIVEN
+    content = ResponseOK[Person].model_validate({"data": person()})
+    # WHEN
+    body = JSONResponse(content).body
+    # THEN
+    assert body == (
+        b'{"data":{"firstName":"Ana","lastName":"Silva",'
+        b'"createdAt":"2024-05-23T12:00:00","updatedAt":"2024-05-23T12:00:00","id":1,'
+        b'"version":1}}'
+    )
+
+
+def test_json_response_render_dict():
+    # WHEN
+    body = JSONResponse({"errors": [{"message": "não encontrado"}]}).body
+    # THEN
+    assert body == '{"errors":[{"message":"não encontrado"}]}'.encode()
+
+
+def test_response_model_route_exact_model_skips_validation():
+    # GIVEN
+    client = TestClient(create_app())
+    # MOCK
+    with patch("fastapi.routing.serialize_response") as serialize_response:
+        # WHEN
+        response = client.post("/exact")
+    # THEN
+    serialize_response.assert_not_called()
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json()["data"]["firstName"] == "Ana"
+
+
+def test_response_model_route_other_content_is_validated():
+    # WHEN
+    response = TestClient(create_app()).get("/dict")
+    # THEN
+    data: dict[str, Any] = response.json()["data"]
+    assert response.status_code == HTTPStatus.OK
+    assert data["lastName"] == "Silva"
+    assert "password" not in data
+
+
+def test_response_model_route_exclude_keeps_fastapi_serialization():
+    # WHEN
+    response = TestClient(create_app()).get("/exclude")
+    # THEN
+    assert response.status_code == HTTPStatus.OK
+    assert "id" not in response.json()["data"]
@@ -0,0 +1,126 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from server.core import metrics
+from server.core.context import Context
+from server.core.singleflight import SingleFlight, forget_all, singleflight, stats
+
+
+@pytest.mark.asyncio
+async def test_singleflight_collapses_concurrent_calls():
+    # GIVEN
+    flight = SingleFlight[int, str]("test.collapse")
+    release = asyncio.Event()
+    calls = 0
+
+    async def fn() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "a"
+
+    # WHEN
+    tasks = [asyncio.create_task(flight.do(1, fn)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    # THEN
+    assert results == ["a"] * 5
+    assert calls == 1
+    assert flight.stats() == {"calls": 5, "collapsed": 4, "inflight": 0}
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_error():
+    # GIVEN
+    flight = SingleFlight[int, str]("test.error")
+    release = asyncio.Event()
+
+    async def fn() -> str:
+        await release.wait()
+        raise LookupError("not found")
+
+    # WHEN
+    tasks = [asyncio.create_task(flight.do(1, fn)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results: list[Any] = await asyncio.gather(*tasks, return_exceptions=True)
+
+    # THEN
+    assert all(isinstance(err, LookupError) for err in results)
+    assert flight.collapsed == 2
+
+
+@pytest.mark.asyncio
+async def test_singleflight_forget():
+    # GIVEN
+    flight = SingleFlight[int, str]("test.forget")
+    release = asyncio.Event()
+    calls = 0
+
+    async def fn() -> str:
+        nonlocal calls
+        calls += 1
+        call = calls
+        await release.wait()
+        return str(call)
+
+    first = asyncio.create_task(flight.do(1, fn))
+    await asyncio.sleep(0)
+
+    # WHEN
+    # a write committed while the first call was running
+    forget_all(None)
+    second = asyncio.create_task(flight.do(1, fn))
+    await asyncio.sleep(0)
+    release.set()
+
+    # THEN
+    assert await first == "1"
+    assert await second == "2"
+    assert flight.collapsed == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_decorator():
+    # GIVEN
+    release = asyncio.Event()
+    calls: list[tuple[int, str | None]] = []
+
+    @singleflight
+    async def get_all(ctx: Context, limit: int, cursor: str | None = None) -> int:
+        calls.append((limit, cursor))
+        await release.wait()
+        return limit
+
+    # WHEN
+    # every request has its own context, the arguments make the key
+    tasks = [
+        asyncio.create_task(get_all(Context(), limit=10)),
+        asyncio.create_task(get_all(Context(), limit=10)),
+        asyncio.create_task(get_all(Context(), limit=10, cursor="abc")),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    # THEN
+    assert results == [10, 10, 10]
+    assert calls == [(10, None), (10, "abc")]
+    assert stats()["test_singleflight.get_all"]["collapsed"] == 1
+    assert "person_service.get_all_persons" in metrics.collect()["singleflight"]
+
+
+def test_singleflight_clear():
+    # GIVEN
+    flight = SingleFlight[int, str]("test.clear")
+    flight.calls = 3
+
+    # WHEN
+    flight.clear()
+
+    # THEN
+    assert flight.stats() == {"calls": 0, "collapsed": 0, "inflight": 0}
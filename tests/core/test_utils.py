@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+
+from server.core.utils import dialect_insert, repository_columns_can_update
+
+
+def test_repository_columns_can_update():
+    # WHEN
+    values = repository_columns_can_update({"id": 1, "created_at": 2, "name": 3})
+    # THEN
+    assert values == {"name": 3}
+
+
+@pytest.mark.parametrize(
+    "dialect_name, insert",
+    [("postgresql", postgresql.insert), ("sqlite", sqlite.insert)],
+)
+def test_dialect_insert(dialect_name: str, insert: object):
+    # WHEN
+    res = dialect_insert(dialect_name)
+    # THEN
+    assert res is insert
+
+
+def test_dialect_insert_not_supported():
+    # WHEN
+    with pytest.raises(ValueError) as exc_info:
+        dialect_insert("mysql")
+    # THEN
+    assert "mysql" in str(exc_info.value)
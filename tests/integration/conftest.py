@@ -0,0 +1,93 @@
+from pathlib import Path
+from typing import Any, AsyncGenerator, Generator
+
+import pytest
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import delete, event
+
+from server.core.database import SessionIO, sessionio_maker
+from server.core.settings import DatabaseDsn, get_settings
+from server.models.person_model import Person
+from server.models.user_model import User
+from tests.utils.postgres import PostgresServer
+
+ROOT_FOLDER = Path(__file__).parents[2]
+
+
+@pytest.fixture(scope="session")
+def database_url(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> Generator[str, Any, Any]:
+    base_dir = tmp_path_factory.mktemp("database")
+    if request.config.getoption("--postgres"):
+        with PostgresServer(base_dir) as server:
+            yield server.url
+    else:
+        yield f"sqlite+aiosqlite:///{base_dir / 'integration.db'}"
+
+
+def migrate(database_url: str, revision: str = "head"):
+    settings = get_settings()
+    db_url = settings.db_url
+    settings.db_url = DatabaseDsn(database_url)
+    try:
+        config = AlembicConfig(str(ROOT_FOLDER / "alembic.ini"))
+        config.set_main_option("script_location", str(ROOT_FOLDER / "migrations"))
+        command.upgrade(config, revision)
+    finally:
+        settings.db_url = db_url
+
+
+@pytest.fixture(scope="session")
+def migrated_database_url(database_url: str) -> str:
+    migrate(database_url)
+    return database_url
+
+
+@pytest.fixture
+async def session(migrated_database_url: str) -> AsyncGenerator[SessionIO, Any]:
+    settings = get_settings()
+    db_url = settings.db_url
+    settings.db_url = DatabaseDsn(migrated_database_url)
+    sessionio_maker.cache_clear()
+    session_local = sessionio_maker()
+    try:
+        async with session_local() as session:
+            yield session
+        async with session_local() as session:
+            async with session.begin():
+                await session.exec(delete(User))  # type: ignore
+                await session.exec(delete(Person))  # type: ignore
+    finally:
+        await session_local.kw["bind"].dispose()
+        sessionio_maker.cache_clear()
+        settings.db_url = db_url
+
+
+@pytest.fixture
+def statements(session: SessionIO) -> Generator[list[str], Any, Any]:
+    # SQL sent to the database while the test runs, one item per round trip
+    executed: list[str] = []
+    engine = session.bind.sync_engine  # type: ignore[union-attr]
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def commits(session: SessionIO) -> Generator[list[Any], Any, Any]:
+    # COMMITs sent to the database while the test runs
+    executed: list[Any] = []
+    engine = session.bind.sync_engine  # type: ignore[union-attr]
+
+    def commit(conn: Any):
+        executed.append(conn)
+
+    event.listen(engine, "commit", commit)
+    yield executed
+    event.remove(engine, "commit", commit)
@@ -0,0 +1,26 @@
+import pytest
+
+from server.core.database import SessionIO
+from server.core.settings import get_settings
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pragmas_applied(session: SessionIO):
+    if session.bind.dialect.name != "sqlite":
+        pytest.skip("sqlite only")
+    # GIVEN
+    settings = get_settings()
+
+    conn = await session.connection()
+
+    # WHEN
+    journal_mode = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar()
+    synchronous = (await conn.exec_driver_sql("PRAGMA synchronous")).scalar()
+    busy_timeout = (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar()
+    temp_store = (await conn.exec_driver_sql("PRAGMA temp_store")).scalar()
+
+    # THEN
+    assert str(journal_mode).upper() == settings.db_sqlite_journal_mode
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == settings.db_sqlite_busy_timeout
+    assert temp_store == 2  # MEMORY
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from faker import Faker
+
+from server.core.context import Context
+from server.core.database import SessionIO
+from server.models.person_model import Person
+from server.repositories import person_repository
+from server.resources.person_resource import UpdatePersonOptional
+from server.services import person_service
+
+fake = Faker("pt_BR")
+Faker.seed(0)
+
+
+async def create_person(session: SessionIO) -> tuple[int, str]:
+    first_name = fake.first_name()
+    async with session.begin():
+        person = await person_repository.create(
+            session,
+            person=Person(first_name=first_name, last_name=fake.unique.last_name()),
+        )
+    assert person.id
+    return person.id, first_name
+
+
+@pytest.mark.asyncio
+async def test_get_person_concurrent_misses_single_select(
+    session: SessionIO, statements: list[str]
+):
+    # GIVEN
+    person_id, first_name = await create_person(session)
+    ctx = Context(session=session)
+    statements.clear()
+
+    # WHEN
+    results = await asyncio.gather(
+        *(person_service.get_person(ctx, person_id=person_id) for _ in range(10))
+    )
+    again = await person_service.get_person(ctx, person_id=person_id)
+
+    # THEN
+    assert {r.first_name for r in results} == {first_name}
+    assert again == results[0]
+    assert [s.split()[0] for s in statements] == ["SELECT"]
+
+
+@pytest.mark.asyncio
+async def test_get_person_after_update_is_fresh(session: SessionIO):
+    # GIVEN
+    person_id, _ = await create_person(session)
+    ctx = Context(session=session)
+    await person_service.get_person(ctx, person_id=person_id)
+    # every request has its own session, close the read transaction
+    await session.rollback()
+    first_name = fake.unique.first_name()
+
+    # WHEN
+    await person_service.update_person_optional(
+        ctx,
+        person_id=person_id,
+        update_person=UpdatePersonOptional(first_name=first_name),  # type: ignore
+    )
+    res = await person_service.get_person(ctx, person_id=person_id)
+
+    # THEN
+    assert res.first_name == first_name
@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlmodel import SQLModel, create_engine
+
+from server.core.context import Context
+from server.core.database import SessionIO, sessionio_maker
+from server.core.streaming import ndjson_lines
+from server.resources.person_resource import Person as PersonResource
+from server.resources.user_resource import User as UserResource
+from server.services import person_service, user_service
+from tests.integration.test_person_repository import create_person
+from tests.integration.test_user_repository import create_user
+
+ROOT_FOLDER = Path(__file__).parents[2]
+
+
+def create_persons_database(path: Path, total: int) -> str:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    engine.dispose()
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            """
+            INSERT INTO person (first_name, last_name, created_at, updated_at)
+            WITH RECURSIVE seq(i) AS (
+                SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < ?
+            )
+            SELECT 'first' || i, 'last' || i, datetime(), datetime() FROM seq
+            """,
+            (total,),
+        )
+    return f"sqlite+aiosqlite:///{path}"
+
+
+def export_peak_rss(db_url: str) -> tuple[int, int]:
+    env = {
+        **os.environ,
+        "DB_URL": db_url,
+        # keep sqlite page cache and mmap out of the measured RSS
+        "DB_SQLITE_MMAP_SIZE": "0",
+        "DB_SQLITE_CACHE_SIZE": "-2000",
+    }
+    output = subprocess.run(
+        [sys.executable, "-m", "tests.utils.export_rss"],
+        cwd=ROOT_FOLDER,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    lines, rss = output.split()
+    return int(lines), int(rss)
+
+
+@pytest.mark.asyncio
+async def test_person_export_ok(session: SessionIO):
+    # GIVEN
+    persons = [await create_person(session) for _ in range(5)]
+    context = Context(session_maker=sessionio_maker())
+
+    # WHEN
+    chunks = [
+        data
+        async for data in ndjson_lines(
+            person_service.export_persons(context, chunk_size=2), PersonResource
+        )
+    ]
+
+    # THEN
+    rows = [json.loads(line) for data in chunks for line in data.splitlines()]
+    assert len(chunks) == 3
+    assert [row["id"] for row in rows] == [p.id for p in persons]
+    assert rows[0]["firstName"] == persons[0].first_name
+    assert "createdAt" in rows[0]
+
+
+@pytest.mark.asyncio
+async def test_user_export_ok(session: SessionIO):
+    # GIVEN
+    users = [await create_user(session) for _ in range(3)]
+    context = Context(session_maker=sessionio_maker())
+
+    # WHEN
+    chunks = [
+        data
+        async for data in ndjson_lines(
+            user_service.export_users(context, chunk_size=10), UserResource
+        )
+    ]
+
+    # THEN
+    rows = [json.loads(line) for data in chunks for line in data.splitlines()]
+    assert [row["id"] for row in rows] == [u.id for u in users]
+    assert rows[0]["username"] == users[0].username
+    assert "password" not in rows[0]
+
+
+def test_person_export_memory_bounded(request: pytest.FixtureRequest, tmp_path: Path):
+    if not request.config.getoption("--slow"):
+        pytest.skip("slow test, run with --slow")
+    # GIVEN
+    small_db = create_persons_database(tmp_path / "small.db", 1_000)
+    large_db = create_persons_database(tmp_path / "large.db", 1_000_000)
+
+    # WHEN
+    small_lines, small_rss = export_peak_rss(small_db)
+    large_lines, large_rss = export_peak_rss(large_db)
+
+    # THEN
+    assert (small_lines, large_lines) == (1_000, 1_000_000)
+    # a buffered response of 1M rows takes gigabytes, streaming stays flat
+    assert large_rss - small_rss < 32 * 1024
@@ -0,0 +1,185 @@
+import asyncio
+import multiprocessing
+import time
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+from faker import Faker
+from fastapi import HTTPException
+from jose import jwt
+
+from server.core.context import Context
+from server.core.database import SessionIO, sessionio_maker
+from server.core.settings import get_settings
+from server.models.person_model import Person
+from server.models.user_model import User
+from server.repositories import person_repository, user_repository
+from server.resources.person_resource import UpdatePersonOptional
+from server.resources.user_resource import UpdateUserOptional
+from server.services import auth_service, person_service, user_service
+
+fake = Faker("pt_BR")
+Faker.seed(0)
+
+WORKERS = 3
+ROUNDS = 10
+# how long after a commit a worker may keep serving the previous row
+STALE_READ_BOUND = 0.0
+
+
+async def read(ctx: Context, person_id: int) -> tuple[str, int]:
+    person = await person_service.get_person(ctx, person_id=person_id)
+    return person.first_name, person_service.person_cache.hits
+
+
+async def write(ctx: Context, person_id: int, first_name: str):
+    await person_service.update_person_optional(
+        ctx,
+        person_id=person_id,
+        update_person=UpdatePersonOptional(first_name=first_name),  # type: ignore
+    )
+
+
+async def authenticate(ctx: Context, token: str) -> tuple[int, int]:
+    # the status the token gets, and how many requests the cache answered
+    try:
+        async for _ in auth_service.check_access_token(request=None, token=token):  # type: ignore[arg-type]
+            pass
+    except HTTPException as exc:
+        return exc.status_code, auth_service.principal_cache.hits
+    return 200, auth_service.principal_cache.hits
+
+
+async def deactivate(ctx: Context, user_id: int):
+    await user_service.update_user_optional(
+        ctx,
+        user_id=user_id,
+        update_user=UpdateUserOptional(active=False),  # type: ignore
+    )
+
+
+def worker(conn: Connection):
+    # a fresh interpreter importing the app, as a gunicorn worker does
+    commands: dict[str, Any] = {
+        "read": read,
+        "write": write,
+        "authenticate": authenticate,
+        "deactivate": deactivate,
+    }
+    loop = asyncio.new_event_loop()
+    session_maker = sessionio_maker()
+    while command := conn.recv():
+        name, *args = command
+        ctx = Context(session_maker=session_maker)
+        try:
+            conn.send(loop.run_until_complete(commands[name](ctx, *args)))
+        finally:
+            loop.run_until_complete(ctx.close())
+    loop.run_until_complete(session_maker.kw["bind"].dispose())
+    loop.close()
+
+
+@pytest.fixture
+def workers(
+    migrated_database_url: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[list[Connection], Any, Any]:
+    # spawned processes read their settings from the environment
+    monkeypatch.setenv("DB_URL", migrated_database_url)
+    monkeypatch.setenv("INVALIDATION_BUS_PATH", str(tmp_path / "bus"))
+    # the server code they run is measured here, pytest-cov would start
+    # coverage in each of them and leave their data files behind
+    monkeypatch.delenv("COV_CORE_DATAFILE", raising=False)
+    context = multiprocessing.get_context("spawn")
+    conns, processes = [], []
+    for _ in range(WORKERS):
+        conn, child = context.Pipe()
+        process = context.Process(target=worker, args=(child,), daemon=True)
+        process.start()
+        conns.append(conn)
+        processes.append(process)
+    yield conns
+    for conn, process in zip(conns, processes):
+        conn.send(None)
+        process.join(timeout=10)
+
+
+def call(conn: Connection, *command: Any) -> Any:
+    conn.send(command)
+    return conn.recv()
+
+
+@pytest.mark.asyncio
+async def test_no_stale_read_across_workers(
+    session: SessionIO, workers: list[Connection]
+):
+    # GIVEN
+    async with session.begin():
+        person = await person_repository.create(
+            session,
+            person=Person(first_name=fake.first_name(), last_name=fake.last_name()),
+        )
+    assert person.id
+    person_id = person.id
+    lags: list[float] = []
+
+    for idx in range(ROUNDS):
+        # every worker holds the current row in its own memory
+        for conn in workers:
+            _, hits = call(conn, "read", person_id)
+            assert call(conn, "read", person_id)[1] == hits + 1
+        first_name = fake.unique.first_name()
+
+        # WHEN
+        call(workers[idx % WORKERS], "write", person_id, first_name)
+        committed = time.monotonic()
+
+        # THEN
+        for conn in workers:
+            lag = 0.0
+            while call(conn, "read", person_id)[0] != first_name:
+                lag = time.monotonic() - committed
+                assert lag <= STALE_READ_BOUND + 5, "worker never saw the update"
+            lags.append(lag)
+
+    assert max(lags) <= STALE_READ_BOUND
+
+
+@pytest.mark.asyncio
+async def test_no_stale_principal_across_workers(
+    session: SessionIO, workers: list[Connection]
+):
+    # GIVEN
+    async with session.begin():
+        person = await person_repository.create(
+            session,
+            person=Person(first_name=fake.first_name(), last_name=fake.last_name()),
+        )
+        await session.flush()
+        user = await user_repository.create(
+            session,
+            user=User(
+                username=fake.unique.user_name(),
+                password=fake.password(20),
+                person_id=person.id,  # type: ignore[arg-type]
+            ),
+        )
+    assert user.id
+    settings = get_settings()
+    token = jwt.encode(
+        claims={"exp": time.time() + 60, "sub": user.username},
+        key=settings.token_secret_key,
+        algorithm=settings.token_algorithm,
+    )
+    # every worker holds the active principal in its own memory
+    for conn in workers:
+        _, hits = call(conn, "authenticate", token)
+        assert call(conn, "authenticate", token) == (200, hits + 1)
+
+    # WHEN
+    call(workers[0], "deactivate", user.id)
+
+    # THEN
+    # the next request on any worker already sees the deactivation
+    assert [call(conn, "authenticate", token)[0] for conn in workers] == [401] * WORKERS
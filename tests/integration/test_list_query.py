@@ -0,0 +1,263 @@
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+import pytest
+from faker import Faker
+from sqlalchemy import event, text
+
+from server.controllers.person_controller import person_query
+from server.controllers.user_controller import user_query
+from server.core.context import Context
+from server.core.database import SessionIO
+from server.core.query import ListQuery
+from server.models.person_model import Person
+from server.models.user_model import User
+from server.repositories import person_repository, user_repository
+from server.services import person_service, user_service
+
+fake = Faker("pt_BR")
+Faker.seed(0)
+
+SIZE = 1000
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SORTS = ("id", "createdAt", "updatedAt")
+
+
+async def create_rows(session: SessionIO) -> tuple[list[Person], list[User]]:
+    # a pair of rows an hour and few inactive users, so every filter is
+    # selective and the id settles the order of a pair
+    async with session.begin():
+        persons = await person_repository.create_many(
+            session,
+            persons=[
+                Person(
+                    first_name=fake.first_name(),
+                    last_name=f"{fake.last_name()} {idx}",
+                    created_at=START + timedelta(hours=idx - idx % 2),
+                    updated_at=START + timedelta(hours=SIZE - idx),
+                )
+                for idx in range(SIZE)
+            ],
+        )
+        users = [
+            User(
+                username=f"{fake.user_name()}{idx}",
+                password="x",
+                active=idx % 10 != 0,
+                person_id=person.id,  # type: ignore[arg-type]
+                created_at=START + timedelta(hours=idx),
+                updated_at=START + timedelta(hours=SIZE - idx),
+            )
+            for idx, person in enumerate(persons)
+        ]
+        session.add_all(users)
+    return list(persons), users
+
+
+async def analyze(session: SessionIO):
+    await session.exec(text("ANALYZE"))  # type: ignore[call-overload]
+    if session.bind.dialect.name == "postgresql":  # type: ignore[union-attr]
+        # a sequential scan is always possible, the question is whether an
+        # index scan is; SET LOCAL ends with the read transaction
+        await session.exec(text("SET LOCAL enable_seqscan = off"))  # type: ignore[call-overload]
+
+
+async def explain(session: SessionIO, run: Callable[[], Awaitable[Any]]) -> Any:
+    # the SELECT of the page as it was sent, explained with its parameters
+    sent: list[tuple[str, Any]] = []
+    engine = session.bind.sync_engine  # type: ignore[union-attr]
+
+    def before_cursor_execute(
+        conn: Any, cursor: Any, statement: str, params: Any, *args: Any
+    ):
+        sent.append((statement, params))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    [(statement, params)] = sent
+    conn = await session.connection()
+    if conn.dialect.name == "postgresql":
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", params
+        )
+        plan = result.scalar_one()
+        return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params)
+    return [row[3] for row in result.all()]
+
+
+def nodes(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    return [plan, *(node for child in plan.get("Plans", ()) for node in nodes(child))]
+
+
+def seeks(plan: Any, column: str) -> bool:
+    if isinstance(plan, dict):
+        return any(column in node.get("Index Cond", "") for node in nodes(plan))
+    return any(d.startswith("SEARCH") and f"({column}" in d for d in plan)
+
+
+def sorts(plan: Any) -> bool:
+    if isinstance(plan, dict):
+        return any(node["Node Type"] == "Sort" for node in nodes(plan))
+    return any("TEMP B-TREE" in d for d in plan)
+
+
+def text_filters(field: str, value: str) -> list[str]:
+    return [f"{field}:eq:{value}", f"{field}:prefix:{value[:4]}"]
+
+
+def range_filters(field: str) -> list[str]:
+    high = (START + timedelta(hours=SIZE - 10)).isoformat()
+    low = (START + timedelta(hours=10)).isoformat()
+    return [
+        f"{field}:gt:{high}",
+        f"{field}:gte:{high}",
+        f"{field}:lt:{low}",
+        f"{field}:lte:{low}",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_person_query_uses_indexes(session: SessionIO):
+    # GIVEN
+    persons, _ = await create_rows(session)
+    person = persons[SIZE - 10]
+    # every filter the whitelist allows, with the sort its index is read in
+    cases = {
+        "first_name": (text_filters("firstName", person.first_name), None),
+        "last_name": (text_filters("lastName", person.last_name), "lastName"),
+        "created_at": (range_filters("createdAt"), "createdAt"),
+        "updated_at": (range_filters("updatedAt"), "-updatedAt"),
+    }
+    await analyze(session)
+
+    # WHEN
+    filtered = {}
+    for column, (items, sort) in cases.items():
+        for item in items:
+            query = person_query.parse([item], sort)
+            plan = await explain(
+                session,
+                lambda: person_repository.get_all(session, limit=51, query=query),
+            )
+            filtered[item] = seeks(plan, column)
+    ordered = {}
+    for sort in (*SORTS, "lastName"):
+        for sort in (sort, f"-{sort}"):
+            query = person_query.parse(None, sort)
+            plan = await explain(
+                session,
+                lambda: person_repository.get_all(session, limit=51, query=query),
+            )
+            ordered[sort] = sorts(plan)
+
+    # THEN
+    assert filtered == dict.fromkeys(filtered, True)
+    assert ordered == dict.fromkeys(ordered, False)
+
+
+@pytest.mark.asyncio
+async def test_user_query_uses_indexes(session: SessionIO):
+    # GIVEN
+    _, users = await create_rows(session)
+    user = users[SIZE - 10]
+    cases = {
+        "username": (text_filters("username", user.username), None),
+        "active": (["active:eq:false"], None),
+        "created_at": (range_filters("createdAt"), "-createdAt"),
+        "updated_at": (range_filters("updatedAt"), "updatedAt"),
+    }
+    await analyze(session)
+
+    # WHEN
+    filtered = {}
+    for column, (items, sort) in cases.items():
+        for item in items:
+            query = user_query.parse([item], sort)
+            plan = await explain(
+                session,
+                lambda: user_repository.get_all(session, limit=51, query=query),
+            )
+            filtered[item] = seeks(plan, column)
+    ordered = {}
+    for sort in (*SORTS, "username"):
+        for sort in (sort, f"-{sort}"):
+            query = user_query.parse(None, sort)
+            plan = await explain(
+                session,
+                lambda: user_repository.get_all(session, limit=51, query=query),
+            )
+            ordered[sort] = sorts(plan)
+
+    # THEN
+    assert filtered == dict.fromkeys(filtered, True)
+    assert ordered == dict.fromkeys(ordered, False)
+
+
+async def read_pages(ctx: Context, query: ListQuery) -> list[int | None]:
+    ids: list[int | None] = []
+    cursor = None
+    while True:
+        page = await person_service.get_all_persons(
+            ctx, limit=7, cursor=cursor, query=query
+        )
+        ids += [p.id for p in page.items]
+        # every request has its own session, close the read transaction
+        await ctx.session.rollback()
+        if page.next is None:
+            return ids
+        cursor = page.next
+
+
+@pytest.mark.asyncio
+async def test_person_query_pages(session: SessionIO):
+    # GIVEN
+    persons, _ = await create_rows(session)
+    ctx = Context(session=session)
+    until = START + timedelta(hours=100)
+    # ids grow with created_at, and settle the order of a pair
+    newest = [p.id for p in reversed(persons[:100])]
+    prefix = persons[0].last_name[:2]
+    prefixed = [p.id for p in persons if p.last_name.startswith(prefix)]
+    await session.rollback()
+
+    # WHEN
+    newest_ids = await read_pages(
+        ctx, person_query.parse([f"createdAt:lt:{until.isoformat()}"], "-createdAt")
+    )
+    prefixed_ids = await read_pages(
+        ctx, person_query.parse([f"lastName:prefix:{prefix}"], None)
+    )
+
+    # THEN
+    # pairs of rows share a created_at, no row is skipped or read twice
+    assert newest_ids == newest
+    assert prefixed_ids == prefixed
+
+
+@pytest.mark.asyncio
+async def test_user_query_pages(session: SessionIO):
+    # GIVEN
+    _, users = await create_rows(session)
+    ctx = Context(session=session)
+    expected = [u.id for u in users if not u.active]
+    # read back as the database hands them, not as they were written
+    session.expunge_all()
+    query = user_query.parse(["active:eq:false"], "createdAt")
+
+    # WHEN
+    version = await user_service.get_all_users_version(ctx, limit=50, query=query)
+    page = await user_service.get_all_users(ctx, limit=50, query=query)
+    last = await user_service.get_all_users(
+        ctx, limit=50, cursor=page.next, query=query
+    )
+
+    # THEN
+    assert version == user_service.page_version(page)
+    assert [u.id for u in page.items] + [u.id for u in last.items] == expected
+    assert version[1:3] == (expected[0], expected[49])
+    assert last.next is None
@@ -0,0 +1,126 @@
+import sqlite3
+from pathlib import Path
+
+from tests.integration.conftest import migrate
+
+
+def test_person_name_unique_index_merges_duplicates(tmp_path: Path):
+    # GIVEN
+    database = tmp_path / "migrations.db"
+    migrate(f"sqlite+aiosqlite:///{database}", revision="17c06c7e7a3a")
+    with sqlite3.connect(database) as conn:
+        conn.executemany(
+            "INSERT INTO person (id, first_name, last_name, created_at, updated_at) "
+            "VALUES (?, ?, ?, datetime(), datetime())",
+            [(1, "Ana", "Silva"), (2, "Ana", "Silva"), (3, "Bia", "Souza")],
+        )
+        conn.executemany(
+            'INSERT INTO "user" (username, password, active, person_id, created_at, '
+            "updated_at) VALUES (?, 'x', 1, ?, datetime(), datetime())",
+            [("ana1", 1), ("ana2", 2), ("bia", 3)],
+        )
+
+    # WHEN
+    migrate(f"sqlite+aiosqlite:///{database}")
+
+    # THEN
+    with sqlite3.connect(database) as conn:
+        persons = conn.execute("SELECT id FROM person ORDER BY id").fetchall()
+        users = conn.execute(
+            'SELECT username, person_id FROM "user" ORDER BY username'
+        ).fetchall()
+        indexes = conn.execute("PRAGMA index_list(person)").fetchall()
+    assert persons == [(1,), (3,)]
+    assert users == [("ana1", 1), ("ana2", 1), ("bia", 3)]
+    assert ("ix_person_first_name_last_name", 1) in [(i[1], i[2]) for i in indexes]
+
+
+def test_row_version_starts_existing_rows(tmp_path: Path):
+    # GIVEN
+    database = tmp_path / "migrations.db"
+    migrate(f"sqlite+aiosqlite:///{database}", revision="6d2e9becc1ab")
+    with sqlite3.connect(database) as conn:
+        conn.execute(
+            "INSERT INTO person (id, first_name, last_name, created_at, updated_at) "
+            "VALUES (1, 'Ana', 'Silva', datetime(), datetime())"
+        )
+        conn.execute(
+            'INSERT INTO "user" (username, password, active, person_id, created_at, '
+            "updated_at) VALUES ('ana', 'x', 1, 1, datetime(), datetime())"
+        )
+
+    # WHEN
+    migrate(f"sqlite+aiosqlite:///{database}")
+
+    # THEN
+    with sqlite3.connect(database) as conn:
+        persons = conn.execute("SELECT version FROM person").fetchall()
+        users = conn.execute('SELECT version FROM "user"').fetchall()
+    assert persons == [(1,)]
+    assert users == [(1,)]
+
+
+def test_list_query_indexes(tmp_path: Path):
+    # GIVEN
+    database = tmp_path / "migrations.db"
+
+    # WHEN
+    migrate(f"sqlite+aiosqlite:///{database}")
+
+    # THEN
+    with sqlite3.connect(database) as conn:
+        indexes = {
+            table: [i[1] for i in conn.execute(f'PRAGMA index_list("{table}")')]
+            for table in ("person", "user")
+        }
+        columns = [
+            i[2] for i in conn.execute("PRAGMA index_info(ix_person_created_at_id)")
+        ]
+    assert {
+        "ix_person_last_name_id",
+        "ix_person_created_at_id",
+        "ix_person_updated_at_id",
+    } <= set(indexes["person"])
+    assert {
+        "ix_user_active_id",
+        "ix_user_created_at_id",
+        "ix_user_updated_at_id",
+    } <= set(indexes["user"])
+    assert columns == ["created_at", "id"]
+
+
+def test_sqlite_autoincrement_keeps_rows_and_ids(tmp_path: Path):
+    # GIVEN
+    database = tmp_path / "migrations.db"
+    migrate(f"sqlite+aiosqlite:///{database}", revision="c81f3a6d5e27")
+    with sqlite3.connect(database) as conn:
+        conn.executemany(
+            "INSERT INTO person (id, first_name, last_name, created_at, updated_at) "
+            "VALUES (?, ?, ?, datetime(), datetime())",
+            [(1, "Ana", "Silva"), (2, "Bia", "Souza")],
+        )
+        conn.execute(
+            'INSERT INTO "user" (username, password, active, person_id, created_at, '
+            "updated_at) VALUES ('ana', 'x', 1, 1, datetime(), datetime())"
+        )
+
+    # WHEN
+    migrate(f"sqlite+aiosqlite:///{database}")
+    with sqlite3.connect(database) as conn:
+        conn.execute("DELETE FROM person WHERE id = 2")
+        conn.execute(
+            "INSERT INTO person (first_name, last_name, created_at, updated_at) "
+            "VALUES ('Caio', 'Lima', datetime(), datetime())"
+        )
+
+    # THEN
+    with sqlite3.connect(database) as conn:
+        persons = conn.execute("SELECT id, first_name FROM person").fetchall()
+        users = conn.execute('SELECT username, person_id FROM "user"').fetchall()
+        indexes = [i[1] for i in conn.execute("PRAGMA index_list(person)")]
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'user'")
+    # the id of the deleted person is not handed out again
+    assert persons == [(1, "Ana"), (3, "Caio")]
+    assert users == [("ana", 1)]
+    assert {"ix_person_first_name_last_name", "ix_person_last_name_id"} <= set(indexes)
+    assert "AUTOINCREMENT" in sql.fetchone()[0]
@@ -0,0 +1,185 @@
+from typing import Any
+
+import pytest
+from faker import Faker
+
+from server.controllers.person_controller import person_query
+from server.core.context import Context
+from server.core.database import SessionIO
+from server.core.pagination import encode_cursor
+from server.core.query import ListQuery
+from server.models.person_model import Person
+from server.models.user_model import User
+from server.repositories import person_repository, user_repository
+from server.resources.person_resource import UpdatePersonOptional
+from server.services import person_service, user_service
+
+fake = Faker("pt_BR")
+Faker.seed(0)
+
+
+async def create_persons(session: SessionIO, size: int) -> list[int]:
+    async with session.begin():
+        persons = await person_repository.create_many(
+            session,
+            persons=[
+                Person(first_name=fake.first_name(), last_name=fake.unique.last_name())
+                for _ in range(size)
+            ],
+        )
+    return [person.id for person in persons]  # type: ignore
+
+
+async def create_users(session: SessionIO, size: int) -> list[int]:
+    person_ids = await create_persons(session, size)
+    async with session.begin():
+        for person_id in person_ids:
+            await user_repository.create(
+                session,
+                user=User(
+                    username=fake.unique.user_name(),
+                    password=fake.password(20),
+                    person_id=person_id,
+                ),
+            )
+    return person_ids
+
+
+async def persons_versions(
+    ctx: Context, limit: int, cursor: str | None = None, query: ListQuery = ListQuery()
+) -> tuple[Any, Any]:
+    sql = await person_service.get_all_persons_version(
+        ctx, limit=limit, cursor=cursor, query=query
+    )
+    page = await person_service.get_all_persons(
+        ctx, limit=limit, cursor=cursor, query=query
+    )
+    version = person_service.page_version(page)
+    # every request has its own session, close the read transaction
+    await ctx.session.rollback()
+    return sql, version
+
+
+async def users_versions(
+    ctx: Context, with_person: bool, cursor: str | None = None
+) -> tuple[Any, Any]:
+    sql = await user_service.get_all_users_version(
+        ctx, limit=2, cursor=cursor, with_person=with_person
+    )
+    page = await user_service.get_all_users(
+        ctx, limit=2, cursor=cursor, with_person=with_person
+    )
+    version = user_service.page_version(page, with_person=with_person)
+    await ctx.session.rollback()
+    return sql, version
+
+
+@pytest.mark.asyncio
+async def test_persons_version_matches_page(session: SessionIO):
+    # GIVEN
+    person_ids = await create_persons(session, 3)
+    ctx = Context(session=session)
+
+    # WHEN
+    full, full_page = await persons_versions(ctx, limit=3)
+    partial, partial_page = await persons_versions(ctx, limit=2)
+    cursor = encode_cursor((person_ids[1],))
+    last, last_page = await persons_versions(ctx, limit=2, cursor=cursor)
+
+    # THEN
+    assert full == full_page
+    assert full[:4] == (3, person_ids[0], person_ids[-1], sum(person_ids))
+    assert full[5] is False
+    assert partial == partial_page
+    assert partial[5] is True
+    assert last == last_page
+    assert last[:3] == (1, person_ids[-1], person_ids[-1])
+
+
+@pytest.mark.asyncio
+async def test_persons_version_follows_writes(session: SessionIO):
+    # GIVEN
+    person_ids = await create_persons(session, 3)
+    ctx = Context(session=session)
+    before, _ = await persons_versions(ctx, limit=2)
+
+    # WHEN
+    await person_service.update_person_optional(
+        ctx,
+        person_id=person_ids[0],
+        update_person=UpdatePersonOptional(first_name=fake.first_name()),  # type: ignore
+    )
+    updated, _ = await persons_versions(ctx, limit=2)
+    await person_service.delete_person(ctx, person_id=person_ids[1])
+    deleted, _ = await persons_versions(ctx, limit=2)
+
+    # THEN
+    assert updated[4] > before[4]
+    assert updated[:4] == before[:4]
+    # the page kept its size, but the next row moved into it
+    assert deleted[:3] == (2, person_ids[0], person_ids[2])
+
+
+@pytest.mark.asyncio
+async def test_persons_version_sorted_follows_writes(session: SessionIO):
+    # GIVEN
+    async with session.begin():
+        persons = await person_repository.create_many(
+            session,
+            persons=[
+                Person(first_name="Ana", last_name=last_name)
+                for last_name in ("Dias", "Costa", "Alves", "Barros", "Souza")
+            ],
+        )
+    dias, costa, alves, barros, souza = [p.id for p in persons]
+    ctx = Context(session=session)
+    query = person_query.parse(None, "lastName")
+    before, _ = await persons_versions(ctx, limit=3, query=query)
+
+    # WHEN
+    # a row below the highest id of the page leaves it and a lower one moves in
+    await person_service.delete_person(ctx, person_id=costa)  # type: ignore[arg-type]
+    deleted, deleted_page = await persons_versions(ctx, limit=3, query=query)
+    await person_service.update_person_optional(
+        ctx,
+        person_id=alves,  # type: ignore[arg-type]
+        update_person=UpdatePersonOptional(last_name="Zanetti"),  # type: ignore
+    )
+    renamed, renamed_page = await persons_versions(ctx, limit=3, query=query)
+
+    # THEN
+    assert before[1:3] == (alves, costa)
+    assert deleted == deleted_page
+    assert deleted[1:3] == (alves, dias)
+    assert deleted != before
+    assert renamed == renamed_page
+    assert renamed[1:3] == (barros, souza)
+    assert renamed != deleted
+
+
+@pytest.mark.asyncio
+async def test_users_version_matches_page(session: SessionIO):
+    # GIVEN
+    person_ids = await create_users(session, 3)
+    ctx = Context(session=session)
+
+    # WHEN
+    users, users_page = await users_versions(ctx, with_person=False)
+    await person_service.update_person_optional(
+        ctx,
+        person_id=person_ids[0],
+        update_person=UpdatePersonOptional(first_name=fake.first_name()),  # type: ignore
+    )
+    expanded, expanded_page = await users_versions(ctx, with_person=True)
+    users_page_2 = await users_versions(
+        ctx, with_person=False, cursor=encode_cursor((users[2],))
+    )
+
+    # THEN
+    assert users == users_page
+    assert expanded == expanded_page
+    assert expanded[:6] == users
+    assert users_page_2[0] == users_page_2[1]
+    assert users_page_2[0][0] == 1
+    # a person update only moves the version of the expanded page
+    assert expanded[6] > users[4]
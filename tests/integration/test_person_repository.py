@@ -0,0 +1,350 @@
+import asyncio
+import json
+
+import pytest
+from faker import Faker
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.orm.exc import StaleDataError
+
+from server.core.context import Context
+from server.core.database import SessionIO, sessionio_maker
+from server.core.fields import sparse_resource
+from server.core.handler import conflict_handler
+from server.core.mapper import to_resources
+from server.models.person_model import Person
+from server.repositories import person_repository
+from server.resources.person_resource import CreatePerson, UpdatePerson
+from server.services import person_service
+
+fake = Faker("pt_BR")
+Faker.seed(0)
+
+
+async def create_person(session: SessionIO) -> Person:
+    async with session.begin():
+        person = await person_repository.create(
+            session,
+            person=Person(first_name=fake.first_name(), last_name=fake.last_name()),
+        )
+    return person
+
+
+@pytest.mark.asyncio
+async def test_person_create_get_ok(session: SessionIO):
+    # GIVEN
+    person = await create_person(session)
+
+    # WHEN
+    res = await person_repository.get(session, pk=person.id)  # type: ignore
+
+    # THEN
+    assert res.id == person.id
+    assert res.first_name == person.first_name
+    assert res.last_name == person.last_name
+    assert res.created_at and res.updated_at
+
+
+@pytest.mark.asyncio
+async def test_person_create_many_ok(session: SessionIO):
+    # GIVEN
+    persons = [
+        Person(first_name=fake.first_name(), last_name=fake.last_name())
+        for _ in range(5)
+    ]
+
+    # WHEN
+    async with session.begin():
+        res = await person_repository.create_many(session, persons=persons)
+
+    # THEN
+    assert [(p.first_name, p.last_name) for p in res] == [
+        (p.first_name, p.last_name) for p in persons
+    ]
+    assert [p.id for p in res] == sorted(p.id for p in res)  # type: ignore
+    assert all(p.created_at and p.updated_at for p in res)
+    assert [p.id for p in await person_repository.get_all(session)] == [
+        p.id for p in res
+    ]
+
+
+@pytest.mark.asyncio
+async def test_person_get_all_ok(session: SessionIO):
+    # GIVEN
+    persons = [await create_person(session) for _ in range(3)]
+
+    # WHEN
+    res = await person_repository.get_all(session)
+
+    # THEN
+    assert [p.id for p in res] == [p.id for p in persons]
+
+
+@pytest.mark.asyncio
+async def test_person_get_all_keyset_ok(session: SessionIO):
+    # GIVEN
+    persons = [await create_person(session) for _ in range(5)]
+    context = Context(session=session)
+
+    # WHEN
+    pages = [await person_service.get_all_persons(context, limit=2)]
+    while pages[-1].next:
+        pages.append(
+            await person_service.get_all_persons(
+                context, limit=2, cursor=pages[-1].next
+            )
+        )
+
+    # THEN
+    assert [len(page.items) for page in pages] == [2, 2, 1]
+    assert [p.id for page in pages for p in page.items] == [p.id for p in persons]
+
+
+@pytest.mark.asyncio
+async def test_person_get_all_fields(session: SessionIO, statements: list[str]):
+    # GIVEN
+    persons = [await create_person(session) for _ in range(3)]
+    session.expunge_all()
+    statements.clear()
+    context = Context(session=session)
+
+    # WHEN
+    page = await person_service.get_all_persons(
+        context, limit=2, fields=("first_name",)
+    )
+    data = to_resources(sparse_resource(Person, ("first_name",)), page.items)
+
+    # THEN
+    assert [d.first_name for d in data] == [p.first_name for p in persons[:2]]
+    assert page.next
+    assert person_service.page_version(page)[:3] == (2, persons[0].id, persons[1].id)
+    # the rows carry what the page needs and nothing else
+    select_list = statements[0].split(" FROM ")[0]
+    assert "first_name" in select_list and "updated_at" in select_list
+    assert "last_name" not in select_list and "created_at" not in select_list
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_person_update_ok(session: SessionIO, statements: list[str]):
+    # GIVEN
+    person = await create_person(session)
+    first_name = fake.first_name()
+    statements.clear()
+
+    # WHEN
+    async with session.begin():
+        res = await person_repository.update(
+            session,
+            pk=person.id,  # type: ignore
+            first_name=first_name,
+        )
+
+    # THEN
+    assert res.first_name == first_name
+    assert res.last_name == person.last_name
+    assert res.updated_at >= person.updated_at  # type: ignore
+    assert [s.split()[0] for s in statements] == ["UPDATE"]
+
+
+@pytest.mark.asyncio
+async def test_person_update_not_found(session: SessionIO):
+    # WHEN
+    with pytest.raises(NoResultFound):
+        async with session.begin():
+            await person_repository.update(session, pk=999999, first_name="x")
+    with pytest.raises(NoResultFound):
+        async with session.begin():
+            await person_repository.update(
+                session, pk=999999, versions=[1], first_name="x"
+            )
+
+
+@pytest.mark.asyncio
+async def test_person_update_version(session: SessionIO, statements: list[str]):
+    # GIVEN
+    person = await create_person(session)
+    person_id = person.id
+    assert person_id and person.version == 1
+    statements.clear()
+
+    # WHEN
+    async with session.begin():
+        res = await person_repository.update(
+            session, pk=person_id, versions=[1], first_name=fake.first_name()
+        )
+        version = res.version
+    updated = list(statements)
+    with pytest.raises(StaleDataError):
+        async with session.begin():
+            await person_repository.update(
+                session, pk=person_id, versions=[1], first_name=fake.first_name()
+            )
+
+    # THEN
+    assert version == 2
+    # checked and bumped by the UPDATE itself
+    assert [s.split()[0] for s in updated] == ["UPDATE"]
+    assert (await person_repository.get(session, pk=person_id)).version == 2
+
+
+@pytest.mark.asyncio
+async def test_person_update_concurrent(session: SessionIO):
+    # GIVEN
+    person = await create_person(session)
+    person_id = person.id
+    assert person_id
+    session_local = sessionio_maker()
+
+    async def edit() -> int:
+        # every writer read the first version
+        async with session_local() as other_session:
+            async with other_session.begin():
+                person = await person_repository.update(
+                    other_session,
+                    pk=person_id,
+                    versions=[1],
+                    first_name=fake.unique.first_name(),
+                )
+        return person.version  # type: ignore
+
+    # WHEN
+    res = await asyncio.gather(*[edit() for _ in range(5)], return_exceptions=True)
+
+    # THEN
+    assert [r for r in res if not isinstance(r, StaleDataError)] == [2]
+
+
+@pytest.mark.asyncio
+async def test_person_delete_ok(session: SessionIO, statements: list[str]):
+    # GIVEN
+    person = await create_person(session)
+    statements.clear()
+
+    # WHEN
+    async with session.begin():
+        await person_repository.delete(session, pk=person.id)  # type: ignore
+
+    # THEN
+    assert [s.split()[0] for s in statements] == ["DELETE"]
+    with pytest.raises(NoResultFound):
+        await person_repository.get(session, pk=person.id)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_person_delete_not_found(session: SessionIO):
+    # WHEN
+    with pytest.raises(NoResultFound):
+        async with session.begin():
+            await person_repository.delete(session, pk=999999)
+
+
+@pytest.mark.asyncio
+async def test_person_delete_many_ok(session: SessionIO, statements: list[str]):
+    # GIVEN
+    persons = [await create_person(session) for _ in range(3)]
+    statements.clear()
+
+    # WHEN
+    async with session.begin():
+        res = await person_repository.delete_many(
+            session,
+            pks=[persons[0].id, persons[2].id, 999999],  # type: ignore
+        )
+
+    # THEN
+    assert sorted(res) == [persons[0].id, persons[2].id]
+    assert [s.split()[0] for s in statements] == ["DELETE"]
+    assert [p.id for p in await person_repository.get_all(session)] == [persons[1].id]
+
+
+@pytest.mark.asyncio
+async def test_person_get_or_create_ok(session: SessionIO):
+    # GIVEN
+    person = await create_person(session)
+
+    # WHEN
+    async with session.begin():
+        res = await person_repository.get_or_create(
+            session,
+            person=Person(first_name=person.first_name, last_name=person.last_name),
+        )
+
+    # THEN
+    assert res.id == person.id
+
+
+@pytest.mark.asyncio
+async def test_person_get_or_create_new(session: SessionIO, statements: list[str]):
+    # GIVEN
+    person = Person(first_name=fake.first_name(), last_name=fake.last_name())
+
+    # WHEN
+    async with session.begin():
+        res = await person_repository.get_or_create(session, person=person)
+
+    # THEN
+    assert res.id
+    assert res.created_at
+    assert (res.first_name, res.last_name) == (person.first_name, person.last_name)
+    assert len(statements) == 1
+    assert "ON CONFLICT" in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_person_get_or_create_concurrent(session: SessionIO):
+    # GIVEN
+    session_local = sessionio_maker()
+    first_name, last_name = fake.first_name(), fake.last_name()
+
+    async def signup() -> int:
+        async with session_local() as other_session:
+            async with other_session.begin():
+                person = await person_repository.get_or_create(
+                    other_session,
+                    person=Person(first_name=first_name, last_name=last_name),
+                )
+        return person.id  # type: ignore
+
+    # WHEN
+    ids = await asyncio.gather(*[signup() for _ in range(5)])
+
+    # THEN
+    assert len(set(ids)) == 1
+    res = await person_repository.get_all(
+        session, first_name=first_name, last_name=last_name
+    )
+    assert [p.id for p in res] == ids[:1]
+
+
+@pytest.mark.asyncio
+async def test_person_duplicate_name_conflict(session: SessionIO):
+    # GIVEN
+    person, other = await create_person(session), await create_person(session)
+    ctx = Context(session=session)
+    name = CreatePerson(first_name=person.first_name, last_name=person.last_name)
+    # a failed write rolls back and expires the loaded rows
+    other_id: int = other.id  # type: ignore[assignment]
+    writes = [
+        lambda: person_service.create_person(ctx, create_person=name),
+        lambda: person_service.create_persons(
+            ctx, create_persons=[name.model_copy(update={"last_name": "X"})] * 2
+        ),
+        lambda: person_service.update_person(
+            ctx,
+            person_id=other_id,
+            update_person=UpdatePerson(**name.model_dump()),
+        ),
+    ]
+
+    # WHEN
+    responses = []
+    for write in writes:
+        with pytest.raises(IntegrityError) as exc_info:
+            await write()
+        responses.append(await conflict_handler(None, exc_info.value))  # type: ignore
+
+    # THEN
+    # the same 409 on sqlite and postgresql, without the statement
+    assert [(r.status_code, json.loads(r.body)) for r in responses] == [
+        (409, {"errors": [{"message": "resource already exists"}]})
+    ] * 3
@@ -0,0 +1,71 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from faker import Faker
+
+from server.core.context import Context
+from server.core.database import SessionIO, sessionio_maker
+from server.resources.person_resource import CreatePerson
+from server.services import person_service
+
+fake = Faker("pt_BR")
+Faker.seed(0)
+
+
+@pytest.mark.asyncio
+async def test_get_all_persons_concurrent_single_select(
+    session: SessionIO, statements: list[str]
+):
+    # GIVEN
+    session_maker = sessionio_maker()
+    contexts = [Context(session_maker=session_maker) for _ in range(10)]
+
+    # WHEN
+    pages = await asyncio.gather(
+        *(person_service.get_all_persons(ctx, limit=50) for ctx in contexts)
+    )
+
+    # THEN
+    assert [s.split()[0] for s in statements] == ["SELECT"]
+    assert all(page is pages[0] for page in pages)
+    # only the context that ran the query opened a session
+    assert sum(ctx._session is not None for ctx in contexts) == 1
+    for ctx in contexts:
+        await ctx.close()
+
+
+@pytest.mark.asyncio
+async def test_get_all_persons_after_commit_does_not_join(session: SessionIO):
+    # GIVEN
+    ctx = Context(session_maker=sessionio_maker())
+    release = asyncio.Event()
+    get_all = person_service.person_repository.get_all
+
+    async def slow_get_all(*args, **kwargs):
+        # the first list read is still running when the write commits
+        rows = await get_all(*args, **kwargs)
+        await release.wait()
+        return rows
+
+    with patch.object(person_service.person_repository, "get_all", slow_get_all):
+        before = asyncio.create_task(person_service.get_all_persons(ctx, limit=50))
+        await asyncio.sleep(0.1)
+
+        # WHEN
+        person = await person_service.create_person(
+            Context(session=session),
+            CreatePerson(first_name=fake.first_name(), last_name=fake.last_name()),
+        )
+        after = asyncio.create_task(
+            person_service.get_all_persons(Context(session=session), limit=50)
+        )
+        await asyncio.sleep(0.1)
+        release.set()
+        before_ids = [p.id for p in (await before).items]
+        after_ids = [p.id for p in (await after).items]
+    await ctx.close()
+
+    # THEN
+    assert person.id not in before_ids
+    assert person.id in after_ids
@@ -0,0 +1,192 @@
+import pytest
+from faker import Faker
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.orm.exc import StaleDataError
+
+from server.core.database import SessionIO
+from server.models.person_model import Person
+from server.models.user_model import User
+from server.repositories import person_repository, user_repository
+from server.resources.user_resource import UserPerson
+
+fake = Faker("pt_BR")
+Faker.seed(0)
+
+
+async def create_user(session: SessionIO, username: str | None = None) -> User:
+    async with session.begin():
+        person = await person_repository.create(
+            session,
+            person=Person(first_name=fake.first_name(), last_name=fake.last_name()),
+        )
+        await session.flush()
+        user = await user_repository.create(
+            session,
+            user=User(
+                username=username or fake.unique.user_name(),
+                password=fake.password(20),
+                person_id=person.id,  # type: ignore
+            ),
+        )
+    return user
+
+
+@pytest.mark.asyncio
+async def test_user_create_get_ok(session: SessionIO):
+    # GIVEN
+    user = await create_user(session)
+
+    # WHEN
+    res = await user_repository.get(session, pk=user.id)  # type: ignore
+
+    # THEN
+    assert res.id == user.id
+    assert res.username == user.username
+    assert res.active is True
+
+
+@pytest.mark.asyncio
+async def test_user_get_all_filter_ok(session: SessionIO):
+    # GIVEN
+    user = await create_user(session)
+    await create_user(session)
+
+    # WHEN
+    res = await user_repository.get_all(
+        session, limit=1, username=user.username, active=True
+    )
+
+    # THEN
+    assert [u.id for u in res] == [user.id]
+
+
+@pytest.mark.asyncio
+async def test_user_get_all_after_ok(session: SessionIO):
+    # GIVEN
+    users = [await create_user(session) for _ in range(3)]
+
+    # WHEN
+    res = await user_repository.get_all(session, limit=2, after=(users[0].id,))
+
+    # THEN
+    assert [u.id for u in res] == [u.id for u in users[1:]]
+
+
+@pytest.mark.asyncio
+async def test_user_get_with_person_one_query(
+    session: SessionIO, statements: list[str]
+):
+    # GIVEN
+    user = await create_user(session)
+    session.expunge_all()
+    statements.clear()
+
+    # WHEN
+    res = await user_repository.get(session, pk=user.id, with_person=True)  # type: ignore
+    data = UserPerson.model_validate(res, from_attributes=True)
+
+    # THEN
+    assert data.person.id == user.person_id
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_get_all_with_person_no_n_plus_one(
+    session: SessionIO, statements: list[str]
+):
+    # GIVEN
+    users = [await create_user(session) for _ in range(5)]
+    session.expunge_all()
+    statements.clear()
+
+    # WHEN
+    res = await user_repository.get_all(session, with_person=True)
+    data = [UserPerson.model_validate(u, from_attributes=True) for u in res]
+
+    # THEN
+    assert [u.person.id for u in data] == [u.person_id for u in users]
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_get_all_columns_with_person(
+    session: SessionIO, statements: list[str]
+):
+    # GIVEN
+    users = [await create_user(session) for _ in range(2)]
+    expected = [(u.username, u.person_id) for u in users]
+    session.expunge_all()
+    statements.clear()
+
+    # WHEN
+    res = await user_repository.get_all(
+        session, with_person=True, columns=["id", "username"]
+    )
+    data = [(u.username, u.person.id) for u in res]
+
+    # THEN
+    assert data == expected
+    select_list = statements[0].split(" FROM ")[0]
+    assert "password" not in select_list and "active" not in select_list
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_username_unique(session: SessionIO):
+    # GIVEN
+    user = await create_user(session)
+
+    # WHEN
+    with pytest.raises(IntegrityError):
+        await create_user(session, username=user.username)
+
+
+@pytest.mark.asyncio
+async def test_user_update_not_found(session: SessionIO):
+    # WHEN
+    with pytest.raises(NoResultFound):
+        async with session.begin():
+            await user_repository.update(session, pk=999999, active=False)
+
+
+@pytest.mark.asyncio
+async def test_user_update_version(session: SessionIO):
+    # GIVEN
+    user = await create_user(session)
+    user_id = user.id
+    assert user_id
+
+    # WHEN
+    async with session.begin():
+        res = await user_repository.update(
+            session, pk=user_id, versions=[1], active=False
+        )
+        version = res.version
+    with pytest.raises(StaleDataError):
+        async with session.begin():
+            await user_repository.update(session, pk=user_id, versions=[1], active=True)
+
+    # THEN
+    assert version == 2
+    assert (await user_repository.get(session, pk=user_id)).active is False
+
+
+@pytest.mark.asyncio
+async def test_user_update_delete_ok(session: SessionIO):
+    # GIVEN
+    user = await create_user(session)
+
+    # WHEN
+    async with session.begin():
+        res = await user_repository.update(
+            session,
+            pk=user.id,  # type: ignore
+            active=False,
+        )
+    async with session.begin():
+        await user_repository.delete(session, pk=user.id)  # type: ignore
+
+    # THEN
+    assert res.active is False
+    with pytest.raises(NoResultFound):
+        await user_repository.get(session, pk=user.id)  # type: ignore
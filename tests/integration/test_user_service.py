@@ -0,0 +1,126 @@
+from typing import Any
+
+import pytest
+from faker import Faker
+
+from server.core.context import Context
+from server.core.crypt import get_crypt
+from server.core.database import SessionIO
+from server.core.exceptions import BusinessError
+from server.repositories import user_repository
+from server.resources.user_resource import CreateUserPerson, UpdateUserPassword
+from server.services import user_service
+
+fake = Faker("pt_BR")
+Faker.seed(0)
+
+
+@pytest.mark.asyncio
+async def test_create_user_person_single_commit(
+    session: SessionIO, statements: list[str], commits: list[Any]
+):
+    # GIVEN
+    password = fake.password(10)
+    create_user = CreateUserPerson(
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        username=fake.unique.user_name(),
+        password=password,
+        password_check=password,
+    )
+
+    # WHEN
+    user = await user_service.create_user_person(
+        Context(session=session), user_person_create=create_user
+    )
+
+    # THEN
+    assert user.id and user.person_id
+    assert len(commits) == 1
+    assert [s.split()[0] for s in statements] == ["INSERT", "INSERT"]
+
+
+@pytest.mark.asyncio
+async def test_get_user_with_person_single_select(
+    session: SessionIO, statements: list[str]
+):
+    # GIVEN
+    password = fake.password(10)
+    ctx = Context(session=session)
+    created = await user_service.create_user_person(
+        ctx,
+        user_person_create=CreateUserPerson(
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            username=fake.unique.user_name(),
+            password=password,
+            password_check=password,
+        ),
+    )
+    user_id: int = created.id  # type: ignore[assignment]
+    session.expunge_all()
+    statements.clear()
+
+    # WHEN
+    user = await user_service.get_user(ctx, user_id=user_id, with_person=True)
+    cold = list(statements)
+    statements.clear()
+    again = await user_service.get_user(ctx, user_id=user_id, with_person=True)
+    await user_service.get_user(ctx, user_id=user_id, with_person=True)
+
+    # THEN
+    # the miss reads the pair in one JOIN, the cached user then only reads
+    # the person once, into its own cache
+    assert [s.split()[0] for s in cold] == ["SELECT"]
+    assert "JOIN person" in cold[0]
+    assert [s.split()[0] for s in statements] == ["SELECT"]
+    assert again == user
+    assert user.person.id == created.person_id  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_change_password(session: SessionIO):
+    # GIVEN
+    password = fake.password(10)
+    new_password = fake.password(10)
+    ctx = Context(session=session)
+    created = await user_service.create_user_person(
+        ctx,
+        user_person_create=CreateUserPerson(
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            username=fake.unique.user_name(),
+            password=password,
+            password_check=password,
+        ),
+    )
+    user_id: int = created.id  # type: ignore[assignment]
+
+    # WHEN
+    with pytest.raises(BusinessError):
+        await user_service.change_password(
+            ctx,
+            user_id=user_id,
+            update_password=UpdateUserPassword(
+                current_password=new_password,
+                new_password=new_password,
+                new_password_check=new_password,
+            ),
+        )
+    user = await user_service.change_password(
+        ctx,
+        user_id=user_id,
+        update_password=UpdateUserPassword(
+            current_password=password,
+            new_password=new_password,
+            new_password_check=new_password,
+        ),
+    )
+
+    # THEN
+    # the read did not leave a transaction open for the update to trip on
+    assert not session.in_transaction()
+    async with session.begin():
+        stored = await user_repository.get(session, pk=user_id)
+    assert stored.password == user.password
+    assert get_crypt().check_password(new_password, stored.password)
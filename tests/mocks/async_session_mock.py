@@ -58,12 +58,34 @@ class SessionIOMock:
         self._exec_kwargs = kwargs
         return self
 
+    def scalars(self: Self) -> Self:
+        self._scalars_count = getattr(self, "_scalars_count", 0) + 1
+        return self
+
+    @property
+    def rowcount(self: Self) -> int:
+        if self._side_effect:
+            raise self._side_effect
+        return self._return_value
+
     def one(self: Self) -> Any:
         self._one_count = getattr(self, "_one_count", 0) + 1
         if self._side_effect:
             raise self._side_effect
         return self._return_value
 
+    def one_or_none(self: Self) -> Any:
+        self._one_or_none_count = getattr(self, "_one_or_none_count", 0) + 1
+        if self._side_effect:
+            raise self._side_effect
+        return self._return_value
+
+    def first(self: Self) -> Any:
+        self._first_count = getattr(self, "_first_count", 0) + 1
+        if self._side_effect:
+            raise self._side_effect
+        return self._return_value
+
     def all(self: Self) -> Sequence[Any]:
         self._all_count = getattr(self, "_all_count", 0) + 1
         if self._side_effect:
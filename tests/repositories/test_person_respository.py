@@ -1,8 +1,9 @@
-from copy import copy
-from typing import cast
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from faker import Faker
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.exc import IntegrityError, NoResultFound
 
 from server.models.person_model import Person
@@ -50,6 +51,32 @@ async def test_person_get_by_pk_not_found():
     assert error_message in str(exc_info.value)
 
 
+@pytest.mark.asyncio
+async def test_person_create_many_ok():
+    # GIVEN
+    persons = [
+        Person(first_name=fake.first_name(), last_name=fake.last_name())
+        for _ in range(3)
+    ]
+
+    # MOCK
+    persons_mock = [
+        Person(id=idx + 1, first_name=p.first_name, last_name=p.last_name)
+        for idx, p in enumerate(persons)
+    ]
+    session_mock = SessionIOMock.cast(return_value=persons_mock)
+
+    # WHEN
+    res = await person_repository.create_many(session=session_mock, persons=persons)
+
+    # THEN
+    assert res == persons_mock
+    assert getattr(session_mock, "_scalars_count") == 1
+    assert getattr(session_mock, "_exec_kwargs")["params"] == [
+        {"first_name": p.first_name, "last_name": p.last_name} for p in persons
+    ]
+
+
 @pytest.mark.asyncio
 async def test_person_get_all_ok():
     # MOCK
@@ -115,11 +142,12 @@ async def test_person_update_ok():
         first_name=fake.first_name(),
         last_name=fake.last_name(),
     )
-    session_mock = SessionIOMock.cast(return_value=copy(mock_person))
-
     # GIVEN
     person_id = mock_person.id
     first_name = fake.first_name()
+    session_mock = SessionIOMock.cast(
+        return_value=mock_person.model_copy(update={"first_name": first_name})
+    )
 
     # WHEN
     person_updated = await person_repository.update(
@@ -129,6 +157,9 @@ async def test_person_update_ok():
     # THEN
     assert person_updated.id == person_id
     assert person_updated.first_name == first_name
+    statement = str(getattr(session_mock, "_exec_args")[0])
+    assert statement.startswith("UPDATE person")
+    assert "RETURNING" in statement
 
 
 @pytest.mark.asyncio
@@ -157,22 +188,50 @@ async def test_person_update_error():
 
 @pytest.mark.asyncio
 async def test_person_delete_ok():
+    # GIVEN
+    person_id = fake.random_int(min=1, max=10)
+
     # MOCK
-    mock_person = Person(
-        id=fake.random_int(min=1, max=10),
-        first_name=fake.first_name(),
-        last_name=fake.last_name(),
-    )
-    session_mock = SessionIOMock(return_value=mock_person)
+    session_mock = SessionIOMock(return_value=1)
+
+    # WHEN
+    await person_repository.delete(session=cast(SessionIO, session_mock), pk=person_id)
+
+    # THEN
+    assert session_mock._exec_count == 1
+    assert str(session_mock._exec_args[0]).startswith("DELETE FROM person")
 
+
+@pytest.mark.asyncio
+async def test_person_delete_not_found():
     # GIVEN
-    person_id = mock_person.id
+    person_id = 9999
+
+    # MOCK
+    session_mock = SessionIOMock.cast(return_value=0)
 
     # WHEN
-    await person_repository.delete(session=cast(SessionIO, session_mock), pk=person_id)
+    with pytest.raises(NoResultFound):
+        await person_repository.delete(session=session_mock, pk=person_id)
+
+
+@pytest.mark.asyncio
+async def test_person_delete_many_ok():
+    # GIVEN
+    person_ids = [1, 2, 3]
+
+    # MOCK
+    session_mock = SessionIOMock(return_value=person_ids[:2])
+
+    # WHEN
+    res = await person_repository.delete_many(
+        session=cast(SessionIO, session_mock), pks=person_ids
+    )
 
     # THEN
-    assert session_mock._delete_count == 1
+    assert res == person_ids[:2]
+    assert session_mock._exec_count == 1
+    assert "RETURNING person.id" in str(session_mock._exec_args[0])
 
 
 @pytest.mark.asyncio
@@ -196,6 +255,13 @@ async def test_person_delete_error():
     assert error_message in str(exc_info.value)
 
 
+def session_upsert_mock(*results: Any) -> SessionIO:
+    session_mock = MagicMock()
+    session_mock.bind.dialect.name = "sqlite"
+    session_mock.exec = AsyncMock(side_effect=results)
+    return cast(SessionIO, session_mock)
+
+
 @pytest.mark.asyncio
 async def test_person_get_or_create_ok_01():
     # MOCK
@@ -204,7 +270,11 @@ async def test_person_get_or_create_ok_01():
         first_name=fake.first_name(),
         last_name=fake.last_name(),
     )
-    session_mock = SessionIOMock.cast(return_value=[person_mock])
+    upsert_mock = MagicMock()
+    upsert_mock.scalars.return_value.one_or_none.return_value = None
+    select_mock = MagicMock()
+    select_mock.one.return_value = person_mock
+    session_mock = session_upsert_mock(upsert_mock, select_mock)
 
     # GIVEN
     person = Person(
@@ -219,23 +289,33 @@ async def test_person_get_or_create_ok_01():
     assert res.id == person_mock.id
     assert res.first_name == person_mock.first_name
     assert res.last_name == person_mock.last_name
+    upsert = cast(AsyncMock, session_mock.exec).await_args_list[0].args[0]
+    assert "ON CONFLICT (first_name, last_name) DO NOTHING" in str(
+        upsert.compile(dialect=sqlite.dialect())
+    )
 
 
 @pytest.mark.asyncio
 async def test_person_get_or_create_ok_02():
-    # MOCK
-    session_mock = SessionIOMock.cast(return_value=[])
-
     # GIVEN
     person = Person(
         first_name=fake.first_name(),
         last_name=fake.last_name(),
     )
 
+    # MOCK
+    person_mock = Person(
+        id=fake.random_int(min=1, max=999),
+        first_name=person.first_name,
+        last_name=person.last_name,
+    )
+    upsert_mock = MagicMock()
+    upsert_mock.scalars.return_value.one_or_none.return_value = person_mock
+    session_mock = session_upsert_mock(upsert_mock)
+
     # WHEN
     res = await person_repository.get_or_create(session=session_mock, person=person)
 
     # THEN
-    assert isinstance(res.id, int)
-    assert res.first_name == person.first_name
-    assert res.last_name == person.last_name
+    assert res is person_mock
+    assert cast(AsyncMock, session_mock.exec).await_count == 1
@@ -1,4 +1,3 @@
-from copy import copy
 from typing import cast
 
 import pytest
@@ -37,6 +36,23 @@ async def test_user_get_by_pk_ok():
     assert res.password and isinstance(res.password, str)
 
 
+@pytest.mark.asyncio
+async def test_user_get_by_pk_with_person():
+    # GIVEN
+    user_id = fake.random_int(min=1, max=999)
+
+    # MOCK
+    session_mock = SessionIOMock(return_value=None)
+
+    # WHEN
+    await user_repository.get(
+        session=cast(SessionIO, session_mock), pk=user_id, with_person=True
+    )
+
+    # THEN
+    assert "JOIN person" in str(session_mock._exec_args[0])
+
+
 @pytest.mark.asyncio
 async def test_user_get_by_pk_not_found():
     # GIVEN
@@ -133,11 +149,12 @@ async def test_user_update_ok():
         password=crypt.hash_password(fake.password(digits=8)),
         person_id=fake.random_int(min=1, max=999),
     )
-    session_mock = SessionIOMock.cast(return_value=copy(mock_user))
-
     # GIVEN
     user_id = mock_user.id
     username = fake.user_name()
+    session_mock = SessionIOMock.cast(
+        return_value=mock_user.model_copy(update={"username": username})
+    )
 
     # WHEN
     user_updated = await user_repository.update(
@@ -147,6 +164,9 @@ async def test_user_update_ok():
     # THEN
     assert user_updated.id == user_id
     assert user_updated.username == username
+    statement = str(getattr(session_mock, "_exec_args")[0])
+    assert statement.startswith('UPDATE "user"')
+    assert "RETURNING" in statement
 
 
 @pytest.mark.asyncio
@@ -175,23 +195,31 @@ async def test_user_update_error():
 
 @pytest.mark.asyncio
 async def test_user_delete_ok():
-    # MOCK
-    mock_user = User(
-        id=fake.random_int(min=1, max=10),
-        username=fake.user_name(),
-        password=crypt.hash_password(fake.password(digits=8)),
-        person_id=fake.random_int(min=1, max=999),
-    )
-    session_mock = SessionIOMock(return_value=mock_user)
-
     # GIVEN
-    user_id = mock_user.id
+    user_id = fake.random_int(min=1, max=10)
+
+    # MOCK
+    session_mock = SessionIOMock(return_value=1)
 
     # WHEN
     await user_repository.delete(session=cast(SessionIO, session_mock), pk=user_id)
 
     # THEN
-    assert session_mock._delete_count == 1
+    assert session_mock._exec_count == 1
+    assert str(session_mock._exec_args[0]).startswith('DELETE FROM "user"')
+
+
+@pytest.mark.asyncio
+async def test_user_delete_not_found():
+    # GIVEN
+    user_id = 9999
+
+    # MOCK
+    session_mock = SessionIOMock.cast(return_value=0)
+
+    # WHEN
+    with pytest.raises(NoResultFound):
+        await user_repository.delete(session=session_mock, pk=user_id)
 
 
 @pytest.mark.asyncio
@@ -4,11 +4,20 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from faker import Faker
 from fastapi import HTTPException, Request
+from jose import jwt
 
 from server.core.context import Context
 from server.models.user_model import User
 from server.resources.token_resource import Token
-from server.services.auth_service import authenticate_user, check_access_token, crypt
+from server.services.auth_service import (
+    authenticate_user,
+    bus,
+    check_access_token,
+    crypt,
+    invalidate_principal,
+    principal_cache,
+    settings,
+)
 from tests.mocks.context_mock import ContextMock
 
 fake = Faker("pt_BR")
@@ -32,6 +41,7 @@ async def token_mock(user_repository_mock: AsyncMock) -> Token:
             person_id=fake.pyint(1, 999),
             created_at=fake.date_time(),
             updated_at=fake.date_time(),
+            version=1,
         )
     ]
     context_mock = ContextMock.context_session_mock()
@@ -58,6 +68,7 @@ async def test_authenticate_user_ok(user_repository_mock: AsyncMock):
             person_id=fake.pyint(1, 999),
             created_at=fake.date_time(),
             updated_at=fake.date_time(),
+            version=1,
         )
     ]
     context_mock = ContextMock.context_session_mock()
@@ -110,6 +121,7 @@ async def test_authenticate_user_error_password_invalid(
             person_id=fake.pyint(1, 999),
             created_at=fake.date_time(),
             updated_at=fake.date_time(),
+            version=1,
         )
     ]
     context_mock = ContextMock.context_session_mock()
@@ -142,6 +154,7 @@ async def test_check_access_token_ok(
             person_id=fake.pyint(1, 999),
             created_at=fake.date_time(),
             updated_at=fake.date_time(),
+            version=1,
         )
     ]
     user_repository_mock.get_all.return_value = users_mock
@@ -192,3 +205,177 @@ async def test_check_access_token_invalid(user_repository_mock: AsyncMock):
 
     # THEN
     assert "Could not validate credentials" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+@patch("server.services.auth_service.user_repository", new_callable=AsyncMock)
+async def test_check_access_token_cached(
+    user_repository_mock: AsyncMock, token_mock: Token
+):
+    # MOCK
+    request_mock = cast(Request, RequestMock())
+    users_mock = [
+        User(
+            id=1,
+            username="abc.xyz",
+            password=fake.password(20),
+            person_id=fake.pyint(1, 999),
+            created_at=fake.date_time(),
+            updated_at=fake.date_time(),
+            version=1,
+        )
+    ]
+    user_repository_mock.get_all.return_value = users_mock
+
+    # WHEN
+    for _ in range(3):
+        async for context in check_access_token(
+            request=request_mock, token=token_mock.access_token
+        ):
+            assert context.user.username == "abc.xyz"
+
+    # THEN
+    assert user_repository_mock.get_all.await_count == 1
+    assert principal_cache.hits == 2
+    assert principal_cache.misses == 1
+
+
+@pytest.mark.asyncio
+@patch("server.services.auth_service.user_repository", new_callable=AsyncMock)
+async def test_check_access_token_invalidated(
+    user_repository_mock: AsyncMock, token_mock: Token
+):
+    # MOCK
+    request_mock = cast(Request, RequestMock())
+    users_mock = [
+        User(
+            id=1,
+            username="abc.xyz",
+            password=fake.password(20),
+            person_id=fake.pyint(1, 999),
+            created_at=fake.date_time(),
+            updated_at=fake.date_time(),
+            version=1,
+        )
+    ]
+    user_repository_mock.get_all.return_value = users_mock
+    async for context in check_access_token(
+        request=request_mock, token=token_mock.access_token
+    ):
+        assert isinstance(context, Context)
+
+    # WHEN
+    invalidate_principal(1)
+    user_repository_mock.get_all.return_value = []
+    with pytest.raises(HTTPException) as exc_info:
+        async for context in check_access_token(
+            request=request_mock, token=token_mock.access_token
+        ):
+            assert isinstance(context, Context)
+
+    # THEN
+    assert "Could not validate credentials" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+@patch("server.services.auth_service.user_repository", new_callable=AsyncMock)
+async def test_check_access_token_invalidated_by_other_worker(
+    user_repository_mock: AsyncMock, token_mock: Token
+):
+    # MOCK
+    request_mock = cast(Request, RequestMock())
+    users_mock = [
+        User(
+            id=1,
+            username="abc.xyz",
+            password=fake.password(20),
+            person_id=fake.pyint(1, 999),
+            created_at=fake.date_time(),
+            updated_at=fake.date_time(),
+            version=1,
+        )
+    ]
+    user_repository_mock.get_all.return_value = users_mock
+    async for context in check_access_token(
+        request=request_mock, token=token_mock.access_token
+    ):
+        assert isinstance(context, Context)
+
+    # WHEN
+    # only the shared counter moves, the local copy is still in the cache
+    bus.publish("principal", 1)
+    user_repository_mock.get_all.return_value = []
+    with pytest.raises(HTTPException) as exc_info:
+        async for context in check_access_token(
+            request=request_mock, token=token_mock.access_token
+        ):
+            assert isinstance(context, Context)
+
+    # THEN
+    assert "Could not validate credentials" in str(exc_info.value)
+    assert "abc.xyz" in principal_cache
+
+
+@pytest.mark.asyncio
+@patch("server.services.auth_service.user_repository", new_callable=AsyncMock)
+async def test_check_access_token_invalidated_while_loading(
+    user_repository_mock: AsyncMock, token_mock: Token
+):
+    # MOCK
+    request_mock = cast(Request, RequestMock())
+    users_mock = [
+        User(
+            id=1,
+            username="abc.xyz",
+            password=fake.password(20),
+            person_id=fake.pyint(1, 999),
+            created_at=fake.date_time(),
+            updated_at=fake.date_time(),
+            version=1,
+        )
+    ]
+
+    async def get_all_mock(**kwargs) -> list[User]:
+        # the deactivation commits after the SELECT read the active user
+        invalidate_principal(1)
+        return users_mock
+
+    user_repository_mock.get_all.side_effect = get_all_mock
+
+    # WHEN
+    async for context in check_access_token(
+        request=request_mock, token=token_mock.access_token
+    ):
+        assert context.user.username == "abc.xyz"
+    user_repository_mock.get_all.side_effect = None
+    user_repository_mock.get_all.return_value = []
+    with pytest.raises(HTTPException) as exc_info:
+        async for context in check_access_token(
+            request=request_mock, token=token_mock.access_token
+        ):
+            assert isinstance(context, Context)
+
+    # THEN
+    assert "Could not validate credentials" in str(exc_info.value)
+    assert "abc.xyz" not in principal_cache
+
+
+@pytest.mark.asyncio
+@patch("server.services.auth_service.user_repository", new_callable=AsyncMock)
+async def test_check_access_token_without_subject(user_repository_mock: AsyncMock):
+    # MOCK
+    request_mock = cast(Request, RequestMock())
+    token = jwt.encode(
+        claims={"sub": ""},
+        key=settings.token_secret_key,
+        algorithm=settings.token_algorithm,
+    )
+
+    # WHEN
+    with pytest.raises(HTTPException) as exc_info:
+        async for context in check_access_token(request=request_mock, token=token):
+            assert isinstance(context, Context)
+
+    # THEN
+    assert "Could not validate credentials" in str(exc_info.value)
+    user_repository_mock.get_all.assert_not_awaited()
@@ -1,3 +1,4 @@
+import asyncio
 from copy import copy
 from unittest.mock import AsyncMock, patch
 
@@ -12,6 +13,7 @@ from server.resources.person_resource import (
     UpdatePerson,
     UpdatePersonOptional,
 )
+from server.resources.person_resource import Person as PersonResource
 from server.services import person_service
 from tests.mocks.context_mock import ContextMock
 
@@ -27,7 +29,12 @@ async def test_get_person_ok(person_repository_mock: AsyncMock):
 
     # MOCK
     person_mock = Person(
-        id=person_id, first_name=fake.first_name(), last_name=fake.last_name()
+        id=person_id,
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        created_at=fake.date_time(),
+        updated_at=fake.date_time(),
+        version=1,
     )
     context_mock = ContextMock.context_session_mock()
     person_repository_mock.get.return_value = person_mock
@@ -36,6 +43,7 @@ async def test_get_person_ok(person_repository_mock: AsyncMock):
     res = await person_service.get_person(context_mock, person_id=person_id)
 
     # THEN
+    assert isinstance(res, PersonResource)
     assert res.id == person_id
     assert res.first_name and isinstance(res.first_name, str)
     assert res.last_name and isinstance(res.last_name, str)
@@ -60,6 +68,38 @@ async def test_get_person_not_found(person_repository_mock: AsyncMock):
     assert error_message in str(exc_info.value)
 
 
+@pytest.mark.asyncio
+@patch("server.services.person_service.person_repository", new_callable=AsyncMock)
+async def test_get_person_cached(person_repository_mock: AsyncMock):
+    # GIVEN
+    person_id = 1
+
+    # MOCK
+    person_mock = Person(
+        id=person_id,
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        created_at=fake.date_time(),
+        updated_at=fake.date_time(),
+        version=1,
+    )
+    context_mock = ContextMock.context_session_mock()
+    person_repository_mock.get.return_value = person_mock
+
+    # WHEN
+    first = await person_service.get_person(context_mock, person_id=person_id)
+    second = await person_service.get_person(context_mock, person_id=person_id)
+
+    # THEN
+    assert first == second
+    person_repository_mock.get.assert_awaited_once()
+    assert person_service.person_cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "coalesced": 0,
+    }
+
+
 @pytest.mark.asyncio
 @patch("server.services.person_service.person_repository", new_callable=AsyncMock)
 async def test_get_all_persons_ok(person_repository_mock: AsyncMock):
@@ -72,9 +112,11 @@ async def test_get_all_persons_ok(person_repository_mock: AsyncMock):
     person_repository_mock.get_all.return_value = person_mock
 
     # WHEN
-    res = await person_service.get_all_persons(context_mock)
+    page = await person_service.get_all_persons(context_mock, limit=10)
 
     # THEN
+    res = page.items
+    assert page.next is None
     assert len(res) == len(person_mock)
     for idx in range(len(person_mock)):
         assert res[idx].id == person_mock[idx].id
@@ -82,6 +124,37 @@ async def test_get_all_persons_ok(person_repository_mock: AsyncMock):
         assert res[idx].last_name == person_mock[idx].last_name
 
 
+@pytest.mark.asyncio
+@patch("server.services.person_service.person_repository", new_callable=AsyncMock)
+async def test_get_all_persons_concurrent_single_query(
+    person_repository_mock: AsyncMock,
+):
+    # MOCK
+    release = asyncio.Event()
+    person_mock = [Person(id=1, first_name=fake.first_name(), last_name="x")]
+
+    async def get_all(*args, **kwargs):
+        await release.wait()
+        return person_mock
+
+    person_repository_mock.get_all.side_effect = get_all
+
+    # WHEN
+    tasks = [
+        asyncio.create_task(
+            person_service.get_all_persons(ContextMock.context_session_mock(), limit=10)
+        )
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    pages = await asyncio.gather(*tasks)
+
+    # THEN
+    assert person_repository_mock.get_all.await_count == 1
+    assert all(page is pages[0] for page in pages)
+
+
 @pytest.mark.asyncio
 @patch("server.services.person_service.person_repository", new_callable=AsyncMock)
 async def test_create_person_ok(person_repository_mock: AsyncMock):
@@ -109,6 +182,36 @@ async def test_create_person_ok(person_repository_mock: AsyncMock):
     assert person.last_name == create_person.last_name
 
 
+@pytest.mark.asyncio
+@patch("server.services.person_service.person_repository", new_callable=AsyncMock)
+async def test_create_persons_ok(person_repository_mock: AsyncMock):
+    # GIVEN
+    create_persons = [
+        CreatePerson(first_name=fake.first_name(), last_name=fake.last_name())
+        for _ in range(3)
+    ]
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+
+    async def create_many_mock(session: SessionIO, persons: list[Person]):
+        for idx, person in enumerate(persons):
+            person.id = idx + 1
+        return persons
+
+    person_repository_mock.create_many = create_many_mock
+
+    # WHEN
+    persons = await person_service.create_persons(
+        context_mock, create_persons=create_persons
+    )
+
+    # THEN
+    assert [p.id for p in persons] == [1, 2, 3]
+    assert [p.first_name for p in persons] == [p.first_name for p in create_persons]
+    assert getattr(context_mock.session, "_begin_count") == 1
+
+
 @pytest.mark.asyncio
 @patch("server.services.person_service.person_repository", new_callable=AsyncMock)
 async def test_create_person_error(person_repository_mock: AsyncMock):
@@ -144,7 +247,9 @@ async def test_update_person_ok(person_repository_mock: AsyncMock):
     # MOCK
     context_mock = ContextMock.context_session_mock()
 
-    async def update_mock(session: SessionIO, pk: int, **values):
+    async def update_mock(
+        session: SessionIO, pk: int, versions: list[int] | None = None, **values
+    ):
         return Person(id=pk, **values)
 
     person_repository_mock.update = update_mock
@@ -160,6 +265,43 @@ async def test_update_person_ok(person_repository_mock: AsyncMock):
     assert person.last_name == update_person.last_name
 
 
+@pytest.mark.asyncio
+@patch("server.services.person_service.person_repository", new_callable=AsyncMock)
+async def test_update_person_invalidates_cache(person_repository_mock: AsyncMock):
+    # GIVEN
+    person_id = 1
+    update_person = UpdatePerson(
+        first_name=fake.first_name(), last_name=fake.last_name()
+    )
+    await person_service.person_cache.set(
+        person_id,
+        PersonResource.model_validate(
+            Person(
+                id=person_id,
+                first_name=fake.first_name(),
+                last_name=fake.last_name(),
+                created_at=fake.date_time(),
+                updated_at=fake.date_time(),
+                version=1,
+            )
+        ),
+    )
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    person_repository_mock.update.return_value = Person(
+        id=person_id, **update_person.model_dump()
+    )
+
+    # WHEN
+    await person_service.update_person(
+        context_mock, person_id=person_id, update_person=update_person
+    )
+
+    # THEN
+    assert await person_service.person_cache.get(person_id) is None
+
+
 @pytest.mark.asyncio
 @patch("server.services.person_service.person_repository", new_callable=AsyncMock)
 async def test_update_person_error(person_repository_mock: AsyncMock):
@@ -201,7 +343,9 @@ async def test_update_person_optional_ok(person_repository_mock: AsyncMock):
         last_name=fake.last_name(),
     )
 
-    async def update_mock(session: SessionIO, pk: int, **values):
+    async def update_mock(
+        session: SessionIO, pk: int, versions: list[int] | None = None, **values
+    ):
         person = copy(person_mock)
         for k, v in values.items():
             setattr(person, k, v)
@@ -261,6 +405,57 @@ async def test_delete_person_ok(person_repository_mock: AsyncMock):
     assert True
 
 
+@pytest.mark.asyncio
+@patch("server.services.person_service.person_repository", new_callable=AsyncMock)
+async def test_delete_persons_ok(person_repository_mock: AsyncMock):
+    # GIVEN
+    person_ids = [1, 2, 3]
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    person_repository_mock.delete_many.return_value = [1, 3]
+
+    # WHEN
+    res = await person_service.delete_persons(context_mock, person_ids=person_ids)
+
+    # THEN
+    assert res == [1, 3]
+    person_repository_mock.delete_many.assert_awaited_once_with(
+        context_mock.session, pks=person_ids
+    )
+
+
+@pytest.mark.asyncio
+@patch("server.services.person_service.person_repository", new_callable=AsyncMock)
+async def test_delete_persons_invalidates_cache(person_repository_mock: AsyncMock):
+    # GIVEN
+    for person_id in (1, 3):
+        await person_service.person_cache.set(
+            person_id,
+            PersonResource.model_validate(
+                Person(
+                    id=person_id,
+                    first_name=fake.first_name(),
+                    last_name=fake.last_name(),
+                    created_at=fake.date_time(),
+                    updated_at=fake.date_time(),
+                    version=1,
+                )
+            ),
+        )
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    person_repository_mock.delete_many.return_value = [1, 3]
+
+    # WHEN
+    await person_service.delete_persons(context_mock, person_ids=[1, 2, 3])
+
+    # THEN
+    assert await person_service.person_cache.get(1) is None
+    assert await person_service.person_cache.get(3) is None
+
+
 @pytest.mark.asyncio
 @patch("server.services.person_service.person_repository", new_callable=AsyncMock)
 async def test_delete_person_error(person_repository_mock: AsyncMock):
@@ -1,5 +1,5 @@
 from copy import copy
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from faker import Faker
@@ -14,9 +14,11 @@ from server.resources.user_resource import (
     UpdateUser,
     UpdateUserOptional,
     UpdateUserPassword,
+    UserPerson,
 )
 from server.services import user_service
-from server.services.auth_service import crypt
+from server.resources.user_resource import User as UserResource
+from server.services.auth_service import crypt, principal_cache
 from tests.mocks.context_mock import ContextMock
 
 fake = Faker("pt_BR")
@@ -37,6 +39,7 @@ async def test_get_user_ok(user_repository_mock: AsyncMock):
         person_id=fake.pyint(1, 999),
         created_at=fake.date_time(),
         updated_at=fake.date_time(),
+        version=1,
     )
     context_mock = ContextMock.context_session_mock()
     user_repository_mock.get.return_value = user_mock
@@ -45,13 +48,68 @@ async def test_get_user_ok(user_repository_mock: AsyncMock):
     user = await user_service.get_user(context_mock, user_id=user_id)
 
     # THEN
+    assert isinstance(user, UserResource)
     assert user.id == user_mock.id
     assert user.username == user_mock.username
-    assert user.password == user_mock.password
     assert user.active == user_mock.active
     assert user.person_id == user_mock.person_id
     assert user.created_at == user_mock.created_at
     assert user.updated_at == user_mock.updated_at
+    assert "password" not in user.model_dump()
+    user_repository_mock.get.assert_awaited_once_with(
+        context_mock.session, pk=user_id, with_person=False
+    )
+
+
+@pytest.mark.asyncio
+@patch("server.services.person_service.person_repository", new_callable=AsyncMock)
+@patch("server.services.user_service.user_repository", new_callable=AsyncMock)
+async def test_get_user_with_person(
+    user_repository_mock: AsyncMock, person_repository_mock: AsyncMock
+):
+    # GIVEN
+    person_mock = Person(
+        id=fake.pyint(1, 999),
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        created_at=fake.date_time(),
+        updated_at=fake.date_time(),
+        version=1,
+    )
+    user_mock = User(
+        id=1,
+        username=fake.user_name(),
+        password=crypt.hash_password(fake.password(10)),
+        person_id=person_mock.id,
+        person=person_mock,
+        created_at=fake.date_time(),
+        updated_at=fake.date_time(),
+        version=1,
+    )
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    user_repository_mock.get.return_value = user_mock
+    person_repository_mock.get.return_value = person_mock
+
+    # WHEN
+    user = await user_service.get_user(context_mock, user_id=1, with_person=True)
+    person_loads = person_repository_mock.get.await_count
+    again = await user_service.get_user(context_mock, user_id=1, with_person=True)
+
+    # THEN
+    assert isinstance(user, UserPerson)
+    assert user.username == user_mock.username
+    assert user.person.first_name == person_mock.first_name
+    assert again == user
+    # the miss joins the person, the cached user reads it from the person cache
+    assert person_loads == 0
+    user_repository_mock.get.assert_awaited_once_with(
+        context_mock.session, pk=1, with_person=True
+    )
+    person_repository_mock.get.assert_awaited_once_with(
+        context_mock.session, pk=person_mock.id
+    )
 
 
 @pytest.mark.asyncio
@@ -85,6 +143,7 @@ async def test_all_users_ok(user_repository_mock: AsyncMock):
             person_id=fake.pyint(1, 999),
             created_at=fake.date_time(),
             updated_at=fake.date_time(),
+            version=1,
         )
         for idx in range(10)
     ]
@@ -92,9 +151,11 @@ async def test_all_users_ok(user_repository_mock: AsyncMock):
     user_repository_mock.get_all.return_value = users_mock
 
     # WHEN
-    users = await user_service.get_all_users(context_mock)
+    page = await user_service.get_all_users(context_mock, limit=10)
 
     # THEN
+    users = page.items
+    assert page.next is None
     assert len(users) == len(users_mock)
     for idx in range(len(users_mock)):
         assert users[idx].id == users_mock[idx].id
@@ -115,10 +176,10 @@ async def test_all_users_nocontent(user_repository_mock: AsyncMock):
     user_repository_mock.get_all.return_value = users_mock
 
     # WHEN
-    users = await user_service.get_all_users(context_mock)
+    page = await user_service.get_all_users(context_mock, limit=10)
 
     # THEN
-    assert len(users) == len(users_mock)
+    assert len(page.items) == len(users_mock)
 
 
 @pytest.mark.asyncio
@@ -142,9 +203,12 @@ async def test_update_user_ok(user_repository_mock: AsyncMock):
         person_id=fake.pyint(11, 20),
         created_at=fake.date_time(),
         updated_at=fake.date_time(),
+        version=1,
     )
 
-    async def update_mock(session: SessionIO, pk: int, **values):
+    async def update_mock(
+        session: SessionIO, pk: int, versions: list[int] | None = None, **values
+    ):
         user = copy(user_mock)
         for k, v in values.items():
             setattr(user, k, v)
@@ -168,6 +232,39 @@ async def test_update_user_ok(user_repository_mock: AsyncMock):
     assert user.person_id == update_user.person_id
 
 
+@pytest.mark.asyncio
+@patch("server.services.user_service.user_repository", new_callable=AsyncMock)
+async def test_update_user_invalidates_cache(user_repository_mock: AsyncMock):
+    # GIVEN
+    user_id = 1
+    user_mock = User(
+        id=user_id,
+        username=fake.user_name(),
+        password=crypt.hash_password(fake.password(10)),
+        active=True,
+        person_id=fake.pyint(1, 999),
+        created_at=fake.date_time(),
+        updated_at=fake.date_time(),
+        version=1,
+    )
+    context_mock = ContextMock.context_session_mock()
+    user_repository_mock.get.return_value = user_mock
+    await user_service.get_user(context_mock, user_id=user_id)
+
+    # MOCK
+    user_repository_mock.update.return_value = user_mock
+
+    # WHEN
+    await user_service.update_user_optional(
+        context_mock,
+        user_id=user_id,
+        update_user=UpdateUserOptional(active=False),  # type: ignore
+    )
+
+    # THEN
+    assert await user_service.user_cache.get(user_id) is None
+
+
 @pytest.mark.asyncio
 @patch("server.services.user_service.user_repository", new_callable=AsyncMock)
 async def test_update_user_error(user_repository_mock: AsyncMock):
@@ -212,9 +309,12 @@ async def test_update_user_optional_ok(user_repository_mock: AsyncMock):
         person_id=fake.pyint(1, 999),
         created_at=fake.date_time(),
         updated_at=fake.date_time(),
+        version=1,
     )
 
-    async def update_mock(session: SessionIO, pk: int, **values):
+    async def update_mock(
+        session: SessionIO, pk: int, versions: list[int] | None = None, **values
+    ):
         user = copy(user_mock)
         for k, v in values.items():
             setattr(user, k, v)
@@ -317,9 +417,12 @@ async def test_change_password_ok(user_repository_mock: AsyncMock):
         person_id=fake.pyint(1, 999),
         created_at=fake.date_time(),
         updated_at=fake.date_time(),
+        version=1,
     )
 
-    async def update_mock(session: SessionIO, pk: int, **values):
+    async def update_mock(
+        session: SessionIO, pk: int, versions: list[int] | None = None, **values
+    ):
         user = copy(user_mock)
         for k, v in values.items():
             setattr(user, k, v)
@@ -392,6 +495,7 @@ async def test_change_password_invalid(user_repository_mock: AsyncMock):
         person_id=fake.pyint(1, 999),
         created_at=fake.date_time(),
         updated_at=fake.date_time(),
+        version=1,
     )
     user_repository_mock.get.return_value = user_mock
 
@@ -436,6 +540,7 @@ async def test_create_user_person_ok(
         active=fake.pybool(),
         created_at=fake.date_time(),
         updated_at=fake.date_time(),
+        version=1,
     )
 
     person_repository_mock.get_or_create.return_value = person_mock
@@ -452,3 +557,79 @@ async def test_create_user_person_ok(
     assert crypt.check_password(create_user.password, user.password)
     assert user.active == user_mock.active
     assert user.person_id == person_mock.id
+    assert getattr(context_mock.session, "_begin_count") == 1
+
+
+@pytest.mark.asyncio
+@patch("server.services.user_service.crypt")
+@patch("server.services.user_service.person_repository", new_callable=AsyncMock)
+@patch("server.services.user_service.user_repository", new_callable=AsyncMock)
+async def test_create_user_person_hash_before_transaction(
+    user_repository_mock: AsyncMock,
+    person_repository_mock: AsyncMock,
+    crypt_mock: MagicMock,
+):
+    # GIVEN
+    password = fake.password(10)
+    create_user = CreateUserPerson(
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        username=fake.user_name(),
+        password=password,
+        password_check=password,
+    )
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    begin_count_on_hash = []
+
+    async def ahash_password_mock(password: str) -> str:
+        begin_count_on_hash.append(getattr(context_mock.session, "_begin_count", 0))
+        return "hashed"
+
+    crypt_mock.ahash_password = ahash_password_mock
+    person_repository_mock.get_or_create.return_value = Person(
+        id=1, first_name=create_user.first_name, last_name=create_user.last_name
+    )
+
+    # WHEN
+    await user_service.create_user_person(
+        ctx=context_mock, user_person_create=create_user
+    )
+
+    # THEN
+    assert begin_count_on_hash == [0]
+    assert user_repository_mock.create.await_args.kwargs["user"].password == "hashed"
+
+
+@pytest.mark.asyncio
+@patch("server.services.user_service.user_repository", new_callable=AsyncMock)
+async def test_delete_user_invalidate_principal(user_repository_mock: AsyncMock):
+    # GIVEN
+    user_id = 1
+
+    # MOCK
+    context_mock = ContextMock.context_session_mock()
+    principal_cache.set(
+        "abc.xyz",
+        (
+            0,
+            UserResource.model_validate(
+                {
+                    "id": user_id,
+                    "username": "abc.xyz",
+                    "active": True,
+                    "person_id": fake.pyint(1, 999),
+                    "created_at": fake.date_time(),
+                    "updated_at": fake.date_time(),
+                    "version": 1,
+                }
+            ),
+        ),
+    )
+
+    # WHEN
+    await user_service.delete_user(context_mock, user_id=user_id)
+
+    # THEN
+    assert "abc.xyz" not in principal_cache
@@ -0,0 +1,32 @@
+"""Stream every person of DB_URL as NDJSON and print "<lines> <peak rss kB>".
+
+Run in a fresh interpreter (python -m tests.utils.export_rss) so the peak
+RSS only reflects the export itself.
+"""
+
+import asyncio
+import resource
+
+from server.core.context import Context
+from server.core.database import sessionio_maker
+from server.core.settings import get_settings
+from server.core.streaming import ndjson_lines
+from server.resources.person_resource import Person
+from server.services import person_service
+
+
+async def export() -> int:
+    ctx = Context(session_maker=sessionio_maker())
+    chunks = person_service.export_persons(
+        ctx, chunk_size=get_settings().export_chunk_size
+    )
+    lines = 0
+    async for data in ndjson_lines(chunks, Person):
+        lines += data.count(b"\n")
+    await sessionio_maker().kw["bind"].dispose()
+    return lines
+
+
+if __name__ == "__main__":
+    lines = asyncio.run(export())
+    print(lines, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+import shutil
+import socket
+import subprocess
+from pathlib import Path
+from typing import Any, Self
+
+
+class PostgresServer:
+    """Throwaway PostgreSQL cluster living in a temp dir.
+
+    Binaries are looked up in `PG_BIN` first and then in `PATH`.
+    """
+
+    def __init__(self: Self, base_dir: Path, bin_dir: str | None = None):
+        self._base_dir = base_dir
+        self._data_dir = base_dir / "data"
+        self._bin_dir = bin_dir or os.environ.get("PG_BIN")
+        self._port = 0
+
+    @property
+    def url(self: Self) -> str:
+        return f"postgresql+asyncpg://postgres@127.0.0.1:{self._port}/postgres"
+
+    def _bin(self: Self, name: str) -> str:
+        path = shutil.which(name, path=self._bin_dir) or shutil.which(name)
+        if not path:
+            raise RuntimeError(f"{name} not found, install PostgreSQL or set PG_BIN")
+        return path
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def start(self: Self) -> Self:
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            raise RuntimeError("PostgreSQL refuses to run as root")
+        self._port = self._free_port()
+        subprocess.run(
+            [self._bin("initdb"), "-D", str(self._data_dir), "-U", "postgres"]
+            + ["-A", "trust", "-E", "UTF8", "--no-sync"],
+            check=True,
+            capture_output=True,
+        )
+        options = f"-F -h 127.0.0.1 -p {self._port} -k {self._base_dir}"
+        subprocess.run(
+            [self._bin("pg_ctl"), "-D", str(self._data_dir), "-o", options, "-w"]
+            + ["-l", str(self._base_dir / "postgres.log"), "start"],
+            check=True,
+            capture_output=True,
+        )
+        return self
+
+    def stop(self: Self):
+        subprocess.run(
+            [self._bin("pg_ctl"), "-D", str(self._data_dir), "-m", "immediate"]
+            + ["-w", "stop"],
+            check=False,
+            capture_output=True,
+        )
+
+    def __enter__(self: Self) -> Self:
+        return self.start()
+
+    def __exit__(self: Self, *args: Any):
+        self.stop()
+
+
+__all__ = ("PostgresServer",)